@@ -1,2 +1,5 @@
+from aws_managers.athena.async_athena_frame import AsyncAthenaFrame
+from aws_managers.athena.athena_catalog import AthenaCatalog
 from aws_managers.athena.athena_frame import AthenaFrame
+from aws_managers.athena.incremental_athena_frame import IncrementalAthenaFrame
 from aws_managers.athena.queries.athena_query_generator import AthenaQueryGenerator
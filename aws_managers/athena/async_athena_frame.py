@@ -0,0 +1,296 @@
+from asyncio import gather, get_running_loop
+from functools import partial
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Union
+
+from pandas import DataFrame, Series
+
+from aws_managers.athena.athena_frame import AthenaFrame
+from aws_managers.athena.caching.query_descriptor import QueryDescriptor
+from aws_managers.athena.execution.async_athena_engine import \
+    AsyncAthenaEngine
+from aws_managers.athena.execution.athena_backend import AthenaBackend
+from aws_managers.athena.execution.backend_async_engine import \
+    BackendAsyncEngine
+from aws_managers.athena.execution.query_statistics import \
+    find_call_site, find_caller_frame
+from aws_managers.athena.execution.single_flight import SINGLE_FLIGHT
+from aws_managers.athena.queries import ColumnQuery
+
+
+class AsyncAthenaFrame(object):
+
+    def __init__(
+            self,
+            frame: AthenaFrame,
+            engine: Optional[
+                Union[AsyncAthenaEngine, BackendAsyncEngine]
+            ] = None
+    ):
+        """
+        Create a new AsyncAthenaFrame.
+
+        Provides awaitable versions of the AthenaFrame query methods, which
+        render the same SQL and return the same results, so that many queries
+        can run concurrently in one event loop e.g.
+
+            max_values, min_values = await asyncio.gather(
+                async_frame.max(), async_frame.min()
+            )
+
+        :param frame: The AthenaFrame to query.
+        :param engine: Engine to execute queries with. Defaults to an
+                       AsyncAthenaEngine with the settings of the frame's
+                       backend if it is an AthenaBackend, or else a
+                       BackendAsyncEngine that runs the frame's backend in
+                       the default executor.
+        """
+        if engine is None:
+            if isinstance(frame._backend, AthenaBackend):
+                engine = AsyncAthenaEngine.from_backend(frame._backend)
+            else:
+                engine = BackendAsyncEngine(frame._backend)
+        self._frame: AthenaFrame = frame
+        self._engine: Union[AsyncAthenaEngine, BackendAsyncEngine] = engine
+
+    @property
+    def frame(self) -> AthenaFrame:
+        return self._frame
+
+    # region query execution
+
+    async def _execute(
+            self,
+            sql: str,
+            method: Optional[str] = None,
+            call_site: Optional[str] = None,
+            descriptor: Optional[QueryDescriptor] = None
+    ) -> DataFrame:
+        """
+        Execute a query, using the frame's result cache if it has one and
+        sharing the result of an identical query that is already running, and
+        record its statistics against the frame.
+
+        :param sql: Raw SQL to execute.
+        :param method: Name of the frame method that ran the query.
+        :param call_site: Location of the code that called the frame method.
+        :param descriptor: Optional description of the query if it is a basic
+                           selection, to answer it from a cached result that
+                           contains it, and to store with its result.
+        """
+        frame = self._frame
+        start = perf_counter()
+        data = frame._cached_result(sql=sql, descriptor=descriptor)
+        cached = data is not None
+        coalesced = False
+        if not cached:
+            engine_key = getattr(self._engine, 'flight_key', self._engine)
+            data, coalesced = await SINGLE_FLIGHT.do_async(
+                key=frame._flight_key(sql=sql, engine_key=engine_key),
+                func=lambda: self._engine.execute(
+                    sql=sql, database=frame.database
+                )
+            )
+        return frame._finish_execution(
+            sql=sql, data=data, start=start, cached=cached,
+            coalesced=coalesced, method=method, call_site=call_site,
+            descriptor=descriptor
+        )
+
+    async def _run(self, method: str, *args, **kwargs) -> Any:
+        """
+        Run the queries of an AthenaFrame method concurrently and combine their
+        shaped results.
+
+        The queries are captured in the default executor so that resolving the
+        frame's schema, if needed, does not block the event loop.
+
+        :param method: Name of the AthenaFrame method.
+        :param args: Positional arguments to pass to the method.
+        :param kwargs: Keyword arguments to pass to the method.
+        """
+        _, call_site = find_call_site()
+        _, caller = find_caller_frame()
+        plan = await get_running_loop().run_in_executor(
+            None, partial(self._frame._capture, method, *args, **kwargs)
+        )
+        await get_running_loop().run_in_executor(
+            None, partial(
+                self._frame._check_queries,
+                [query.sql for query in plan], caller=caller
+            )
+        )
+        results = await gather(*[
+            self._execute(
+                sql=query.sql, method=method, call_site=call_site,
+                descriptor=query.descriptor
+            )
+            for query in plan
+        ])
+        return plan.shape_results(results)
+
+    # endregion
+
+    async def select(
+            self,
+            columns: Union[str, ColumnQuery, List[str], List[ColumnQuery]]
+    ) -> DataFrame:
+        """
+        Do a basic selection using columns or column queries.
+        """
+        return await self._run('select', columns)
+
+    async def sample(self, n: int) -> DataFrame:
+        """
+        Sample n rows from the table.
+
+        :param n: Number of rows to sample.
+        """
+        return await self._run('sample', n)
+
+    async def count_distinct(self) -> Series:
+        """
+        Count number of distinct elements.
+        """
+        return await self._run('count_distinct')
+
+    # region general aggregates
+
+    async def agg(self, spec: Dict[str, Union[str, List[str]]]) -> DataFrame:
+        """
+        Compute several aggregates of several columns in a single scan.
+
+        :param spec: Mapping of column names to a function name or list of
+                     function names e.g. {'col_a': ['min', 'max']}
+        """
+        return await self._run('agg', spec)
+
+    async def geometric_mean(self) -> Series:
+        """
+        Return the geometric mean of the values.
+        """
+        return await self._run('geometric_mean')
+
+    async def max(self) -> Series:
+        """
+        Return the maximum of the values.
+        """
+        return await self._run('max')
+
+    async def mean(self) -> Series:
+        """
+        Return the mean of the values.
+        """
+        return await self._run('mean')
+
+    async def median(self) -> Series:
+        """
+        Return the median of the values.
+        """
+        return await self._run('median')
+
+    async def min(self) -> Series:
+        """
+        Return the minimum of the values.
+        """
+        return await self._run('min')
+
+    async def sum(self) -> Series:
+        """
+        Return the sum of the values.
+        """
+        return await self._run('sum')
+
+    async def sum_by_group(
+            self,
+            sum_columns: Union[str, List[str]],
+            group_columns: Union[str, List[str]]
+    ) -> Union[DataFrame, Series]:
+        """
+        Sum one or more columns over grouping of one or more other columns.
+
+        :param sum_columns: Columns to sum.
+        :param group_columns: Columns to group by.
+        """
+        return await self._run('sum_by_group', sum_columns, group_columns)
+
+    async def min_by_group(
+            self,
+            min_columns: Union[str, List[str]],
+            group_columns: Union[str, List[str]]
+    ) -> Union[DataFrame, Series]:
+        """
+        Take min of one or more columns over grouping of one or more other
+        columns.
+
+        :param min_columns: Columns to take min of.
+        :param group_columns: Columns to group by.
+        """
+        return await self._run('min_by_group', min_columns, group_columns)
+
+    async def max_by_group(
+            self,
+            max_columns: Union[str, List[str]],
+            group_columns: Union[str, List[str]]
+    ) -> Union[DataFrame, Series]:
+        """
+        Take max of one or more columns over grouping of one or more other
+        columns.
+
+        :param max_columns: Columns to take max of.
+        :param group_columns: Columns to group by.
+        """
+        return await self._run('max_by_group', max_columns, group_columns)
+
+    async def mean_by_group(
+            self,
+            mean_columns: Union[str, List[str]],
+            group_columns: Union[str, List[str]]
+    ) -> Union[DataFrame, Series]:
+        """
+        Take mean of one or more columns over grouping of one or more other
+        columns.
+
+        :param mean_columns: Columns to take mean of.
+        :param group_columns: Columns to group by.
+        """
+        return await self._run('mean_by_group', mean_columns, group_columns)
+
+    # endregion
+
+    # region approximate aggregate functions
+
+    async def approx_percentile(
+            self,
+            columns: Union[str, List[str]],
+            percentile: Union[float, List[float]]
+    ):
+        """
+        Returns the approximate percentile for all input values of the column at
+        the given percentage.
+
+        :param columns: Columns to find percentile of.
+        :param percentile: Percentile value, or list of values, to find.
+        """
+        return await self._run('approx_percentile', columns, percentile)
+
+    async def approx_percentile_by_group(
+            self,
+            percentile_columns: Union[str, List[str]],
+            group_columns: Union[str, List[str]],
+            percentile: Union[float, List[float]]
+    ):
+        """
+        Returns the approximate percentile for all input values of the column at
+        the given percentage for each group.
+
+        :param percentile_columns: Columns to find percentile of.
+        :param group_columns: Columns to find percentile of.
+        :param percentile: Percentile value, or list of values, to find.
+        """
+        return await self._run(
+            'approx_percentile_by_group',
+            percentile_columns, group_columns, percentile
+        )
+
+    # endregion
@@ -0,0 +1,129 @@
+from typing import Dict, Iterator, List, Optional
+
+from pandas import DataFrame
+
+from aws_managers.athena.athena_execution_mixin import AthenaExecutionMixin
+from aws_managers.athena.athena_frame import AthenaFrame
+from aws_managers.athena.caching.query_result_cache import QueryResultCache
+from aws_managers.athena.caching.schema_registry import SCHEMA_REGISTRY
+from aws_managers.athena.execution.athena_backend import AthenaBackend
+from aws_managers.athena.execution.execution_backend import ExecutionBackend
+from aws_managers.athena.metadata.metadata_backend import MetadataBackend
+from aws_managers.athena.queries.athena_query_generator import \
+    AthenaQueryGenerator, ATHENA_QUERY_GENERATOR
+
+
+class AthenaCatalog(
+    AthenaExecutionMixin,
+    object
+):
+
+    def __init__(
+            self,
+            database: str,
+            cache: Optional[QueryResultCache] = None,
+            metadata: Optional[MetadataBackend] = None,
+            backend: Optional[ExecutionBackend] = None
+    ):
+        """
+        Create a new AthenaCatalog.
+
+        Loads the schema of every table in the database in a single query (or a
+        single paginated metadata call) and hands out AthenaFrames with their
+        schemas pre-populated.
+
+        :param database: Name of the Athena database.
+        :param cache: Optional cache to pass on to each AthenaFrame.
+        :param metadata: Optional backend to read the table schemas from e.g.
+                         GlueMetadataBackend. Defaults to querying
+                         information_schema.
+        :param backend: Backend to pass on to each AthenaFrame. Defaults to a
+                        new AthenaBackend.
+        """
+        self._q: AthenaQueryGenerator = ATHENA_QUERY_GENERATOR
+        self._database: str = database
+        self._table: Optional[str] = None
+        if backend is None:
+            backend = AthenaBackend()
+        self._backend: ExecutionBackend = backend
+        self._cache: Optional[QueryResultCache] = cache
+        self._metadata: Optional[MetadataBackend] = metadata
+        self._column_infos: Dict[str, DataFrame] = {}
+        self.refresh()
+
+    def refresh(self):
+        """
+        Reload the schema of every table in the database and register them
+        with the process-wide schema registry.
+        """
+        metadata = self._metadata_backend
+        if metadata is not None:
+            column_info = metadata.column_infos(database=self._database)
+        else:
+            column_info = self._execute(
+                sql=self._q.database_column_info(database=self._database),
+                use_cache=False
+            )
+        self._column_infos = {}
+        for table, table_info in column_info.groupby('table_name', sort=True):
+            table_info = table_info.sort_values(
+                'ordinal_position'
+            ).reset_index(drop=True)
+            self._column_infos[table] = table_info
+            SCHEMA_REGISTRY.register(
+                database=self._database, table=table, column_info=table_info
+            )
+
+    @property
+    def database(self) -> str:
+        return self._database
+
+    @property
+    def tables(self) -> List[str]:
+        """
+        Return the names of the tables in the database.
+        """
+        return list(self._column_infos.keys())
+
+    def column_info(self, table: str) -> DataFrame:
+        """
+        Return the column info of a table.
+
+        :param table: Name of the table.
+        """
+        return self._column_infos[table]
+
+    def __getitem__(self, table: str) -> AthenaFrame:
+        """
+        Return an AthenaFrame for a table in the database.
+
+        :param table: Name of the table.
+        """
+        if table not in self._column_infos.keys():
+            raise KeyError(
+                f'Table "{table}" not found in database "{self._database}"'
+            )
+        return AthenaFrame(
+            database=self._database,
+            table=table,
+            column_info=self._column_infos[table],
+            cache=self._cache,
+            metadata=self._metadata,
+            backend=self._backend
+        )
+
+    def __contains__(self, table: str) -> bool:
+
+        return table in self._column_infos.keys()
+
+    def __iter__(self) -> Iterator[str]:
+
+        return iter(self._column_infos.keys())
+
+    def __len__(self) -> int:
+
+        return len(self._column_infos)
+
+    def __repr__(self):
+
+        return f'AthenaCatalog({self._database}, {len(self)} tables)'
@@ -0,0 +1,351 @@
+from time import perf_counter
+from typing import Hashable, Iterator, List, Optional, Tuple
+
+from pandas import DataFrame
+
+from aws_managers.athena.caching.query_descriptor import QueryDescriptor
+from aws_managers.athena.caching.query_result_cache import QueryResultCache
+from aws_managers.athena.caching.schema_registry import PARTITION_REGISTRY, \
+    SCHEMA_REGISTRY
+from aws_managers.athena.execution.execution_backend import ExecutionBackend
+from aws_managers.athena.execution.query_statistics import QueryStatistics, \
+    QUERY_LEDGER, find_call_site
+from aws_managers.athena.execution.single_flight import canonical_sql, \
+    SINGLE_FLIGHT
+from aws_managers.athena.metadata.metadata_backend import MetadataBackend
+from aws_managers.athena.queries.athena_query_generator import \
+    AthenaQueryGenerator
+
+
+class AthenaExecutionMixin(object):
+    """
+    Query execution shared by AthenaFrame and AthenaSeries.
+    """
+    _database: str
+    _table: str
+    _backend: ExecutionBackend
+    _cache: Optional[QueryResultCache]
+    _metadata: Optional[MetadataBackend]
+    _last_query_stats: Optional[QueryStatistics]
+    _q: AthenaQueryGenerator
+
+    def _execute(
+            self,
+            sql: str,
+            caller: Optional[Tuple[Optional[str], Optional[str]]] = None,
+            descriptor: Optional[QueryDescriptor] = None,
+            use_cache: bool = True
+    ) -> DataFrame:
+        """
+        Execute a query with the execution backend, using the result cache if
+        one has been given.
+
+        Identical queries against the same database and backend that are
+        already running, from any frame in the process, are not executed
+        again; their result is shared through SINGLE_FLIGHT.
+
+        Statistics of the execution are kept in last_query_stats and recorded
+        in the process-wide QUERY_LEDGER.
+
+        :param sql: Raw SQL to execute.
+        :param caller: Optional frame method and call site to record in the
+                       statistics, for queries run on worker threads. Defaults
+                       to the caller found on the stack.
+        :param descriptor: Optional description of the query if it is a basic
+                           selection, to answer it from a cached result that
+                           contains it, and to store with its result.
+        :param use_cache: Whether to use the result cache. Metadata queries
+                          bypass it so that refreshed listings are current.
+        """
+        method, call_site = caller or find_call_site()
+        start = perf_counter()
+        data = self._cached_result(
+            sql=sql, descriptor=descriptor, use_cache=use_cache
+        )
+        cached = data is not None
+        coalesced = False
+        if not cached:
+            data, coalesced = SINGLE_FLIGHT.do(
+                key=self._flight_key(
+                    sql=sql, engine_key=self._backend.flight_key
+                ),
+                func=lambda: self._backend.execute(
+                    sql=sql, database=self._database
+                )
+            )
+        return self._finish_execution(
+            sql=sql, data=data, start=start, cached=cached,
+            coalesced=coalesced, method=method, call_site=call_site,
+            descriptor=descriptor, use_cache=use_cache
+        )
+
+    def _cached_result(
+            self,
+            sql: str,
+            descriptor: Optional[QueryDescriptor] = None,
+            use_cache: bool = True
+    ) -> Optional[DataFrame]:
+        """
+        Return the cached result of a query, or of a basic selection that
+        contains it, or None if there is no result cache or it has neither.
+
+        :param sql: Raw SQL of the query.
+        :param descriptor: Optional description of the query if it is a basic
+                           selection.
+        :param use_cache: Whether to use the result cache.
+        """
+        if self._cache is None or not use_cache:
+            return None
+        backend = self._backend.cache_key
+        data = self._cache.get(
+            sql=sql, database=self._database, backend=backend
+        )
+        if data is None and descriptor is not None:
+            data = self._cache.get_subsumed(
+                descriptor=descriptor, backend=backend
+            )
+        return data
+
+    def _flight_key(self, sql: str, engine_key: Hashable) -> Hashable:
+        """
+        Return the SINGLE_FLIGHT key of a query run by a backend or engine.
+
+        :param sql: Raw SQL of the query.
+        :param engine_key: Flight key of the backend or engine running it.
+        """
+        return engine_key, self._database, canonical_sql(sql)
+
+    def _finish_execution(
+            self,
+            sql: str,
+            data: DataFrame,
+            start: float,
+            cached: bool,
+            coalesced: bool,
+            method: Optional[str],
+            call_site: Optional[str],
+            descriptor: Optional[QueryDescriptor] = None,
+            use_cache: bool = True
+    ) -> DataFrame:
+        """
+        Store the result of a query that was executed in the result cache and
+        record the statistics of the query, whether it was executed, coalesced
+        with an identical query in flight or answered from the cache. Return
+        the result, copied if it is shared with another caller.
+
+        :param sql: Raw SQL of the query.
+        :param data: Result of the query.
+        :param start: perf_counter value when the query was started.
+        :param cached: Whether the result came from the result cache.
+        :param coalesced: Whether the result came from another caller's call.
+        :param method: Name of the frame method that ran the query.
+        :param call_site: Location of the code that called the frame method.
+        :param descriptor: Optional description of the query if it is a basic
+                           selection, to store with its result.
+        :param use_cache: Whether to use the result cache.
+        """
+        if coalesced:
+            data = data.copy()
+        elif not cached and self._cache is not None and use_cache:
+            self._cache.put(
+                sql=sql, database=self._database, table=self._table,
+                data=data, descriptor=descriptor,
+                backend=self._backend.cache_key
+            )
+        self._record_stats(QueryStatistics(
+            sql=sql,
+            database=self._database,
+            table=self._table,
+            row_count=len(data),
+            wall_time_ms=(perf_counter() - start) * 1000,
+            cached=cached,
+            coalesced=coalesced,
+            query_metadata=(
+                None if cached or coalesced
+                else QueryStatistics.query_metadata(data)
+            ),
+            method=method,
+            call_site=call_site
+        ))
+        return data
+
+    def _execute_statement(self, sql: str):
+        """
+        Execute a statement that does not return a result e.g. CREATE TABLE AS
+        with the execution backend, bypassing the result cache.
+
+        :param sql: Raw SQL to execute.
+        """
+        method, call_site = find_call_site()
+        start = perf_counter()
+        query_metadata = self._backend.execute_statement(
+            sql=sql, database=self._database
+        )
+        self._record_stats(QueryStatistics(
+            sql=sql,
+            database=self._database,
+            table=self._table,
+            row_count=0,
+            wall_time_ms=(perf_counter() - start) * 1000,
+            query_metadata=query_metadata,
+            method=method,
+            call_site=call_site
+        ))
+
+    def _iter_batches(
+            self,
+            sql: str,
+            batch_rows: int,
+            caller: Optional[Tuple[Optional[str], Optional[str]]] = None
+    ) -> Iterator[DataFrame]:
+        """
+        Execute a query with the execution backend and yield its result in
+        batches of at most batch_rows rows.
+
+        A cached result is sliced into batches, but streamed results are not
+        added to the cache as they may not fit in memory. Statistics are
+        recorded once the last batch has been yielded.
+
+        :param sql: Raw SQL to execute.
+        :param batch_rows: Maximum number of rows per batch.
+        :param caller: Frame method and call site to record in the statistics.
+                       Generators only run once the first batch is requested,
+                       so callers should find these before creating one.
+                       Defaults to the caller found on the stack then.
+        """
+        method, call_site = caller or find_call_site()
+        start = perf_counter()
+        data = None
+        if self._cache is not None:
+            data = self._cache.get(
+                sql=sql, database=self._database,
+                backend=self._backend.cache_key
+            )
+        cached = data is not None
+        if cached:
+            batches = (
+                data.iloc[i: i + batch_rows]
+                for i in range(0, len(data), batch_rows)
+            )
+        else:
+            batches = self._backend.iter_batches(
+                sql=sql, database=self._database, batch_rows=batch_rows
+            )
+        row_count = 0
+        query_metadata = None
+        for batch in batches:
+            row_count += len(batch)
+            if not cached and query_metadata is None:
+                query_metadata = QueryStatistics.query_metadata(batch)
+            yield batch
+        self._record_stats(QueryStatistics(
+            sql=sql,
+            database=self._database,
+            table=self._table,
+            row_count=row_count,
+            wall_time_ms=(perf_counter() - start) * 1000,
+            cached=cached,
+            query_metadata=query_metadata,
+            method=method,
+            call_site=call_site
+        ))
+
+    def _record_stats(self, statistics: QueryStatistics):
+        """
+        Keep the statistics of the latest query and add them to the ledger.
+        """
+        self._last_query_stats = statistics
+        QUERY_LEDGER.record(statistics)
+
+    @property
+    def last_query_stats(self) -> Optional[QueryStatistics]:
+        """
+        Statistics of the last query executed by this object.
+        """
+        return getattr(self, '_last_query_stats', None)
+
+    @property
+    def _metadata_backend(self) -> Optional[MetadataBackend]:
+        """
+        Return the metadata backend to read schemas from, if any. Execution
+        backends that are also metadata backends e.g. DuckDBBackend are used
+        unless another metadata backend has been given.
+        """
+        if self._metadata is None and isinstance(
+                self._backend, MetadataBackend
+        ):
+            return self._backend
+        return self._metadata
+
+    def _load_column_info(self) -> DataFrame:
+        """
+        Load the column info of the whole table from the metadata backend, or
+        by querying information_schema if there isn't one.
+        """
+        metadata = self._metadata_backend
+        if metadata is not None:
+            return metadata.column_info(
+                database=self._database, table=self._table
+            )
+        return self._execute(
+            sql=self._q.column_info(
+                database=self._database, table=self._table
+            ),
+            use_cache=False
+        )
+
+    def _table_column_info(self) -> DataFrame:
+        """
+        Return the column info of the whole table from the process-wide schema
+        registry, loading it if it is not registered yet.
+        """
+        return SCHEMA_REGISTRY.column_info(
+            database=self._database,
+            table=self._table,
+            load=self._load_column_info
+        )
+
+    @property
+    def partition_columns(self) -> List[str]:
+        """
+        Names of the table's partition keys, in order.
+        """
+        column_info = self._table_column_info()
+        return column_info.loc[
+            column_info['extra_info'] == 'partition key', 'column_name'
+        ].to_list()
+
+    def _load_partitions(self) -> DataFrame:
+        """
+        Load the partitions of the table from the metadata backend, or by
+        querying the table's $partitions metadata table if there isn't one.
+        """
+        metadata = self._metadata_backend
+        if metadata is not None:
+            return metadata.partitions(
+                database=self._database,
+                table=self._table,
+                partition_columns=self.partition_columns
+            )
+        return self._execute(
+            sql=self._q.partitions(database=self._database, table=self._table),
+            use_cache=False
+        )
+
+    def partitions(self, refresh: bool = False) -> DataFrame:
+        """
+        Return the partitions of the table, with a column for each partition
+        key and a row for each partition. The listing is cached process-wide
+        in PARTITION_REGISTRY.
+
+        :param refresh: Whether to reload the listing even if it is cached.
+        """
+        if len(self.partition_columns) == 0:
+            return DataFrame()
+        if refresh:
+            PARTITION_REGISTRY.invalidate(self._database, self._table)
+        return PARTITION_REGISTRY.column_info(
+            database=self._database,
+            table=self._table,
+            load=self._load_partitions
+        )
@@ -1,23 +1,61 @@
-from typing import Optional, Union, List, Tuple, Dict, Any
-
-from awswrangler.athena import read_sql_query
-from pandas import DataFrame, Index, Series
-
+from typing import Optional, Union, List, Tuple, Dict, Any, Iterator, \
+    Callable
+from types import FrameType
+from uuid import uuid4
+from warnings import warn, warn_explicit
+
+from numpy import nan
+from pandas import DataFrame, Index, MultiIndex, Series, concat
+
+from aws_managers.athena.athena_execution_mixin import AthenaExecutionMixin
+from aws_managers.athena.athena_group_by import AthenaGroupBy
+from aws_managers.athena.caching.partial_aggregate_store import \
+    PartialAggregateStore
+from aws_managers.athena.caching.query_descriptor import QueryDescriptor
+from aws_managers.athena.caching.query_result_cache import QueryResultCache
+from aws_managers.athena.caching.schema_registry import SCHEMA_REGISTRY
+from aws_managers.athena.execution.athena_backend import AthenaBackend
+from aws_managers.athena.execution.execution_backend import ExecutionBackend
+from aws_managers.athena.execution.query_explanation import EXPLAIN_TYPES, \
+    QueryExplanation
+from aws_managers.athena.execution.query_statistics import \
+    find_call_site, find_caller_frame
+from aws_managers.athena.metadata.metadata_backend import MetadataBackend
 from aws_managers.athena.queries import ColumnQuery
 from aws_managers.athena.queries.athena_column_query_set import \
     AthenaColumnQuerySet
+from aws_managers.athena.queries.athena_query import AthenaQuery
+from aws_managers.athena.queries.athena_query_plan import AthenaQueryPlan
+from aws_managers.athena.queries.column_chunks import chunk_columns, \
+    MAX_COLUMNS_PER_QUERY, MAX_QUERY_LENGTH
 from aws_managers.athena.reference.athena_data_types import \
     ATHENA_BOOLEAN_TYPES, ATHENA_CHARACTER_TYPES, ATHENA_DATETIME_TYPES, \
     ATHENA_INTEGER_TYPES, ATHENA_NUMERIC_TYPES, ATHENA_REAL_TYPES
 from aws_managers.athena.queries.athena_query_generator import \
-    AthenaQueryGenerator
+    AthenaQueryGenerator, ATHENA_QUERY_GENERATOR
 from aws_managers.athena.athena_series import AthenaSeries
 from aws_managers.athena.clauses.conjunctive_operators import \
     ConjunctiveOperator, And
+from aws_managers.athena.execution.query_batch_executor import \
+    QueryBatchExecutor
+from aws_managers.athena.incremental_athena_frame import \
+    IncrementalAthenaFrame
+from aws_managers.athena.functions.aggregate_spec import \
+    AggregateExpression, parse_aggregate_spec, validate_standard_error
 from aws_managers.athena.operators.mixins import ComparisonMixin
 
 
-class AthenaFrame(object):
+PARTITION_POLICIES = ('ignore', 'warn', 'raise')
+
+
+class AthenaFrame(
+    AthenaExecutionMixin,
+    object
+):
+    # limits for splitting per-column aggregates of wide frames into chunks
+    max_query_length: int = MAX_QUERY_LENGTH
+    max_columns_per_query: int = MAX_COLUMNS_PER_QUERY
+    max_concurrent_chunks: int = 8
 
     def __init__(
             self,
@@ -26,11 +64,23 @@ class AthenaFrame(object):
             sample: Optional[Tuple[str, int]] = None,
             where: Optional[Union[ComparisonMixin, ConjunctiveOperator]] = None,
             limit: Optional[int] = None,
-            column_info: Optional[DataFrame] = None
+            column_info: Optional[DataFrame] = None,
+            cache: Optional[QueryResultCache] = None,
+            metadata: Optional[MetadataBackend] = None,
+            columns: Optional[List[str]] = None,
+            backend: Optional[ExecutionBackend] = None,
+            approximate: bool = False,
+            max_standard_error: Optional[float] = None,
+            partition_policy: str = 'ignore',
+            max_scan_bytes: Optional[int] = None
     ):
         """
         Create a new AthenaFrame.
 
+        The table schema is not resolved until something needs it e.g. columns,
+        data_types, column_query_set or a data-type based selector, so building
+        chains of frames does not run any queries.
+
         :param database: Name of the Athena database.
         :param table: Name of the Athena table.
         :param column_info: Column info from schema if this is a subset of an
@@ -38,24 +88,59 @@ class AthenaFrame(object):
         :param sample: Optional tuple of 'BERNOULLI' or 'SYSTEM' and an
                        integer percentage.
         :param where: Values for WHERE clause.
-        """
-        self._q: AthenaQueryGenerator = AthenaQueryGenerator()
+        :param cache: Optional cache to read query results from and write them
+                      to.
+        :param metadata: Optional backend to read the table schema from e.g.
+                         GlueMetadataBackend. Defaults to querying
+                         information_schema.
+        :param columns: Optional names of columns to restrict the frame to.
+        :param backend: Backend to execute queries with. Defaults to a new
+                        AthenaBackend.
+        :param approximate: Whether to compute count_distinct, median and their
+                            agg spec equivalents with approximate functions.
+        :param max_standard_error: Optional maximum standard error of
+                                   approximate distinct counts, between
+                                   0.0040625 and 0.26. Defaults to Athena's
+                                   2.3%.
+        :param partition_policy: What to do before running a query over a
+                                 partitioned table without a predicate on its
+                                 partition columns, which scans every
+                                 partition. One of 'ignore', 'warn' or 'raise'.
+        :param max_scan_bytes: Optional budget for the data read by each frame
+                               method. Each query is explained before it runs
+                               and a ValueError raised if the estimated input
+                               size is over budget. Queries whose size can't
+                               be estimated are run.
+        """
+        validate_standard_error(max_standard_error)
+        if partition_policy not in PARTITION_POLICIES:
+            raise ValueError(
+                f'partition_policy must be one of {PARTITION_POLICIES}'
+            )
+        self._q: AthenaQueryGenerator = ATHENA_QUERY_GENERATOR
         self._database: str = database
         self._table: str = table
+        if backend is None:
+            backend = AthenaBackend()
+        self._backend: ExecutionBackend = backend
+        self._cache: Optional[QueryResultCache] = cache
+        self._metadata: Optional[MetadataBackend] = metadata
+        self._columns: Optional[List[str]] = columns
+        self._resolved_column_info: Optional[DataFrame] = None
         if isinstance(column_info, DataFrame):
-            self._column_info: DataFrame = column_info
-        else:
-            self._column_info: DataFrame = self._execute(
-                sql=self._q.column_info(
-                    database=self._database, table=self._table)
-            )
-        self.column_query_set = AthenaColumnQuerySet(
-            column_info=self._column_info)
+            self._resolved_column_info = self._filter_columns(column_info)
+        self._column_query_set: Optional[AthenaColumnQuerySet] = None
+        self._captured: Optional[List[AthenaQueryPlan]] = None
         self._sample: Optional[Tuple[str, int]] = sample
         self._where: Optional[Union[
             ComparisonMixin, ConjunctiveOperator
         ]] = where
         self._limit: Optional[int] = limit
+        self._persisted_location: Optional[str] = None
+        self._approximate: bool = approximate
+        self._max_standard_error: Optional[float] = max_standard_error
+        self._partition_policy: str = partition_policy
+        self._max_scan_bytes: Optional[int] = max_scan_bytes
 
     # region metadata
 
@@ -80,6 +165,46 @@ class AthenaFrame(object):
             limit=self._limit,
         )
 
+    def _filter_columns(self, column_info: DataFrame) -> DataFrame:
+        """
+        Restrict column info to the frame's columns, if it has been given any.
+        """
+        if self._columns is None:
+            return column_info
+        return column_info.loc[column_info['column_name'].isin(self._columns)]
+
+    @property
+    def _column_info(self) -> DataFrame:
+        """
+        Column info of the frame, resolved from the schema registry on first
+        use.
+        """
+        if self._resolved_column_info is None:
+            self._resolved_column_info = self._filter_columns(
+                self._table_column_info()
+            )
+        return self._resolved_column_info
+
+    @property
+    def column_query_set(self) -> AthenaColumnQuerySet:
+        """
+        Column queries for interactive querying of the frame's columns.
+        """
+        if self._column_query_set is None:
+            if self._columns is None:
+                # frames over the whole table share the registered schema's
+                self._column_query_set = SCHEMA_REGISTRY.shared(
+                    database=self._database,
+                    table=self._table,
+                    column_info=self._column_info,
+                    name='column_query_set',
+                    build=AthenaColumnQuerySet
+                )
+            else:
+                self._column_query_set = AthenaColumnQuerySet(
+                    column_info=self._column_info)
+        return self._column_query_set
+
     @property
     def columns(self) -> Index:
         """
@@ -98,15 +223,6 @@ class AthenaFrame(object):
 
     # region query execution
 
-    def _execute(self, sql: str) -> DataFrame:
-        """
-        Execute a query.
-
-        :param sql: Raw SQL to execute.
-        """
-        data = read_sql_query(sql=sql, database=self._database)
-        return data
-
     @property
     def _execution_kwargs(self) -> dict:
         return dict(
@@ -117,6 +233,168 @@ class AthenaFrame(object):
             limit=self._limit
         )
 
+    def _derive(self, **kwargs) -> 'AthenaFrame':
+        """
+        Return a new AthenaFrame with the same settings as this one, except for
+        those given as keyword arguments.
+        """
+        frame_kwargs = dict(
+            database=self._database,
+            table=self._table,
+            sample=self._sample,
+            where=self._where,
+            limit=self._limit,
+            column_info=self._resolved_column_info,
+            cache=self._cache,
+            metadata=self._metadata,
+            columns=self._columns,
+            backend=self._backend,
+            approximate=self._approximate,
+            max_standard_error=self._max_standard_error,
+            partition_policy=self._partition_policy,
+            max_scan_bytes=self._max_scan_bytes
+        )
+        frame_kwargs.update(kwargs)
+        frame = AthenaFrame(**frame_kwargs)
+        if 'column_info' not in kwargs and 'columns' not in kwargs:
+            # same columns, so the column queries can be shared
+            frame._column_query_set = self._column_query_set
+        frame.max_query_length = self.max_query_length
+        frame.max_columns_per_query = self.max_columns_per_query
+        frame.max_concurrent_chunks = self.max_concurrent_chunks
+        return frame
+
+    def _run(self, query: AthenaQuery) -> Any:
+        """
+        Execute a query and shape its result, or record the query without
+        executing it if the frame is capturing queries.
+
+        :param query: The query to run.
+        """
+        return self._run_plan(AthenaQueryPlan([query]))
+
+    def _run_plan(self, plan: AthenaQueryPlan) -> Any:
+        """
+        Execute the queries of a plan, concurrently if there are several, and
+        combine their results, or record the plan without executing it if the
+        frame is capturing queries.
+
+        :param plan: The plan to run.
+        """
+        if self._captured is not None:
+            self._captured.append(plan)
+            return None
+        self._check_queries([query.sql for query in plan])
+        if len(plan) == 1:
+            return plan.shape_results([self._execute(
+                sql=plan[0].sql, descriptor=plan[0].descriptor
+            )])
+        caller = find_call_site()
+        return plan.shape_results(
+            QueryBatchExecutor(max_workers=self.max_concurrent_chunks).map(
+                func=lambda query: self._execute(
+                    sql=query.sql, caller=caller, descriptor=query.descriptor
+                ),
+                items=plan.queries,
+                raise_errors=True
+            )
+        )
+
+    def _column_chunk_plan(
+            self,
+            columns: List[str],
+            query: Callable[[List[str]], AthenaQuery]
+    ) -> AthenaQueryPlan:
+        """
+        Return a plan that computes a per-column query over column chunks that
+        keep each query within Athena's query length limit and
+        max_columns_per_query, and concatenates the resulting Series.
+
+        Sampled frames are not chunked, as each chunk would draw its own
+        TABLESAMPLE and describe different rows, so max_columns_per_query is
+        ignored for them. Persist a sampled frame that has too many columns
+        for one query, and query the persisted table instead.
+
+        :param columns: Names of the columns to query.
+        :param query: Function that returns the query for a chunk of columns,
+                      whose shaped result is a Series indexed by column.
+        """
+        chunks = chunk_columns(
+            columns=columns,
+            render=lambda chunk: query(chunk).sql,
+            max_length=self.max_query_length,
+            max_columns=(
+                self.max_columns_per_query if self._sample is None
+                else max(len(columns), 1)
+            )
+        )
+        if len(chunks) > 1 and self._sample is not None:
+            raise ValueError(
+                f'The query for {len(columns)} columns of a sampled frame '
+                f'is longer than {self.max_query_length} bytes and chunks '
+                f'would each use a different sample. Persist the sample or '
+                f'select fewer columns.'
+            )
+        if len(chunks) == 1:
+            return AthenaQueryPlan([query(columns)])
+
+        def combine(results: List[Series]) -> Series:
+            combined = concat(results)
+            combined.attrs = results[0].attrs
+            return combined
+
+        return AthenaQueryPlan(
+            queries=[query(chunk) for chunk in chunks], combine=combine
+        )
+
+    def execute_many(
+            self,
+            queries: List[Union[str, AthenaQuery]],
+            max_workers: int = 8,
+            raise_errors: bool = False
+    ) -> List[Union[DataFrame, Any, Exception]]:
+        """
+        Execute independent queries in parallel against the frame's database.
+
+        Results are returned in the order the queries were given. A failed
+        query's exception is returned in place of its result unless
+        raise_errors is True. The number of queries active in Athena at once is
+        capped process-wide by QUERY_LIMITER.
+
+        :param queries: Raw SQL strings, or AthenaQuery objects whose results
+                        will be shaped.
+        :param max_workers: Maximum number of queries to submit at the same
+                            time.
+        :param raise_errors: Whether to raise the first error once all the
+                             queries have finished.
+        """
+        caller = find_call_site()
+
+        def run(query: Union[str, AthenaQuery]):
+            if isinstance(query, str):
+                return self._execute(sql=query, caller=caller)
+            return query.shape_result(
+                self._execute(sql=query.sql, caller=caller)
+            )
+
+        return QueryBatchExecutor(max_workers=max_workers).map(
+            func=run, items=queries, raise_errors=raise_errors
+        )
+
+    def _capture(self, method: str, *args, **kwargs) -> AthenaQueryPlan:
+        """
+        Return the plan of queries that calling a method of the frame would
+        run, without running them.
+
+        :param method: Name of the method e.g. 'max' or 'sum_by_group'.
+        :param args: Positional arguments to pass to the method.
+        :param kwargs: Keyword arguments to pass to the method.
+        """
+        frame = self._derive()
+        frame._captured = []
+        getattr(frame, method)(*args, **kwargs)
+        return frame._captured[0]
+
     # endregion
 
     def select(
@@ -126,11 +404,35 @@ class AthenaFrame(object):
         """
         Do a basic selection using columns or column queries.
         """
-        data = self._execute(sql=self._q.select(
-            columns=columns,
-            **self._execution_kwargs
+        return self._run(AthenaQuery(
+            sql=self._q.select(columns=columns, **self._execution_kwargs),
+            descriptor=QueryDescriptor.from_select(
+                columns=columns, **self._execution_kwargs
+            )
         ))
-        return data
+
+    def iter_batches(
+            self,
+            columns: Union[
+                str, ColumnQuery, List[str], List[ColumnQuery]
+            ] = '*',
+            batch_rows: int = 100_000
+    ) -> Iterator[DataFrame]:
+        """
+        Do a basic selection using columns or column queries and yield the
+        result in DataFrames of at most batch_rows rows, so that results larger
+        than memory can be processed incrementally.
+
+        :param columns: Columns or column queries to select.
+        :param batch_rows: Maximum number of rows per batch.
+        """
+        if batch_rows < 1:
+            raise ValueError('batch_rows must be at least 1')
+        sql = self._q.select(columns=columns, **self._execution_kwargs)
+        self._check_queries([sql])
+        return self._iter_batches(
+            sql=sql, batch_rows=batch_rows, caller=find_call_site()
+        )
 
     # region sampling
 
@@ -140,41 +442,30 @@ class AthenaFrame(object):
 
         :param n: Number of rows to sample.
         """
-        data = self._execute(sql=self._q.select(
+        select_kwargs = dict(
             columns='*',
             database=self._database,
             table=self._table,
             sample=self._sample,
             where=self._where,
             limit=n
+        )
+        return self._run(AthenaQuery(
+            sql=self._q.select(**select_kwargs),
+            descriptor=QueryDescriptor.from_select(**select_kwargs)
         ))
-        return data
 
     def bernoulli_sample(self, percentage: int) -> 'AthenaFrame':
         """
         Do sampling from the Frame using the Bernoulli method.
         """
-        return AthenaFrame(
-            database=self._database,
-            table=self._table,
-            sample=('BERNOULLI', percentage),
-            where=self._where,
-            limit=self._limit,
-            column_info=self._column_info,
-        )
+        return self._derive(sample=('BERNOULLI', percentage))
 
     def system_sample(self, percentage: int) -> 'AthenaFrame':
         """
         Do sampling from the Frame using the System method.
         """
-        return AthenaFrame(
-            database=self._database,
-            table=self._table,
-            sample=('SYSTEM', percentage),
-            where=self._where,
-            limit=self._limit,
-            column_info=self._column_info
-        )
+        return self._derive(sample=('SYSTEM', percentage))
 
     # endregion
 
@@ -209,14 +500,7 @@ class AthenaFrame(object):
             column_info = self._column_info.loc[
                 ~self._column_info.isin(exclude)
             ]
-        return AthenaFrame(
-            database=self._database,
-            table=self._table,
-            sample=self._sample,
-            where=self._where,
-            limit=self._limit,
-            column_info=column_info
-        )
+        return self._derive(column_info=column_info)
 
     def select_numeric_types(self) -> 'AthenaFrame':
         """
@@ -263,15 +547,77 @@ class AthenaFrame(object):
 
     # endregion
 
+    # region approximate execution
+
+    @property
+    def approximate(self) -> bool:
+        return self._approximate
+
+    def approx(
+            self,
+            max_standard_error: Optional[float] = None
+    ) -> 'AthenaFrame':
+        """
+        Return a new AthenaFrame that computes count_distinct, median and their
+        agg spec equivalents with approx_distinct (HyperLogLog) and
+        approx_percentile (quantile digest), which use far less memory and time
+        on large tables. Results computed approximately are labelled in their
+        attrs['approximate'].
+
+        :param max_standard_error: Optional maximum standard error of distinct
+                                   counts, between 0.0040625 and 0.26.
+                                   Defaults to Athena's 2.3%.
+        """
+        return self._derive(
+            approximate=True, max_standard_error=max_standard_error
+        )
+
+    def exact(self) -> 'AthenaFrame':
+        """
+        Return a new AthenaFrame that computes exact results.
+        """
+        return self._derive(approximate=False, max_standard_error=None)
+
+    def _label_approximate(
+            self,
+            result: Union[DataFrame, Series],
+            approximate: Union[bool, List[Tuple[str, str]]]
+    ) -> Union[DataFrame, Series]:
+        """
+        Label a result with whether, or which parts of it, were computed
+        approximately.
+
+        :param result: The shaped result.
+        :param approximate: True or False for a result computed with a single
+                            function, or the (column, function) labels of
+                            approximate values.
+        """
+        result.attrs['approximate'] = approximate
+        if approximate and self._max_standard_error is not None:
+            result.attrs['max_standard_error'] = self._max_standard_error
+        return result
+
+    # endregion
+
     def count_distinct(self) -> Series:
         """
-        Count number of distinct elements.
+        Count number of distinct elements, approximately if the frame is in
+        approximate mode.
         """
-        data = self._execute(self._q.count_distinct(
+        return self._run_plan(self._column_chunk_plan(
             columns=self.columns.to_list(),
-            **self._execution_kwargs
+            query=lambda columns: AthenaQuery(
+                sql=self._q.count_distinct(
+                    columns=columns,
+                    approximate=self._approximate,
+                    max_standard_error=self._max_standard_error,
+                    **self._execution_kwargs
+                ),
+                shape=lambda data: self._label_approximate(
+                    data.iloc[0], self._approximate
+                )
+            )
         ))
-        return data.iloc[0]
 
     # region general aggregates
 
@@ -281,12 +627,17 @@ class AthenaFrame(object):
 
         :param agg_name: Name of the aggregate function.
         """
-        data = self._execute(self._q.aggregate(
-            agg_name=agg_name,
+        return self._run_plan(self._column_chunk_plan(
             columns=self.columns.to_list(),
-            **self._execution_kwargs
+            query=lambda columns: AthenaQuery(
+                sql=self._q.aggregate(
+                    agg_name=agg_name,
+                    columns=columns,
+                    **self._execution_kwargs
+                ),
+                shape=lambda data: data.iloc[0]
+            )
         ))
-        return data.iloc[0]
 
     def geometric_mean(self) -> Series:
         """
@@ -308,9 +659,22 @@ class AthenaFrame(object):
 
     def median(self) -> Series:
         """
-        Return the median of the values.
+        Return the median of the values, approximately with
+        approx_percentile(..., 0.5) if the frame is in approximate mode.
         """
-        return self._agg('median')
+        if not self._approximate:
+            return self._agg('median')
+        return self._run_plan(self._column_chunk_plan(
+            columns=self.columns.to_list(),
+            query=lambda columns: AthenaQuery(
+                sql=self._q.approx_percentile(
+                    columns=columns,
+                    percentile=0.5,
+                    **self._execution_kwargs
+                ),
+                shape=lambda data: self._label_approximate(data.iloc[0], True)
+            )
+        ))
 
     def min(self) -> Series:
         """
@@ -324,6 +688,59 @@ class AthenaFrame(object):
         """
         return self._agg('sum')
 
+    def agg(self, spec: Dict[str, Union[str, List[str]]]) -> DataFrame:
+        """
+        Compute several aggregates of several columns in a single scan.
+
+        Returns a DataFrame with a row for each function and a column for each
+        column in the spec, like pandas.DataFrame.agg
+
+        :param spec: Mapping of column names to a function name or list of
+                     function names, with any extra arguments after a colon
+                     e.g. {'col_a': ['min', 'max', 'avg'],
+                           'col_b': ['approx_percentile:0.9']}
+        """
+        expressions = parse_aggregate_spec(
+            spec=spec,
+            approximate=self._approximate,
+            max_standard_error=self._max_standard_error
+        )
+        return self._run(AthenaQuery(
+            sql=self._q.aggregate_expressions(
+                expressions=[(e.expression, e.alias) for e in expressions],
+                **self._execution_kwargs
+            ),
+            shape=lambda data: self._shape_agg(data, expressions)
+        ))
+
+    def _shape_agg(
+            self,
+            data: DataFrame,
+            expressions: List[AggregateExpression]
+    ) -> DataFrame:
+        """
+        Reshape the single-row result of an agg query into a DataFrame of
+        functions x columns.
+        """
+        row = data.iloc[0]
+        values = {}
+        for e in expressions:
+            values.setdefault(e.column, {})[e.function] = row[e.alias]
+        functions = list(dict.fromkeys(e.function for e in expressions))
+        return self._label_approximate(
+            DataFrame(values).reindex(functions),
+            [(e.column, e.function) for e in expressions if e.approximate]
+        )
+
+    def groupby(self, group_columns: Union[str, List[str]]) -> AthenaGroupBy:
+        """
+        Group the frame by one or more columns, for computing several
+        aggregates per group in a single scan with .agg({...})
+
+        :param group_columns: Column or columns to group by.
+        """
+        return AthenaGroupBy(frame=self, group_columns=group_columns)
+
     def _agg_by_group(
             self,
             agg_name: str,
@@ -340,13 +757,15 @@ class AthenaFrame(object):
         :param agg_columns: Columns to sum.
         :param group_columns: Columns to group by.
         """
-        data = self._execute(sql=self._q.aggregate_by_group(
-            agg_name=agg_name,
-            agg_columns=agg_columns,
-            group_columns=group_columns,
-            **self._execution_kwargs
+        return self._run(AthenaQuery(
+            sql=self._q.aggregate_by_group(
+                agg_name=agg_name,
+                agg_columns=agg_columns,
+                group_columns=group_columns,
+                **self._execution_kwargs
+            ),
+            shape=lambda data: data.set_index(group_columns)[agg_columns]
         ))
-        return data.set_index(group_columns)[agg_columns]
 
     def sum_by_group(
             self,
@@ -431,48 +850,105 @@ class AthenaFrame(object):
 
     # region approximate aggregate functions
 
+    @staticmethod
+    def _unpack_array(value: Any) -> List[float]:
+        """
+        Return the elements of an array result, which is returned as a string
+        e.g. '[0.1, 0.5]' when the results are parsed from CSV.
+        """
+        if isinstance(value, str):
+            return [
+                float(element) if element.strip() != 'null' else nan
+                for element in value.strip('[]').split(',')
+            ]
+        return list(value)
+
     def approx_percentile(
             self,
             columns: Union[str, List[str]],
-            percentile: float
-    ):
+            percentile: Union[float, List[float]]
+    ) -> DataFrame:
         """
         Returns the approximate percentile for all input values of the column at
         the given percentage. The value of percentage must be between zero and
         one and must be constant for all input rows.
 
+        If a list of percentiles is given, each column's percentiles are
+        computed with a single approx_percentile call and returned as a
+        DataFrame with a row for each column and a column for each percentile.
+
         :param columns: Columns to find percentile of.
-        :param percentile: Percentile value to find.
+        :param percentile: Percentile value, or list of values, to find.
         """
-        data = self._execute(sql=self._q.approx_percentile(
-            columns=columns,
-            percentile=percentile,
-            **self._execution_kwargs
+        if isinstance(columns, str):
+            columns = [columns]
+
+        def unpack(data: DataFrame) -> DataFrame:
+            return DataFrame(
+                data=[self._unpack_array(data[column].iloc[0])
+                      for column in columns],
+                index=Index(columns, name='column'),
+                columns=Index(percentile, name='percentile')
+            )
+
+        return self._run(AthenaQuery(
+            sql=self._q.approx_percentile(
+                columns=columns,
+                percentile=percentile,
+                **self._execution_kwargs
+            ),
+            shape=unpack if isinstance(percentile, list) else None
         ))
-        return data
 
     def approx_percentile_by_group(
             self,
             percentile_columns: Union[str, List[str]],
             group_columns: Union[str, List[str]],
-            percentile: float
-    ):
+            percentile: Union[float, List[float]]
+    ) -> Union[DataFrame, Series]:
         """
         Returns the approximate percentile for all input values of the column at
         the given percentage. The value of percentage must be between zero and
         one and must be constant for all input rows.
 
+        If a list of percentiles is given, each column's percentiles are
+        computed with a single approx_percentile call and returned with a
+        (column, percentile) MultiIndex on the columns.
+
         :param percentile_columns: Columns to find percentile of.
         :param group_columns: Columns to find percentile of.
-        :param percentile: Percentile value to find.
-        """
-        data = self._execute(sql=self._q.approx_percentile_by_group(
-            percentile_columns=percentile_columns,
-            group_columns=group_columns,
-            percentile=percentile,
-            **self._execution_kwargs
+        :param percentile: Percentile value, or list of values, to find.
+        """
+        def unpack(data: DataFrame) -> DataFrame:
+            columns = percentile_columns
+            if isinstance(columns, str):
+                columns = [columns]
+            data = data.set_index(group_columns)
+            return DataFrame(
+                data=[
+                    [value
+                     for column in columns
+                     for value in self._unpack_array(row[column])]
+                    for _, row in data.iterrows()
+                ],
+                index=data.index,
+                columns=MultiIndex.from_product(
+                    [columns, percentile], names=['column', 'percentile']
+                )
+            )
+
+        def shape(data: DataFrame) -> Union[DataFrame, Series]:
+            return data.set_index(group_columns)[percentile_columns]
+
+        return self._run(AthenaQuery(
+            sql=self._q.approx_percentile_by_group(
+                percentile_columns=percentile_columns,
+                group_columns=group_columns,
+                percentile=percentile,
+                **self._execution_kwargs
+            ),
+            shape=unpack if isinstance(percentile, list) else shape
         ))
-        return data.set_index(group_columns)[percentile_columns]
 
     # endregion
 
@@ -483,6 +959,9 @@ class AthenaFrame(object):
         """
         Return a new AthenaFrame matching the given condition(s).
 
+        The conditions are combined with any existing ones and simplified, so
+        equivalent frames render identical SQL.
+
         :param conditions: Column comparison or conjunction of column
         comparisons.
         """
@@ -490,14 +969,7 @@ class AthenaFrame(object):
             where = And([self._where, conditions])
         else:
             where = conditions
-        return AthenaFrame(
-            database=self._database,
-            table=self._table,
-            sample=self._sample,
-            where=where,
-            limit=self._limit,
-            column_info=self._column_info
-        )
+        return self._derive(where=where.simplify())
 
     def limit(self, n: int) -> 'AthenaFrame':
         """
@@ -505,14 +977,301 @@ class AthenaFrame(object):
 
         :param n: number of rows to limit output to.
         """
-        return AthenaFrame(
+        return self._derive(limit=n)
+
+    # region partitions
+
+    def with_partition_policy(self, policy: str) -> 'AthenaFrame':
+        """
+        Return a new AthenaFrame with a different partition policy.
+
+        :param policy: One of 'ignore', 'warn' or 'raise'.
+        """
+        return self._derive(partition_policy=policy)
+
+    def _has_partition_predicate(self) -> bool:
+        """
+        Return whether the frame's conditions restrict the partitions that are
+        read i.e. at least one of the top-level conditions ANDed together only
+        refers to partition columns.
+        """
+        if self._where is None:
+            return False
+        partition_columns = set(self.partition_columns)
+        items = (
+            self._where.items if isinstance(self._where, And)
+            else [self._where]
+        )
+        return any(item.columns() <= partition_columns for item in items)
+
+    def _check_partition_predicate(self, caller: Optional[FrameType] = None):
+        """
+        Warn or raise, depending on the partition policy, if a query over a
+        partitioned table would scan every partition.
+
+        :param caller: Optional frame of the user's code to attribute warnings
+                       to, for checks run on worker threads. Defaults to the
+                       caller found on the stack.
+        """
+        if self._partition_policy == 'ignore':
+            return
+        partition_columns = self.partition_columns
+        if len(partition_columns) == 0 or self._has_partition_predicate():
+            return
+        message = (
+            f'Query over {self._database}.{self._table} has no condition on '
+            f'its partition columns {partition_columns} and will scan every '
+            f'partition'
+        )
+        if self._partition_policy == 'raise':
+            raise ValueError(message)
+        # point the warning at the user's code rather than the frame method
+        if caller is None:
+            _, caller = find_caller_frame()
+        if caller is None:
+            warn(message)
+            return
+        warn_explicit(
+            message,
+            category=UserWarning,
+            filename=caller.f_code.co_filename,
+            lineno=caller.f_lineno,
+            module=caller.f_globals.get('__name__'),
+            registry=caller.f_globals.setdefault('__warningregistry__', {})
+        )
+
+    def incremental(
+            self,
+            store: Optional[PartialAggregateStore] = None,
+            recompute_last: int = 0
+    ) -> IncrementalAthenaFrame:
+        """
+        Return an IncrementalAthenaFrame that computes aggregates of the
+        frame from stored partial aggregates of each partition, so that each
+        call only queries the partitions added since the last one.
+
+        :param store: Store for the partial aggregates. Defaults to a new
+                      PartialAggregateStore in the default directory.
+        :param recompute_last: Number of the latest partitions to query again
+                               on every call e.g. 1 for today's partition.
+        """
+        return IncrementalAthenaFrame(
+            frame=self, store=store, recompute_last=recompute_last
+        )
+
+    # endregion
+
+    # region query plans
+
+    def with_max_scan_bytes(
+            self,
+            max_scan_bytes: Optional[int]
+    ) -> 'AthenaFrame':
+        """
+        Return a new AthenaFrame with a different budget for the data read by
+        each method.
+
+        :param max_scan_bytes: Maximum estimated input size in bytes, or None
+                               for no budget.
+        """
+        return self._derive(max_scan_bytes=max_scan_bytes)
+
+    def _explain_query(
+            self,
+            sql: str,
+            explain_type: str = 'IO',
+            analyze: bool = False
+    ) -> QueryExplanation:
+        """
+        Explain a single query.
+
+        :param sql: SQL of the query.
+        :param explain_type: 'DISTRIBUTED' or 'IO'.
+        :param analyze: Whether to run the query with EXPLAIN ANALYZE.
+        """
+        result = self._execute(sql=self._q.explain(
+            query=sql,
+            type=explain_type,
+            format='JSON' if explain_type == 'IO' and not analyze else 'TEXT',
+            analyze=analyze
+        ))
+        return QueryExplanation(
+            sql=sql,
+            result=result,
+            explain_type=explain_type,
+            analyze=analyze,
+            partitions=(
+                self.partitions() if len(self.partition_columns) > 0
+                else None
+            ),
+            statistics=self.last_query_stats
+        )
+
+    def explain(
+            self,
+            method: str,
+            *args,
+            analyze: bool = False,
+            explain_type: str = 'IO',
+            **kwargs
+    ) -> List[QueryExplanation]:
+        """
+        Explain the queries that calling a method of the frame would run,
+        without running them e.g.
+
+            frame.where(...).explain('sum_by_group', 'col_a', 'col_b')
+
+        IO plans give the estimated input size of each query and the
+        partitions it reads. EXPLAIN ANALYZE runs each query, so is billed for
+        the data it scans, and gives the actual cost of each operation.
+
+        :param method: Name of the method e.g. 'max' or 'sum_by_group'.
+        :param args: Positional arguments to pass to the method.
+        :param analyze: Whether to run the queries with EXPLAIN ANALYZE.
+        :param explain_type: 'IO' for the tables read, their constraints and
+                             estimated size, or 'DISTRIBUTED' for the plan
+                             fragments. Ignored if analyze is True.
+        :param kwargs: Keyword arguments to pass to the method.
+        """
+        if explain_type not in EXPLAIN_TYPES:
+            raise ValueError(f'explain_type must be one of {EXPLAIN_TYPES}')
+        plan = self._capture(method, *args, **kwargs)
+        return [
+            self._explain_query(
+                sql=query.sql, explain_type=explain_type, analyze=analyze
+            )
+            for query in plan
+        ]
+
+    def _check_scan_bytes(self, sqls: List[str]):
+        """
+        Raise a ValueError if the estimated input size of the queries of a
+        frame method is over the frame's max_scan_bytes.
+
+        :param sqls: SQL of the queries.
+        """
+        if self._max_scan_bytes is None:
+            return
+        estimates = [
+            self._explain_query(sql=sql).estimated_bytes for sql in sqls
+        ]
+        estimated_bytes = sum(
+            estimate for estimate in estimates if estimate is not None
+        )
+        if estimated_bytes > self._max_scan_bytes:
+            raise ValueError(
+                f'Query over {self._database}.{self._table} is estimated to '
+                f'read {estimated_bytes:,.0f} bytes, more than max_scan_bytes '
+                f'of {self._max_scan_bytes:,}'
+            )
+
+    def _check_queries(
+            self,
+            sqls: List[str],
+            caller: Optional[FrameType] = None
+    ):
+        """
+        Check the queries of a frame method against the frame's partition
+        policy and max_scan_bytes before they run.
+
+        :param sqls: SQL of the queries.
+        :param caller: Optional frame of the user's code to attribute warnings
+                       to, for checks run on worker threads.
+        """
+        self._check_partition_predicate(caller=caller)
+        self._check_scan_bytes(sqls)
+
+    # endregion
+
+    # region materialisation
+
+    def persist(
+            self,
+            s3_location: str,
+            table: Optional[str] = None
+    ) -> 'AthenaFrame':
+        """
+        Materialise the frame's sample, filter, limit and columns into a new
+        snappy-compressed parquet table with CREATE TABLE AS, and return a
+        frame over the new table, so that later queries only scan the subset.
+
+        The new table is temporary unless a name is given, and is dropped
+        along with its data by drop(), or on exit if the returned frame is used
+        as a context manager e.g.
+
+            with frame.where(...).bernoulli_sample(10).persist(s3) as subset:
+                subset.max()
+
+        :param s3_location: S3 prefix to write the table data under. The data
+                            is written to <s3_location>/<table>/
+        :param table: Optional name of the table to create. Defaults to a
+                      unique name based on this frame's table.
+        """
+        temporary = table is None
+        if temporary:
+            table = f'{self._table}_{uuid4().hex[:12]}'
+        location = f'{s3_location.rstrip("/")}/{table}/'
+        column_info = self._column_info.copy()
+        query = self._q.select(
+            columns=column_info['column_name'].to_list(),
+            **self._execution_kwargs
+        )
+        self._check_queries([query])
+        self._execute_statement(sql=self._q.create_table_as(
             database=self._database,
-            table=self._table,
-            sample=self._sample,
-            where=self._where,
-            limit=n,
-            column_info=self._column_info
+            table=table,
+            query=query,
+            location=location
+        ))
+        column_info['table_schema'] = self._database
+        column_info['table_name'] = table
+        column_info['ordinal_position'] = range(1, len(column_info) + 1)
+        column_info['extra_info'] = None
+        column_info = column_info.reset_index(drop=True)
+        SCHEMA_REGISTRY.register(self._database, table, column_info)
+        if self._cache is not None:
+            self._cache.invalidate(database=self._database, table=table)
+        # the new table already has the sample, filter, limit and columns
+        frame = self._derive(
+            table=table,
+            column_info=column_info,
+            sample=None,
+            where=None,
+            limit=None,
+            columns=None
         )
+        if temporary:
+            frame._persisted_location = location
+        return frame
+
+    def drop(self):
+        """
+        Drop a temporary table created by persist and delete its data.
+        """
+        if self._persisted_location is None:
+            raise ValueError(
+                f'{self._database}.{self._table} is not a temporary table '
+                f'created by persist'
+            )
+        self._execute_statement(sql=self._q.drop_table(
+            database=self._database, table=self._table
+        ))
+        self._backend.delete_data(self._persisted_location)
+        self._persisted_location = None
+        SCHEMA_REGISTRY.invalidate(self._database, self._table)
+        if self._cache is not None:
+            self._cache.invalidate(database=self._database, table=self._table)
+
+    def __enter__(self) -> 'AthenaFrame':
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+
+        if self._persisted_location is not None:
+            self.drop()
+
+    # endregion
 
     def __getitem__(self, item: Union[str, List[str]]):
         """
@@ -521,24 +1280,24 @@ class AthenaFrame(object):
         :param item: Name(s) of the column or columns to select.
         """
         if isinstance(item, str):
+            if self._resolved_column_info is not None:
+                column_info = self._resolved_column_info.loc[
+                    self._resolved_column_info['column_name'] == item
+                ].iloc[0]
+            else:
+                column_info = None
             return AthenaSeries(
                 database=self._database,
                 table=self._table,
                 column=item,
                 sample=self._sample,
                 where=self._where,
-                column_info=self._column_info.loc[
-                    self._column_info['column_name'] == item
-                ].iloc[0],
+                column_info=column_info,
+                cache=self._cache,
+                metadata=self._metadata,
+                backend=self._backend
             )
         else:
-            return AthenaFrame(
-                database=self._database,
-                table=self._table,
-                sample=self._sample,
-                where=self._where,
-                limit=self._limit,
-                column_info=self._column_info.loc[
-                    self._column_info['column_name'].isin(item)
-                ]
-            )
+            if self._columns is not None:
+                item = [column for column in item if column in self._columns]
+            return self._derive(columns=item)
@@ -0,0 +1,80 @@
+from typing import Dict, List, Union
+
+from pandas import DataFrame, MultiIndex
+
+from aws_managers.athena.functions.aggregate_spec import \
+    AggregateExpression, parse_aggregate_spec
+from aws_managers.athena.queries.athena_query import AthenaQuery
+
+
+class AthenaGroupBy(object):
+
+    def __init__(
+            self,
+            frame: 'AthenaFrame',
+            group_columns: Union[str, List[str]]
+    ):
+        """
+        Create a new AthenaGroupBy.
+
+        :param frame: The AthenaFrame to group.
+        :param group_columns: Column or columns to group by.
+        """
+        if isinstance(group_columns, str):
+            group_columns = [group_columns]
+        self._frame = frame
+        self._group_columns: List[str] = group_columns
+
+    @property
+    def group_columns(self) -> List[str]:
+        return self._group_columns
+
+    def agg(self, spec: Dict[str, Union[str, List[str]]]) -> DataFrame:
+        """
+        Compute several aggregates of several columns for each group in a
+        single GROUP BY.
+
+        Returns a DataFrame indexed by the group columns with a
+        (column, function) MultiIndex on the columns. If the frame is in
+        approximate mode, count_distinct and median are computed
+        approximately and labelled in attrs['approximate'].
+
+        :param spec: Mapping of column names to a function name or list of
+                     function names, with any extra arguments after a colon
+                     e.g. {'col_a': ['sum', 'max'],
+                           'col_b': ['approx_distinct', 'approx_percentile:0.5'],
+                           '*': 'count'}
+        """
+        expressions = parse_aggregate_spec(
+            spec=spec,
+            approximate=self._frame.approximate,
+            max_standard_error=self._frame._max_standard_error
+        )
+        return self._frame._run(AthenaQuery(
+            sql=self._frame._q.aggregate_expressions_by_group(
+                expressions=[(e.expression, e.alias) for e in expressions],
+                group_columns=self._group_columns,
+                **self._frame._execution_kwargs
+            ),
+            shape=lambda data: self._shape_agg(data, expressions)
+        ))
+
+    def _shape_agg(
+            self,
+            data: DataFrame,
+            expressions: List[AggregateExpression]
+    ) -> DataFrame:
+        """
+        Index the result of an agg query by group and label its columns with
+        (column, function) tuples.
+        """
+        data = data.set_index(self._group_columns)[
+            [e.alias for e in expressions]
+        ]
+        data.columns = MultiIndex.from_tuples(
+            [(e.column, e.function) for e in expressions],
+            names=['column', 'function']
+        )
+        return self._frame._label_approximate(
+            data, [(e.column, e.function) for e in expressions if e.approximate]
+        )
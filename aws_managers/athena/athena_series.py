@@ -1,16 +1,23 @@
 from typing import Optional, Tuple, Union
 
-from awswrangler.athena import read_sql_query
 from pandas import Series, DataFrame
 
+from aws_managers.athena.athena_execution_mixin import AthenaExecutionMixin
+from aws_managers.athena.caching.query_result_cache import QueryResultCache
+from aws_managers.athena.execution.athena_backend import AthenaBackend
+from aws_managers.athena.execution.execution_backend import ExecutionBackend
+from aws_managers.athena.metadata.metadata_backend import MetadataBackend
 from aws_managers.athena.queries.athena_query_generator import \
-    AthenaQueryGenerator
+    AthenaQueryGenerator, ATHENA_QUERY_GENERATOR
 from aws_managers.athena.clauses.conjunctive_operators import \
     ConjunctiveOperator
 from aws_managers.athena.operators.mixins import ComparisonMixin
 
 
-class AthenaSeries(object):
+class AthenaSeries(
+    AthenaExecutionMixin,
+    object
+):
 
     def __init__(
             self,
@@ -20,6 +27,9 @@ class AthenaSeries(object):
             sample: Optional[Tuple[str, int]] = None,
             where: Optional[Union[ComparisonMixin, ConjunctiveOperator]] = None,
             column_info: Optional[Series] = None,
+            cache: Optional[QueryResultCache] = None,
+            metadata: Optional[MetadataBackend] = None,
+            backend: Optional[ExecutionBackend] = None
     ):
         """
         Create a new AthenaFrame.
@@ -31,29 +41,38 @@ class AthenaSeries(object):
                        integer percentage.
         :param column_info: Column info from schema if this is a subset of an
                             existing frame. Leave as None for a new Series.
+        :param cache: Optional cache to read query results from and write them
+                      to.
+        :param metadata: Optional backend to read the table schema from e.g.
+                         GlueMetadataBackend. Defaults to querying
+                         information_schema.
+        :param backend: Backend to execute queries with. Defaults to a new
+                        AthenaBackend.
         """
-        self._q: AthenaQueryGenerator = AthenaQueryGenerator()
+        self._q: AthenaQueryGenerator = ATHENA_QUERY_GENERATOR
         self._database: str = database
         self._table: str = table
         self._column: str = column
+        if backend is None:
+            backend = AthenaBackend()
+        self._backend: ExecutionBackend = backend
+        self._cache: Optional[QueryResultCache] = cache
+        self._metadata: Optional[MetadataBackend] = metadata
+        self._resolved_column_info: Optional[Series] = None
         if isinstance(column_info, Series):
-            self._column_info: Series = column_info
-        else:
-            column_info: DataFrame = self._execute(
-                sql=self._q.column_info(
-                    database=self._database, table=self._table)
-            )
-            self._column_info: Series = column_info.loc[
-                column_info['column_name'] == self._column
-            ].iloc[0]
+            self._resolved_column_info = column_info
         self._sample: Optional[Tuple[str, int]] = sample
         self._where = where
 
-    def _execute(self, sql: str) -> DataFrame:
+    @property
+    def _column_info(self) -> Series:
         """
-        Execute a query.
-
-        :param sql: Raw SQL to execute.
+        Column info of the series, resolved from the schema registry on first
+        use.
         """
-        data = read_sql_query(sql=sql, database=self._database)
-        return data
+        if self._resolved_column_info is None:
+            column_info: DataFrame = self._table_column_info()
+            self._resolved_column_info = column_info.loc[
+                column_info['column_name'] == self._column
+            ].iloc[0]
+        return self._resolved_column_info
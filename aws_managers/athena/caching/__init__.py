@@ -0,0 +1,6 @@
+from aws_managers.athena.caching.partial_aggregate_store import \
+    PartialAggregateStore
+from aws_managers.athena.caching.query_descriptor import QueryDescriptor
+from aws_managers.athena.caching.query_result_cache import QueryResultCache
+from aws_managers.athena.caching.schema_registry import SchemaRegistry, \
+    PARTITION_REGISTRY, SCHEMA_REGISTRY
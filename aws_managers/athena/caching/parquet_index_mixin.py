@@ -0,0 +1,53 @@
+import json
+from pathlib import Path
+from typing import Dict
+
+
+class ParquetIndexMixin(object):
+    """
+    JSON index of entries stored as parquet files in a directory, shared by
+    QueryResultCache and PartialAggregateStore.
+    """
+    _directory: Path
+    _index: Dict[str, dict]
+    _index_name: str = 'index.json'
+
+    @property
+    def _index_path(self) -> Path:
+        return self._directory / self._index_name
+
+    def _read_index(self) -> Dict[str, dict]:
+        """
+        Read the index of stored entries from disk, dropping any entries whose
+        parquet files no longer exist.
+        """
+        if not self._index_path.exists():
+            return {}
+        try:
+            with open(self._index_path, 'r') as f:
+                index = json.load(f)
+        except ValueError:
+            return {}
+        return {
+            key: entry for key, entry in index.items()
+            if self._data_path(key).exists()
+        }
+
+    def _write_index(self):
+        """
+        Write the index of stored entries to disk.
+        """
+        tmp_path = self._index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self._index, f)
+        tmp_path.replace(self._index_path)
+
+    def _data_path(self, key: str) -> Path:
+        return self._directory / f'{key}.parquet'
+
+    def _remove(self, key: str):
+        """
+        Remove an entry and its parquet file.
+        """
+        self._index.pop(key, None)
+        self._data_path(key).unlink(missing_ok=True)
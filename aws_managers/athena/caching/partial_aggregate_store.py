@@ -0,0 +1,141 @@
+import json
+from hashlib import sha256
+from pathlib import Path
+from threading import RLock
+from time import time
+from typing import Dict, List, Optional, Tuple, Union
+
+from pandas import DataFrame, read_parquet
+
+from aws_managers.athena.caching.parquet_index_mixin import \
+    ParquetIndexMixin
+from aws_managers.paths.dirs import DIR_ATHENA_PARTIAL_AGGREGATES
+
+
+class PartialAggregateStore(ParquetIndexMixin, object):
+    """
+    Persistent store of per-partition partial aggregates of partitioned tables,
+    stored as local parquet files, so that aggregates over append-only tables
+    only need to read new partitions.
+
+    Entries are keyed on a signature of the aggregation - the table,
+    conditions, sample, group columns and partial aggregates - and hold the
+    partial aggregate rows along with the partitions they cover, including
+    partitions that had no matching rows.
+    """
+    def __init__(self, directory: Optional[Union[str, Path]] = None):
+        """
+        Create a new PartialAggregateStore.
+
+        :param directory: Directory to store partial aggregates in. Defaults
+                          to ~/.cache/aws_managers/athena/partial_aggregates
+        """
+        if directory is None:
+            directory = DIR_ATHENA_PARTIAL_AGGREGATES
+        self._directory: Path = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._lock: RLock = RLock()
+        self._index: Dict[str, dict] = self._read_index()
+
+    @staticmethod
+    def key(signature: dict) -> str:
+        """
+        Return the store key for an aggregation signature.
+
+        :param signature: JSON-serialisable description of the aggregation.
+        """
+        return sha256(
+            json.dumps(signature, sort_keys=True).encode('utf-8')
+        ).hexdigest()
+
+    def __len__(self) -> int:
+
+        with self._lock:
+            return len(self._index)
+
+    def get(
+            self,
+            signature: dict
+    ) -> Tuple[List[Tuple[str, ...]], Optional[DataFrame]]:
+        """
+        Return the partitions covered by the stored partial aggregates of an
+        aggregation and the partial aggregates, or an empty list and None if
+        nothing is stored for it.
+
+        :param signature: Description of the aggregation.
+        """
+        key = self.key(signature)
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return [], None
+            try:
+                partials = read_parquet(self._data_path(key))
+            except (OSError, ValueError):
+                self._remove(key)
+                self._write_index()
+                return [], None
+        return [tuple(partition) for partition in entry['partitions']], partials
+
+    def put(
+            self,
+            signature: dict,
+            partitions: List[Tuple[str, ...]],
+            partials: DataFrame
+    ):
+        """
+        Store the partial aggregates of an aggregation, replacing any stored
+        before.
+
+        :param signature: Description of the aggregation, which must include
+                          its database and table.
+        :param partitions: Values of the partition keys of each partition
+                           covered by the partial aggregates.
+        :param partials: Partial aggregates, with a row for each partition and
+                         group.
+        """
+        key = self.key(signature)
+        with self._lock:
+            path = self._data_path(key)
+            tmp_path = path.with_suffix('.tmp')
+            partials.reset_index(drop=True).to_parquet(tmp_path)
+            tmp_path.replace(path)
+            self._index[key] = dict(
+                database=signature['database'],
+                table=signature['table'],
+                updated=time(),
+                partitions=[list(partition) for partition in partitions]
+            )
+            self._write_index()
+
+    def invalidate(
+            self,
+            database: Optional[str] = None,
+            table: Optional[str] = None
+    ) -> int:
+        """
+        Remove stored entries for a database and / or table e.g. after
+        partitions have been rewritten. Removes all entries if neither is
+        given.
+
+        Returns the number of entries removed.
+
+        :param database: Name of the database to remove entries for.
+        :param table: Name of the table to remove entries for.
+        """
+        with self._lock:
+            keys = [
+                key for key, entry in self._index.items()
+                if (database is None or entry['database'] == database) and
+                (table is None or entry['table'] == table)
+            ]
+            for key in keys:
+                self._remove(key)
+            self._write_index()
+        return len(keys)
+
+    def clear(self):
+        """
+        Remove all stored entries.
+        """
+        self.invalidate()
@@ -0,0 +1,149 @@
+from re import fullmatch
+from typing import List, Optional, Tuple, Union
+
+from pandas import DataFrame
+
+
+class QueryDescriptor(object):
+    """
+    Description of a basic selection query - the table, conditions, sample,
+    columns and limit - used to answer a query from the cached result of
+    another query whose result contains it.
+    """
+    def __init__(
+            self,
+            database: str,
+            table: str,
+            where: Optional[str] = None,
+            sample: Optional[Tuple[str, int]] = None,
+            columns: Optional[List[str]] = None,
+            limit: Optional[int] = None
+    ):
+        """
+        Create a new QueryDescriptor.
+
+        :param database: Name of the database.
+        :param table: Name of the table.
+        :param where: Canonical SQL of the conditions, if any.
+        :param sample: Optional tuple of 'BERNOULLI' or 'SYSTEM' and an
+                       integer percentage.
+        :param columns: Names of the columns selected, or None for all of them.
+        :param limit: Optional limit for number of rows returned.
+        """
+        self.database: str = database
+        self.table: str = table
+        self.where: Optional[str] = where
+        self.sample: Optional[Tuple[str, int]] = (
+            None if sample is None else (sample[0].upper(), int(sample[1]))
+        )
+        self.columns: Optional[List[str]] = columns
+        self.limit: Optional[int] = limit
+
+    @staticmethod
+    def from_select(
+            columns: Union[str, object, List[Union[str, object]]],
+            database: str,
+            table: str,
+            sample: Optional[Tuple[str, int]] = None,
+            where: Optional[object] = None,
+            limit: Optional[int] = None
+    ) -> Optional['QueryDescriptor']:
+        """
+        Return the descriptor of a query rendered by AthenaQueryGenerator.select
+        with the same arguments, or None if any of the columns is an expression
+        rather than a column name.
+
+        :param columns: Column or columns selected, or '*' for all of them.
+        :param database: Name of the database.
+        :param table: Name of the table.
+        :param sample: Optional tuple of 'BERNOULLI' or 'SYSTEM' and an
+                       integer percentage.
+        :param where: Optional conditions to filter on.
+        :param limit: Optional limit for number of rows to return.
+        """
+        if not isinstance(columns, list):
+            columns = [columns]
+        names = [str(column) for column in columns]
+        if names == ['*']:
+            names = None
+        elif not all(fullmatch(r'[A-Za-z_]\w*', name) for name in names):
+            return None
+        return QueryDescriptor(
+            database=database,
+            table=table,
+            where=None if where is None else where.canonical,
+            sample=sample,
+            columns=names,
+            limit=limit
+        )
+
+    def to_dict(self) -> dict:
+
+        return dict(
+            database=self.database,
+            table=self.table,
+            where=self.where,
+            sample=None if self.sample is None else list(self.sample),
+            columns=self.columns,
+            limit=self.limit
+        )
+
+    @staticmethod
+    def from_dict(data: dict) -> 'QueryDescriptor':
+
+        return QueryDescriptor(**data)
+
+    def subsumes(
+            self,
+            other: 'QueryDescriptor',
+            result_columns: List[str],
+            row_count: int
+    ) -> bool:
+        """
+        Return whether a result of this query contains the result of another
+        query, so that it can be answered by projecting and slicing it.
+
+        Results of different queries over the same rows are interchangeable
+        as samples and limits without an ordering don't return any particular
+        rows.
+
+        :param other: Descriptor of the other query.
+        :param result_columns: Names of the columns of this query's result.
+        :param row_count: Number of rows in this query's result.
+        """
+        if (
+                self.database != other.database or
+                self.table != other.table or
+                self.where != other.where or
+                self.sample != other.sample
+        ):
+            return False
+        if other.columns is None:
+            if self.columns is not None:
+                return False
+        elif not set(other.columns).issubset(result_columns):
+            return False
+        complete = self.limit is None or row_count < self.limit
+        if complete:
+            return True
+        return other.limit is not None and other.limit <= self.limit
+
+    def project(self, data: DataFrame) -> DataFrame:
+        """
+        Return the part of a containing query's result that answers this query.
+
+        :param data: Result of a query that subsumes this one.
+        """
+        if self.columns is not None:
+            data = data[self.columns]
+        if self.limit is not None:
+            data = data.iloc[:self.limit]
+        return data.reset_index(drop=True)
+
+    def __repr__(self):
+
+        return (
+            f'QueryDescriptor(table={self.database}.{self.table}, '
+            f'where={self.where}, sample={self.sample}, '
+            f'columns={self.columns}, limit={self.limit})'
+        )
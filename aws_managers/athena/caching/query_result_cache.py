@@ -0,0 +1,271 @@
+from hashlib import sha256
+from logging import getLogger
+from pathlib import Path
+from threading import RLock
+from time import time
+from typing import Dict, Optional, Union
+
+from pandas import DataFrame, read_parquet
+
+from aws_managers.athena.caching.parquet_index_mixin import \
+    ParquetIndexMixin
+from aws_managers.athena.caching.query_descriptor import QueryDescriptor
+from aws_managers.paths.dirs import DIR_ATHENA_QUERY_CACHE
+
+logger = getLogger(__name__)
+
+
+class QueryResultCache(ParquetIndexMixin, object):
+    """
+    Persistent cache of query results, stored as local parquet files.
+
+    Entries are keyed on the rendered SQL and the database it was run against,
+    expire after a time-to-live and are evicted least-recently-used first once
+    the total size of the cached files exceeds the configured maximum.
+
+    Entries stored with a QueryDescriptor can also answer other selections of
+    the same rows that they contain e.g. fewer columns or a smaller limit.
+    """
+    def __init__(
+            self,
+            directory: Optional[Union[str, Path]] = None,
+            max_bytes: int = 1024 ** 3,
+            ttl: Optional[float] = 24 * 60 * 60
+    ):
+        """
+        Create a new QueryResultCache.
+
+        :param directory: Directory to store cached results in. Defaults to
+                          ~/.cache/aws_managers/athena/queries
+        :param max_bytes: Maximum total size of the cached parquet files.
+        :param ttl: Default number of seconds that an entry stays valid for.
+                    Use None for entries that never expire.
+        """
+        if directory is None:
+            directory = DIR_ATHENA_QUERY_CACHE
+        self._directory: Path = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_bytes: int = max_bytes
+        self._ttl: Optional[float] = ttl
+        self._lock: RLock = RLock()
+        self._index: Dict[str, dict] = self._read_index()
+
+    @staticmethod
+    def key(sql: str, database: str, backend: Optional[str] = None) -> str:
+        """
+        Return the cache key for a query.
+
+        :param sql: Rendered SQL of the query.
+        :param database: Name of the database the query is run against.
+        :param backend: Cache key of the backend that runs the query.
+        """
+        return sha256(
+            f'{backend}\n{database}\n{sql}'.encode('utf-8')
+        ).hexdigest()
+
+    @property
+    def size(self) -> int:
+        """
+        Total size of the cached result files, in bytes.
+        """
+        with self._lock:
+            return sum(entry['size'] for entry in self._index.values())
+
+    def __len__(self) -> int:
+
+        with self._lock:
+            return len(self._index)
+
+    def _expire(self, key: str) -> bool:
+        """
+        Remove an entry if it has expired and return whether it was removed.
+        """
+        expires = self._index[key]['expires']
+        if expires is not None and expires < time():
+            self._remove(key)
+            return True
+        return False
+
+    def _evict(self):
+        """
+        Remove least-recently-used entries until the cache is within its size
+        limit.
+        """
+        total = sum(entry['size'] for entry in self._index.values())
+        lru_keys = sorted(
+            self._index.keys(), key=lambda k: self._index[k]['accessed']
+        )
+        for key in lru_keys:
+            if total <= self._max_bytes:
+                break
+            total -= self._index[key]['size']
+            self._remove(key)
+
+    def get(
+            self,
+            sql: str,
+            database: str,
+            backend: Optional[str] = None
+    ) -> Optional[DataFrame]:
+        """
+        Return the cached result of a query, or None if there is no valid
+        entry for it.
+
+        Access times are kept in memory and written with the next change to
+        the index, so that hits don't rewrite it.
+
+        :param sql: Rendered SQL of the query.
+        :param database: Name of the database the query is run against.
+        :param backend: Cache key of the backend that runs the query.
+        """
+        key = self.key(sql=sql, database=database, backend=backend)
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+            if self._expire(key):
+                self._write_index()
+                return None
+            try:
+                data = read_parquet(self._data_path(key))
+            except (OSError, ValueError):
+                self._remove(key)
+                self._write_index()
+                return None
+            entry['accessed'] = time()
+        return data
+
+    def put(
+            self,
+            sql: str,
+            database: str,
+            data: DataFrame,
+            table: Optional[str] = None,
+            ttl: Optional[float] = -1,
+            descriptor: Optional[QueryDescriptor] = None,
+            backend: Optional[str] = None
+    ):
+        """
+        Store the result of a query. Results that can't be written e.g. with
+        columns of mixed types are logged and not cached, as the query has
+        already succeeded.
+
+        :param sql: Rendered SQL of the query.
+        :param database: Name of the database the query was run against.
+        :param data: Result of the query.
+        :param table: Name of the table that was queried, used for
+                      invalidation.
+        :param ttl: Number of seconds the entry stays valid for. Leave as -1 to
+                    use the cache's default or use None to never expire.
+        :param descriptor: Optional description of the query, if it is a basic
+                           selection, so that its result can answer others.
+        :param backend: Cache key of the backend that ran the query.
+        """
+        if ttl == -1:
+            ttl = self._ttl
+        key = self.key(sql=sql, database=database, backend=backend)
+        now = time()
+        with self._lock:
+            path = self._data_path(key)
+            tmp_path = path.with_suffix('.tmp')
+            try:
+                data.to_parquet(tmp_path)
+            except Exception as error:
+                logger.warning(f'Could not cache query result: {error}')
+                tmp_path.unlink(missing_ok=True)
+                return
+            tmp_path.replace(path)
+            self._index[key] = dict(
+                database=database,
+                table=table,
+                backend=backend,
+                created=now,
+                accessed=now,
+                expires=None if ttl is None else now + ttl,
+                size=path.stat().st_size,
+                descriptor=(
+                    None if descriptor is None else descriptor.to_dict()
+                ),
+                columns=[str(column) for column in data.columns],
+                rows=len(data)
+            )
+            self._evict()
+            self._write_index()
+
+    def get_subsumed(
+            self,
+            descriptor: QueryDescriptor,
+            backend: Optional[str] = None
+    ) -> Optional[DataFrame]:
+        """
+        Return the result of a basic selection by projecting and slicing the
+        smallest valid cached result that contains it, or None if there isn't
+        one.
+
+        :param descriptor: Description of the query.
+        :param backend: Cache key of the backend that runs the query.
+        """
+        with self._lock:
+            keys = sorted(
+                [
+                    key for key, entry in self._index.items()
+                    if entry.get('backend') == backend and
+                    entry.get('descriptor') is not None and
+                    QueryDescriptor.from_dict(entry['descriptor']).subsumes(
+                        other=descriptor,
+                        result_columns=entry['columns'],
+                        row_count=entry['rows']
+                    )
+                ],
+                key=lambda k: self._index[k]['size']
+            )
+            removed = False
+            data = None
+            for key in keys:
+                if self._expire(key):
+                    removed = True
+                    continue
+                try:
+                    data = read_parquet(
+                        self._data_path(key), columns=descriptor.columns
+                    )
+                except (OSError, ValueError):
+                    self._remove(key)
+                    removed = True
+                    continue
+                self._index[key]['accessed'] = time()
+                break
+            if removed:
+                self._write_index()
+        return None if data is None else descriptor.project(data)
+
+    def invalidate(
+            self,
+            database: Optional[str] = None,
+            table: Optional[str] = None
+    ) -> int:
+        """
+        Remove cached entries for a database and / or table. Removes all entries
+        if neither is given.
+
+        Returns the number of entries removed.
+
+        :param database: Name of the database to remove entries for.
+        :param table: Name of the table to remove entries for.
+        """
+        with self._lock:
+            keys = [
+                key for key, entry in self._index.items()
+                if (database is None or entry['database'] == database) and
+                (table is None or entry['table'] == table)
+            ]
+            for key in keys:
+                self._remove(key)
+            self._write_index()
+        return len(keys)
+
+    def clear(self):
+        """
+        Remove all cached entries.
+        """
+        self.invalidate()
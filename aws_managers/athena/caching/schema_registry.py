@@ -0,0 +1,186 @@
+from pathlib import Path
+from threading import Lock
+from time import time
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from pandas import DataFrame, read_parquet
+
+
+class SchemaRegistry(object):
+    """
+    Thread-safe registry of table schemas, keyed on (database, table).
+
+    Schemas are loaded on first use, refreshed once they are older than the
+    time-to-live and optionally persisted to a local directory so that they
+    survive across processes.
+    """
+    def __init__(
+            self,
+            ttl: Optional[float] = 60 * 60,
+            directory: Optional[Union[str, Path]] = None
+    ):
+        """
+        Create a new SchemaRegistry.
+
+        :param ttl: Number of seconds before a schema is refreshed. Use None for
+                    schemas that are never refreshed.
+        :param directory: Optional directory to persist schemas to as parquet.
+        """
+        self.ttl: Optional[float] = ttl
+        self._directory: Optional[Path] = None
+        self.directory = directory
+        self._lock: Lock = Lock()
+        self._key_locks: Dict[Tuple[str, str], Lock] = {}
+        self._schemas: Dict[Tuple[str, str], Tuple[float, DataFrame]] = {}
+        self._shared: Dict[Tuple[str, str, str], Tuple[DataFrame, Any]] = {}
+
+    @property
+    def directory(self) -> Optional[Path]:
+        """
+        Directory that schemas are persisted to, if any.
+        """
+        return self._directory
+
+    @directory.setter
+    def directory(self, directory: Optional[Union[str, Path]]):
+
+        if directory is not None:
+            directory = Path(directory)
+            directory.mkdir(parents=True, exist_ok=True)
+        self._directory = directory
+
+    def _path(self, database: str, table: str) -> Path:
+        return self._directory / f'{database}.{table}.parquet'
+
+    def _is_fresh(self, loaded: float) -> bool:
+        return self.ttl is None or time() - loaded < self.ttl
+
+    def _key_lock(self, key: Tuple[str, str]) -> Lock:
+        """
+        Return the lock used to load the schema for the given key.
+        """
+        with self._lock:
+            if key not in self._key_locks:
+                self._key_locks[key] = Lock()
+            return self._key_locks[key]
+
+    def _get(self, key: Tuple[str, str]) -> Optional[DataFrame]:
+        """
+        Return a fresh schema from memory or disk, or None if there isn't one.
+        """
+        entry = self._schemas.get(key)
+        if entry is not None and self._is_fresh(entry[0]):
+            return entry[1]
+        if self._directory is not None:
+            path = self._path(*key)
+            if path.exists():
+                loaded = path.stat().st_mtime
+                if self._is_fresh(loaded):
+                    column_info = read_parquet(path)
+                    self._schemas[key] = (loaded, column_info)
+                    return column_info
+        return None
+
+    def register(self, database: str, table: str, column_info: DataFrame):
+        """
+        Add or replace the schema of a table.
+
+        :param database: Name of the database.
+        :param table: Name of the table.
+        :param column_info: Column info of the table.
+                            See AthenaQueryGenerator.column_info
+        """
+        key = (database, table)
+        self._schemas[key] = (time(), column_info)
+        if self._directory is not None:
+            column_info.to_parquet(self._path(database, table))
+
+    def column_info(
+            self,
+            database: str,
+            table: str,
+            load: Callable[[], DataFrame]
+    ) -> DataFrame:
+        """
+        Return the schema of a table, loading it if it is missing or stale.
+
+        :param database: Name of the database.
+        :param table: Name of the table.
+        :param load: Function that returns the column info of the table.
+        """
+        key = (database, table)
+        column_info = self._get(key)
+        if column_info is not None:
+            return column_info
+        with self._key_lock(key):
+            # another thread may have loaded the schema while we waited
+            column_info = self._get(key)
+            if column_info is None:
+                column_info = load()
+                self.register(database, table, column_info)
+        return column_info
+
+    def shared(
+            self,
+            database: str,
+            table: str,
+            column_info: DataFrame,
+            name: str,
+            build: Callable[[DataFrame], Any]
+    ) -> Any:
+        """
+        Return an object built from the registered schema of a table e.g. its
+        column query set, building it once per schema so that it is shared by
+        every frame over the table. Column info that is not the registered
+        schema is built from without being kept.
+
+        :param database: Name of the database.
+        :param table: Name of the table.
+        :param column_info: Column info to build the object from.
+        :param name: Name of the kind of object.
+        :param build: Function that builds the object from column info.
+        """
+        key = (database, table)
+        entry = self._schemas.get(key)
+        if entry is None or entry[1] is not column_info:
+            return build(column_info)
+        with self._lock:
+            shared = self._shared.get(key + (name,))
+            if shared is None or shared[0] is not column_info:
+                shared = (column_info, build(column_info))
+                self._shared[key + (name,)] = shared
+        return shared[1]
+
+    def invalidate(
+            self,
+            database: Optional[str] = None,
+            table: Optional[str] = None
+    ):
+        """
+        Remove schemas for a database and / or table. Removes all schemas if
+        neither is given.
+
+        :param database: Name of the database to remove schemas for.
+        :param table: Name of the table to remove schemas for.
+        """
+        keys = [
+            key for key in list(self._schemas.keys())
+            if (database is None or key[0] == database) and
+            (table is None or key[1] == table)
+        ]
+        for key in keys:
+            self._schemas.pop(key, None)
+        with self._lock:
+            for shared_key in list(self._shared.keys()):
+                if shared_key[:2] in keys:
+                    del self._shared[shared_key]
+        if self._directory is not None:
+            for path in self._directory.glob(
+                    f'{database or "*"}.{table or "*"}.parquet'
+            ):
+                path.unlink(missing_ok=True)
+
+
+SCHEMA_REGISTRY = SchemaRegistry()
+# partition listings change more often than schemas, so are refreshed sooner
+PARTITION_REGISTRY = SchemaRegistry(ttl=5 * 60)
@@ -1,7 +1,93 @@
-from typing import List, Union
+from numbers import Real
+from typing import Dict, List, Set, Tuple, Union
 
+from aws_managers.athena.operators.comparisons import ScalarComparison
 from aws_managers.athena.operators.mixins import ComparisonMixin
 
+LOWER_BOUND_OPERATORS = ('>', '>=')
+UPPER_BOUND_OPERATORS = ('<', '<=')
+
+
+def _is_numeric_comparison(item) -> bool:
+
+    return (
+        isinstance(item, ScalarComparison) and
+        isinstance(item.value, Real) and
+        not isinstance(item.value, bool)
+    )
+
+
+def _satisfies(value: Real, bound: ScalarComparison) -> bool:
+    """
+    Return whether a value satisfies a range bound.
+    """
+    return {
+        '>': value > bound.value,
+        '>=': value >= bound.value,
+        '<': value < bound.value,
+        '<=': value <= bound.value
+    }[bound.operator]
+
+
+def _tighter(a: ScalarComparison, b: ScalarComparison) -> ScalarComparison:
+    """
+    Return the more restrictive of two bounds on the same side of a range.
+    """
+    if a.value == b.value:
+        return a if a.operator in ('>', '<') else b
+    return a if _satisfies(a.value, b) else b
+
+
+def _looser(a: ScalarComparison, b: ScalarComparison) -> ScalarComparison:
+    """
+    Return the less restrictive of two bounds on the same side of a range.
+    """
+    return b if _tighter(a, b) is a else a
+
+
+def _fold_ranges(
+        items: List[Union[ComparisonMixin, 'ConjunctiveOperator']],
+        conjunction: bool
+) -> List[Union[ComparisonMixin, 'ConjunctiveOperator']]:
+    """
+    Fold numeric range comparisons on the same column into a single bound on
+    each side, and remove equalities that the bounds make redundant.
+
+    :param items: Simplified items of a conjunction or disjunction.
+    :param conjunction: True to fold the items of an AND, which keeps the
+                        tightest bounds, or False for an OR, which keeps the
+                        loosest.
+    """
+    fold = _tighter if conjunction else _looser
+    bounds: Dict[Tuple[str, bool], ScalarComparison] = {}
+    others = []
+    for item in items:
+        if _is_numeric_comparison(item) and (
+                item.operator in LOWER_BOUND_OPERATORS + UPPER_BOUND_OPERATORS
+        ):
+            key = (item.column, item.operator in LOWER_BOUND_OPERATORS)
+            bounds[key] = fold(bounds[key], item) if key in bounds else item
+        else:
+            others.append(item)
+    folded = []
+    for item in others:
+        if _is_numeric_comparison(item) and item.operator == '=':
+            column_bounds = [
+                bound for (column, _), bound in bounds.items()
+                if column == item.column
+            ]
+            if conjunction:
+                # x = 3 AND x > 1 -> x = 3
+                for bound in column_bounds:
+                    if _satisfies(item.value, bound):
+                        bounds.pop((bound.column,
+                                    bound.operator in LOWER_BOUND_OPERATORS))
+            elif any(_satisfies(item.value, bound) for bound in column_bounds):
+                # x = 3 OR x > 1 -> x > 1
+                continue
+        folded.append(item)
+    return folded + list(bounds.values())
+
 
 class ConjunctiveOperator(object):
 
@@ -32,6 +118,71 @@ class ConjunctiveOperator(object):
             for line in string.split('\n')
         ])
 
+    def simplify(self) -> Union[ComparisonMixin, 'ConjunctiveOperator']:
+        """
+        Return the simplest equivalent predicate, with:
+
+        * nested conjunctions of the same kind flattened
+        * duplicate predicates removed
+        * numeric ranges on the same column folded e.g.
+          x > 3 AND x > 5 -> x > 5
+        * absorbed predicates removed e.g. a AND (a OR b) -> a
+        * items sorted by their canonical SQL
+        * conjunctions of a single item replaced by the item
+        """
+        items = []
+        for item in self.items:
+            item = item.simplify()
+            if type(item) is type(self):
+                items.extend(item.items)
+            else:
+                items.append(item)
+        items = _fold_ranges(
+            items=list({item._compact(): item for item in items}.values()),
+            conjunction=self.name == 'AND'
+        )
+        unique = {item._compact(): item for item in items}
+        unique = {
+            sql: item for sql, item in unique.items()
+            if not (
+                isinstance(item, ConjunctiveOperator) and
+                any(sub_item._compact() in unique for sub_item in item.items)
+            )
+        }
+        items = [unique[sql] for sql in sorted(unique.keys())]
+        if len(items) == 1:
+            return items[0]
+        return type(self)(items)
+
+    def columns(self) -> Set[str]:
+        """
+        Return the names of the columns that the predicate refers to.
+        """
+        return set().union(*[item.columns() for item in self.items])
+
+    def _compact(self) -> str:
+
+        return '(' + f' {self.name} '.join(
+            item._compact() for item in self.items
+        ) + ')'
+
+    @property
+    def canonical(self) -> str:
+        """
+        Canonical SQL of the predicate, identical for equivalent predicates.
+        """
+        return self.simplify()._compact()
+
+    def __eq__(self, other) -> bool:
+
+        if not isinstance(other, (ComparisonMixin, ConjunctiveOperator)):
+            return NotImplemented
+        return self.canonical == other.canonical
+
+    def __hash__(self) -> int:
+
+        return hash(self.canonical)
+
     def __str__(self):
 
         str_out = '(\n'
@@ -63,4 +214,3 @@ class And(ConjunctiveOperator):
 class Or(ConjunctiveOperator):
 
     name: str = 'OR'
-
@@ -0,0 +1,16 @@
+from aws_managers.athena.execution.async_athena_engine import AsyncAthenaEngine
+from aws_managers.athena.execution.athena_backend import AthenaBackend
+from aws_managers.athena.execution.backend_async_engine import \
+    BackendAsyncEngine
+from aws_managers.athena.execution.duckdb_backend import DuckDBBackend
+from aws_managers.athena.execution.execution_backend import ExecutionBackend
+from aws_managers.athena.execution.query_batch_executor import \
+    QueryBatchExecutor
+from aws_managers.athena.execution.query_explanation import \
+    QueryExplanation
+from aws_managers.athena.execution.query_limiter import QueryLimiter, \
+    QUERY_LIMITER
+from aws_managers.athena.execution.query_statistics import QueryLedger, \
+    QueryStatistics, QUERY_LEDGER
+from aws_managers.athena.execution.single_flight import canonical_sql, \
+    SingleFlight, SINGLE_FLIGHT
@@ -0,0 +1,189 @@
+from asyncio import CancelledError, get_running_loop, sleep
+from functools import partial
+from typing import Hashable, Optional
+from uuid import uuid4
+
+from awswrangler.athena import get_query_execution, get_query_results, \
+    start_query_execution, stop_query_execution
+from awswrangler.exceptions import QueryFailed
+from boto3 import Session
+from pandas import DataFrame
+
+from aws_managers.athena.execution.athena_backend import AthenaBackend, \
+    STATEMENT_KWARGS
+from aws_managers.athena.execution.query_limiter import QUERY_LIMITER
+
+
+class AsyncAthenaEngine(object):
+    """
+    Runs Athena queries without blocking the event loop.
+
+    Each query is submitted with start_query_execution and its status polled
+    with asyncio.sleep between checks, so many queries can run concurrently in
+    one event loop. The blocking boto3 calls run in the loop's default
+    executor. The number of queries running at the same time across the
+    process is capped by QUERY_LIMITER, whose slots are polled for so that
+    waiting queries don't hold executor threads.
+
+    Query results are read as Parquet if they are unloaded, or else from the
+    CSV result file with the types of the result set, as
+    awswrangler.athena.read_sql_query does with ctas_approach=False.
+
+    Any object with an async execute(sql, database) method returning a
+    DataFrame can be used in its place e.g. a local stub for testing.
+    """
+    def __init__(
+            self,
+            poll_interval: float = 0.5,
+            s3_output: Optional[str] = None,
+            workgroup: str = 'primary',
+            boto3_session: Optional[Session] = None,
+            encryption: Optional[str] = None,
+            kms_key: Optional[str] = None,
+            data_source: Optional[str] = None,
+            unload: bool = False
+    ):
+        """
+        Create a new AsyncAthenaEngine.
+
+        :param poll_interval: Number of seconds to wait between status checks.
+        :param s3_output: Optional S3 path to write query results to.
+        :param workgroup: Athena workgroup to run queries in.
+        :param boto3_session: Optional boto3 session to use.
+        :param encryption: Optional encryption of the query results e.g.
+                           'SSE_KMS'.
+        :param kms_key: Optional KMS key to encrypt the query results with.
+        :param data_source: Optional data catalog to run queries against.
+        :param unload: Whether to wrap SELECT queries in UNLOAD so that Athena
+                       writes results as Parquet, as AthenaBackend does.
+                       Requires s3_output.
+        """
+        if unload and s3_output is None:
+            raise ValueError('s3_output is required to unload query results')
+        self._poll_interval: float = poll_interval
+        self._s3_output: Optional[str] = s3_output
+        self._workgroup: str = workgroup
+        self._boto3_session: Optional[Session] = boto3_session
+        self._encryption: Optional[str] = encryption
+        self._kms_key: Optional[str] = kms_key
+        self._data_source: Optional[str] = data_source
+        self._unload: bool = unload
+
+    @staticmethod
+    def from_backend(
+            backend: AthenaBackend,
+            poll_interval: float = 0.5
+    ) -> 'AsyncAthenaEngine':
+        """
+        Create an AsyncAthenaEngine that runs queries with the same settings as
+        an AthenaBackend, so that both return results with the same types and
+        security settings.
+
+        Raises a ValueError if the backend has read_sql_query settings that
+        the engine can't apply.
+
+        :param backend: The AthenaBackend to copy the settings of.
+        :param poll_interval: Number of seconds to wait between status checks.
+        """
+        kwargs = backend.read_sql_query_kwargs
+        if kwargs.get('ctas_approach') is False:
+            # results are read from the CSV result file, as the engine does
+            kwargs.pop('ctas_approach')
+        unsupported = sorted(set(kwargs.keys()) - set(STATEMENT_KWARGS))
+        if len(unsupported) > 0:
+            raise ValueError(
+                f'AsyncAthenaEngine does not support the backend settings '
+                f'{unsupported}'
+            )
+        return AsyncAthenaEngine(
+            poll_interval=poll_interval,
+            s3_output=kwargs.get('s3_output'),
+            workgroup=kwargs.get('workgroup') or 'primary',
+            boto3_session=kwargs.get('boto3_session'),
+            encryption=kwargs.get('encryption'),
+            kms_key=kwargs.get('kms_key'),
+            data_source=kwargs.get('data_source'),
+            unload=backend.unload
+        )
+
+    @property
+    def flight_key(self) -> Hashable:
+        """
+        Identity of the engine for coalescing identical queries in flight.
+        """
+        return (
+            AsyncAthenaEngine,
+            self._s3_output,
+            self._workgroup,
+            id(self._boto3_session),
+            self._encryption,
+            self._kms_key,
+            self._data_source,
+            self._unload
+        )
+
+    def _prepare(self, sql: str) -> str:
+        """
+        Return the SQL to run for a query, wrapped in UNLOAD to a new prefix
+        of the output location if results are unloaded.
+        """
+        if not self._unload or not AthenaBackend.can_unload(sql):
+            return sql
+        path = f'{self._s3_output.rstrip("/")}/{uuid4().hex}/'
+        return (
+            f"UNLOAD ({sql.strip().rstrip(';')}) "
+            f"TO '{path}' WITH (format = 'PARQUET')"
+        )
+
+    async def _call(self, func, **kwargs):
+        """
+        Run a blocking function in the event loop's default executor.
+        """
+        return await get_running_loop().run_in_executor(
+            None, partial(func, boto3_session=self._boto3_session, **kwargs)
+        )
+
+    async def execute(self, sql: str, database: str) -> DataFrame:
+        """
+        Execute a query and return its result.
+
+        :param sql: Raw SQL to execute.
+        :param database: Name of the database to run the query against.
+        """
+        while not QUERY_LIMITER.try_acquire():
+            await sleep(self._poll_interval)
+        try:
+            query_execution_id = await self._call(
+                start_query_execution,
+                sql=self._prepare(sql),
+                database=database,
+                s3_output=self._s3_output,
+                workgroup=self._workgroup,
+                encryption=self._encryption,
+                kms_key=self._kms_key,
+                data_source=self._data_source
+            )
+            try:
+                while True:
+                    response = await self._call(
+                        get_query_execution,
+                        query_execution_id=query_execution_id
+                    )
+                    state = response['Status']['State']
+                    if state == 'SUCCEEDED':
+                        break
+                    if state in ('FAILED', 'CANCELLED'):
+                        raise QueryFailed(
+                            response['Status'].get('StateChangeReason', state)
+                        )
+                    await sleep(self._poll_interval)
+            except CancelledError:
+                await self._call(
+                    stop_query_execution, query_execution_id=query_execution_id
+                )
+                raise
+            return await self._call(
+                get_query_results, query_execution_id=query_execution_id
+            )
+        finally:
+            QUERY_LIMITER.release()
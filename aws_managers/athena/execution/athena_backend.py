@@ -0,0 +1,169 @@
+from re import IGNORECASE, match, search
+from typing import Hashable, Iterator, Optional, Tuple
+
+from awswrangler.athena import read_sql_query, start_query_execution
+from awswrangler.s3 import delete_objects
+from pandas import DataFrame
+
+from aws_managers.athena.execution.execution_backend import ExecutionBackend
+from aws_managers.athena.execution.query_limiter import QUERY_LIMITER
+
+# read_sql_query arguments that also apply to start_query_execution
+STATEMENT_KWARGS = (
+    's3_output', 'workgroup', 'encryption', 'kms_key', 'boto3_session',
+    'data_source'
+)
+
+
+class AthenaBackend(ExecutionBackend):
+    """
+    Executes queries in Athena using awswrangler.athena.read_sql_query
+    """
+    def __init__(self, unload: bool = False, **read_sql_query_kwargs):
+        """
+        Create a new AthenaBackend.
+
+        :param unload: Whether to wrap SELECT queries in UNLOAD so that Athena
+                       writes results as Parquet, which are read with pyarrow
+                       using the types stored in the files, instead of
+                       writing CSV results that are parsed and have their
+                       types inferred. Requires s3_output.
+        :param read_sql_query_kwargs: Optional keyword arguments to pass to
+                                      awswrangler.athena.read_sql_query e.g.
+                                      workgroup or s3_output.
+        """
+        if unload and read_sql_query_kwargs.get('s3_output') is None:
+            raise ValueError('s3_output is required to unload query results')
+        self._unload: bool = unload
+        self._read_sql_query_kwargs: dict = read_sql_query_kwargs
+
+    @property
+    def read_sql_query_kwargs(self) -> dict:
+        """
+        Keyword arguments passed to awswrangler.athena.read_sql_query.
+        """
+        return dict(self._read_sql_query_kwargs)
+
+    @property
+    def flight_key(self) -> Hashable:
+        """
+        Identity of the backend for coalescing identical queries in flight, so
+        that frames with separate backends with the same settings share
+        executions.
+        """
+        return (
+            AthenaBackend,
+            self._unload,
+            tuple(sorted(
+                (key, repr(value))
+                for key, value in self._read_sql_query_kwargs.items()
+            ))
+        )
+
+    @property
+    def cache_key(self) -> str:
+        """
+        Identity of the backend in persistent result caches. Unloaded results
+        have different types, and data sources different tables.
+        """
+        return (
+            f'AthenaBackend(unload={self._unload}, '
+            f'data_source={self._read_sql_query_kwargs.get("data_source")})'
+        )
+
+    @property
+    def unload(self) -> bool:
+        """
+        Whether SELECT queries are wrapped in UNLOAD.
+        """
+        return self._unload
+
+    @staticmethod
+    def can_unload(sql: str) -> bool:
+        """
+        Return whether a query can be wrapped in UNLOAD i.e. it is a SELECT
+        statement and does not read from information_schema.
+        """
+        return (
+            match(r'\s*SELECT\b', sql, flags=IGNORECASE) is not None and
+            search(r'\binformation_schema\b', sql, flags=IGNORECASE) is None
+        )
+
+    def _prepare(self, sql: str) -> Tuple[str, dict]:
+        """
+        Return the SQL and keyword arguments to pass to read_sql_query for a
+        query. Queries to unload have their terminating semicolon removed as
+        they are wrapped in UNLOAD (...), and statements that are not queries
+        e.g. EXPLAIN are run as they are, as they can't be wrapped in CTAS.
+        """
+        kwargs = dict(self._read_sql_query_kwargs)
+        if self._unload and self.can_unload(sql):
+            sql = sql.strip().rstrip(';')
+            kwargs.update(ctas_approach=False, unload_approach=True)
+        elif match(r'\s*(SELECT|WITH)\b', sql, flags=IGNORECASE) is None:
+            kwargs.update(ctas_approach=False)
+        return sql, kwargs
+
+    def execute(self, sql: str, database: str) -> DataFrame:
+        """
+        Execute a query in Athena. The number of queries running at the same
+        time across the process is capped by QUERY_LIMITER.
+
+        :param sql: Raw SQL to execute.
+        :param database: Name of the database to run the query against.
+        """
+        sql, kwargs = self._prepare(sql)
+        with QUERY_LIMITER:
+            return read_sql_query(sql=sql, database=database, **kwargs)
+
+    def execute_statement(self, sql: str, database: str) -> Optional[dict]:
+        """
+        Execute a statement in Athena, wait for it to finish and return its
+        query execution metadata.
+
+        :param sql: Raw SQL to execute.
+        :param database: Name of the database to run the statement against.
+        """
+        kwargs = {
+            key: value for key, value in self._read_sql_query_kwargs.items()
+            if key in STATEMENT_KWARGS
+        }
+        with QUERY_LIMITER:
+            return start_query_execution(
+                sql=sql, database=database, wait=True, **kwargs
+            )
+
+    def delete_data(self, location: str):
+        """
+        Delete all objects under an S3 location.
+
+        :param location: S3 location of the table data.
+        """
+        delete_objects(
+            path=location,
+            boto3_session=self._read_sql_query_kwargs.get('boto3_session')
+        )
+
+    def iter_batches(
+            self,
+            sql: str,
+            database: str,
+            batch_rows: int
+    ) -> Iterator[DataFrame]:
+        """
+        Execute a query in Athena and yield its result in batches of at most
+        batch_rows rows, read one at a time from the result files in S3.
+
+        :param sql: Raw SQL to execute.
+        :param database: Name of the database to run the query against.
+        :param batch_rows: Maximum number of rows per batch.
+        """
+        sql, kwargs = self._prepare(sql)
+        with QUERY_LIMITER:
+            batches = read_sql_query(
+                sql=sql, database=database, chunksize=batch_rows, **kwargs
+            )
+        if isinstance(batches, DataFrame):
+            batches = [batches]
+        for batch in batches:
+            yield batch
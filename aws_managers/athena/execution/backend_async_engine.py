@@ -0,0 +1,42 @@
+from asyncio import get_running_loop
+from functools import partial
+from typing import Hashable
+
+from pandas import DataFrame
+
+from aws_managers.athena.execution.execution_backend import ExecutionBackend
+
+
+class BackendAsyncEngine(object):
+    """
+    Runs the queries of an ExecutionBackend in the event loop's default
+    executor, so that frames with backends other than Athena e.g. DuckDBBackend
+    can be queried with AsyncAthenaFrame.
+    """
+    def __init__(self, backend: ExecutionBackend):
+        """
+        Create a new BackendAsyncEngine.
+
+        :param backend: The backend to execute queries with.
+        """
+        self._backend: ExecutionBackend = backend
+
+    @property
+    def flight_key(self) -> Hashable:
+        """
+        Identity of the engine for coalescing identical queries in flight,
+        which is that of its backend so that synchronous and asynchronous
+        executions are shared.
+        """
+        return self._backend.flight_key
+
+    async def execute(self, sql: str, database: str) -> DataFrame:
+        """
+        Execute a query and return its result.
+
+        :param sql: Raw SQL to execute.
+        :param database: Name of the database to run the query against.
+        """
+        return await get_running_loop().run_in_executor(
+            None, partial(self._backend.execute, sql=sql, database=database)
+        )
@@ -0,0 +1,292 @@
+from pathlib import Path
+from re import DOTALL, IGNORECASE, findall, match, search, sub
+from shutil import rmtree
+from threading import Lock
+from typing import Iterator, List, Optional, Union
+
+from pandas import DataFrame
+
+from aws_managers.athena.execution.execution_backend import ExecutionBackend
+from aws_managers.athena.metadata.metadata_backend import MetadataBackend
+
+# DuckDB macros for Presto functions used by the query templates
+DUCKDB_PRESTO_MACROS = [
+    'CREATE OR REPLACE MACRO approx_distinct(x) AS approx_count_distinct(x), '
+    '(x, e) AS approx_count_distinct(x)',
+    'CREATE OR REPLACE MACRO approx_percentile(x, p) AS approx_quantile(x, p)',
+]
+# patterns of the Athena DDL rendered by AthenaQueryGenerator
+CREATE_TABLE_AS_PATTERN = (
+    r'\s*CREATE\s+TABLE\s+(\w+)\.(\w+)\s+WITH\s*\((.*?)\)\s*AS\s+(.*)'
+)
+DROP_TABLE_PATTERN = r'\s*DROP\s+TABLE\s+(?:IF\s+EXISTS\s+)?(\w+)\.(\w+)'
+PARTITIONED_BY_PATTERN = r'partitioned_by\s*=\s*ARRAY\[(.*?)\]'
+DUCKDB_TYPE_TO_ATHENA_TYPE = {
+    'BOOLEAN': 'boolean',
+    'TINYINT': 'tinyint',
+    'SMALLINT': 'smallint',
+    'INTEGER': 'integer',
+    'BIGINT': 'bigint',
+    'FLOAT': 'real',
+    'DOUBLE': 'double',
+    'VARCHAR': 'varchar',
+    'DATE': 'date',
+    'TIMESTAMP': 'timestamp',
+    'BLOB': 'varbinary'
+}
+
+
+class DuckDBBackend(ExecutionBackend, MetadataBackend):
+    """
+    Executes AthenaFrame queries locally with DuckDB against parquet files, for
+    fast offline iteration, CI and benchmarking.
+
+    Each table is a directory of (optionally hive-partitioned) parquet files at
+    root/<database>/<table>/ and is exposed to DuckDB as the view
+    <database>.<table>, so the same templates run unchanged.
+
+    Requires the optional duckdb dependency.
+    """
+    def __init__(
+            self,
+            root: Union[str, Path],
+            connection: Optional['duckdb.DuckDBPyConnection'] = None
+    ):
+        """
+        Create a new DuckDBBackend.
+
+        :param root: Directory containing a sub-directory per database, each
+                     containing a sub-directory of parquet files per table.
+        :param connection: Optional DuckDB connection. Defaults to a new
+                           in-memory database.
+        """
+        import duckdb
+        if connection is None:
+            connection = duckdb.connect()
+        self._root: Path = Path(root)
+        self._connection = connection
+        self._lock: Lock = Lock()
+        for macro in DUCKDB_PRESTO_MACROS:
+            self._connection.execute(macro)
+        self.refresh()
+
+    @property
+    def cache_key(self) -> str:
+        """
+        Identity of the backend in persistent result caches.
+        """
+        return f'DuckDBBackend({self._root.resolve()})'
+
+    def refresh(self):
+        """
+        Create a view for every table directory under the root.
+        """
+        with self._lock:
+            for database_dir in sorted(self._root.iterdir()):
+                if not database_dir.is_dir():
+                    continue
+                self._connection.execute(
+                    f'CREATE SCHEMA IF NOT EXISTS "{database_dir.name}"'
+                )
+                for table_dir in sorted(database_dir.iterdir()):
+                    if not table_dir.is_dir():
+                        continue
+                    self._connection.execute(
+                        f'CREATE OR REPLACE VIEW '
+                        f'"{database_dir.name}"."{table_dir.name}" AS '
+                        f'SELECT * FROM read_parquet('
+                        f"'{table_dir.as_posix()}/**/*.parquet', "
+                        f'hive_partitioning = true)'
+                    )
+
+    @staticmethod
+    def _translate(sql: str) -> str:
+        """
+        Rewrite Presto syntax that DuckDB does not accept. EXPLAIN options are
+        dropped as DuckDB only has a text plan.
+        """
+        sql = sub(
+            r'^(\s*EXPLAIN(?:\s+ANALYZE)?)\s*\([^)]*\)',
+            r'\1',
+            sql,
+            flags=IGNORECASE
+        )
+        return sub(
+            r'TABLESAMPLE\s+(BERNOULLI|SYSTEM)\s*\(\s*(\d+)\s*\)',
+            r'TABLESAMPLE \2% (\1)',
+            sql,
+            flags=IGNORECASE
+        )
+
+    def execute(self, sql: str, database: str) -> DataFrame:
+        """
+        Execute a query with DuckDB.
+
+        :param sql: Raw SQL to execute.
+        :param database: Name of the database. Tables are referenced as
+                         <database>.<table> in the SQL.
+        """
+        with self._lock:
+            cursor = self._connection.cursor()
+        try:
+            return cursor.execute(self._translate(sql)).df()
+        finally:
+            cursor.close()
+
+    def execute_statement(self, sql: str, database: str) -> Optional[dict]:
+        """
+        Execute a statement with DuckDB.
+
+        CREATE TABLE AS statements write the table as parquet under the root,
+        partitioned if requested, and DROP TABLE statements remove the table's
+        view and its directory under the root. Other statements are executed
+        as they are.
+
+        :param sql: Raw SQL to execute.
+        :param database: Name of the database.
+        """
+        ctas = match(CREATE_TABLE_AS_PATTERN, sql, flags=IGNORECASE | DOTALL)
+        drop = match(DROP_TABLE_PATTERN, sql, flags=IGNORECASE)
+        if ctas is not None:
+            database_name, table_name, properties, query = ctas.groups()
+            table_dir = self._root / database_name / table_name
+            table_dir.mkdir(parents=True)
+            partitioned_by = search(
+                PARTITIONED_BY_PATTERN, properties, flags=IGNORECASE
+            )
+            if partitioned_by is not None:
+                partition_columns = findall(r"'(\w+)'", partitioned_by.group(1))
+                target = table_dir
+                options = (
+                    f'FORMAT PARQUET, '
+                    f'PARTITION_BY ({", ".join(partition_columns)})'
+                )
+            else:
+                target = table_dir / 'data.parquet'
+                options = 'FORMAT PARQUET'
+            self.execute(
+                sql=f'COPY ({query.strip().rstrip(";")}) '
+                    f"TO '{target.as_posix()}' ({options})",
+                database=database
+            )
+            self.refresh()
+        elif drop is not None:
+            database_name, table_name = drop.groups()
+            with self._lock:
+                self._connection.execute(
+                    f'DROP VIEW IF EXISTS "{database_name}"."{table_name}"'
+                )
+            rmtree(self._root / database_name / table_name, ignore_errors=True)
+        else:
+            self.execute(sql=sql, database=database)
+        return None
+
+    def delete_data(self, location: str):
+        """
+        Does nothing, as the data of DuckDB tables is stored under the root and
+        removed when the table is dropped.
+
+        :param location: Location of the table data.
+        """
+        pass
+
+    def iter_batches(
+            self,
+            sql: str,
+            database: str,
+            batch_rows: int
+    ) -> Iterator[DataFrame]:
+        """
+        Execute a query with DuckDB and yield its result in batches of at most
+        batch_rows rows, fetched as Arrow record batches.
+
+        :param sql: Raw SQL to execute.
+        :param database: Name of the database. Tables are referenced as
+                         <database>.<table> in the SQL.
+        :param batch_rows: Maximum number of rows per batch.
+        """
+        with self._lock:
+            cursor = self._connection.cursor()
+        try:
+            reader = cursor.execute(self._translate(sql)).fetch_record_batch(
+                rows_per_batch=batch_rows
+            )
+            for batch in reader:
+                yield batch.to_pandas()
+        finally:
+            cursor.close()
+
+    def _column_info(self, where: str) -> DataFrame:
+        """
+        Return column info from DuckDB's information_schema with Athena type
+        names and partition columns flagged.
+        """
+        column_info = self.execute(
+            sql=f'SELECT * FROM information_schema.columns WHERE {where} '
+                f'ORDER BY table_name, ordinal_position',
+            database=''
+        )
+        column_info['data_type'] = column_info['data_type'].map(
+            lambda data_type: DUCKDB_TYPE_TO_ATHENA_TYPE.get(
+                data_type, data_type.lower()
+            )
+        )
+        column_info['extra_info'] = [
+            'partition key'
+            if any(
+                path.is_dir() and path.name.startswith(f'{column}=')
+                for path in (self._root / database / table).iterdir()
+            ) else None
+            for database, table, column in zip(
+                column_info['table_schema'],
+                column_info['table_name'],
+                column_info['column_name']
+            )
+        ]
+        return column_info
+
+    def column_info(self, database: str, table: str) -> DataFrame:
+        """
+        Return column info for a single table.
+
+        :param database: Name of the database.
+        :param table: Name of the table.
+        """
+        return self._column_info(
+            where=f"table_schema = '{database}' AND table_name = '{table}'"
+        ).reset_index(drop=True)
+
+    def column_infos(self, database: str) -> DataFrame:
+        """
+        Return column info for every table in a database.
+
+        :param database: Name of the database.
+        """
+        return self._column_info(where=f"table_schema = '{database}'")
+
+    def partitions(
+            self,
+            database: str,
+            table: str,
+            partition_columns: List[str]
+    ) -> DataFrame:
+        """
+        Return the partitions of a table from its hive-style directories.
+        Values are returned as strings.
+
+        :param database: Name of the database.
+        :param table: Name of the table.
+        :param partition_columns: Names of the table's partition keys, in
+                                  order.
+        """
+        table_dir = self._root / database / table
+        rows = []
+        for path in sorted(table_dir.glob('/'.join(
+                f'{column}=*' for column in partition_columns
+        ))):
+            if path.is_dir():
+                rows.append([
+                    part.split('=', 1)[1]
+                    for part in path.relative_to(table_dir).parts
+                ])
+        return DataFrame(data=rows, columns=partition_columns)
@@ -0,0 +1,80 @@
+from abc import ABC, abstractmethod
+from typing import Hashable, Iterator, Optional
+
+from pandas import DataFrame
+
+
+class ExecutionBackend(ABC):
+    """
+    Executes the SQL rendered by AthenaQueryGenerator and returns the result.
+    """
+    @abstractmethod
+    def execute(self, sql: str, database: str) -> DataFrame:
+        """
+        Execute a query and return its result.
+
+        :param sql: Raw SQL to execute.
+        :param database: Name of the database to run the query against.
+        """
+        raise NotImplementedError
+
+    @property
+    def flight_key(self) -> Hashable:
+        """
+        Identity of the backend for coalescing identical queries in flight.
+        Backends that run queries the same way e.g. with the same settings
+        should have the same key. Defaults to the backend itself.
+        """
+        return self
+
+    @property
+    def cache_key(self) -> str:
+        """
+        Identity of the backend in persistent result caches, which must be the
+        same across processes, so that results of the same query from
+        different engines e.g. Athena and DuckDB are cached separately.
+        Defaults to the name of the backend's class.
+        """
+        return type(self).__name__
+
+    def execute_statement(self, sql: str, database: str) -> Optional[dict]:
+        """
+        Execute a statement that does not return a result e.g. CREATE TABLE AS
+        or DROP TABLE, and return the query execution metadata, if any.
+
+        :param sql: Raw SQL to execute.
+        :param database: Name of the database to run the statement against.
+        """
+        self.execute(sql=sql, database=database)
+        return None
+
+    @abstractmethod
+    def delete_data(self, location: str):
+        """
+        Delete the data at the location of a dropped table.
+
+        :param location: Location of the table data.
+        """
+        raise NotImplementedError
+
+    def iter_batches(
+            self,
+            sql: str,
+            database: str,
+            batch_rows: int
+    ) -> Iterator[DataFrame]:
+        """
+        Execute a query and yield its result in batches of at most batch_rows
+        rows.
+
+        Backends should override this to stream results so that memory use is
+        bounded by the batch size. The default executes the query in full and
+        slices the result.
+
+        :param sql: Raw SQL to execute.
+        :param database: Name of the database to run the query against.
+        :param batch_rows: Maximum number of rows per batch.
+        """
+        data = self.execute(sql=sql, database=database)
+        for start in range(0, len(data), batch_rows):
+            yield data.iloc[start: start + batch_rows]
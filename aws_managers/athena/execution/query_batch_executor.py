@@ -0,0 +1,58 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Union
+
+
+class QueryBatchExecutor(object):
+    """
+    Runs a batch of independent queries in parallel on a bounded thread pool.
+    """
+    def __init__(self, max_workers: int = 8):
+        """
+        Create a new QueryBatchExecutor.
+
+        :param max_workers: Maximum number of queries to submit at the same
+                            time. The process-wide QUERY_LIMITER caps the number
+                            that are active in Athena across all batches.
+        """
+        self._max_workers: int = max_workers
+
+    @staticmethod
+    def _call(func: Callable[[Any], Any], item: Any) -> Any:
+        """
+        Call func on item, returning any exception instead of raising it.
+        """
+        try:
+            return func(item)
+        except Exception as ex:
+            return ex
+
+    def map(
+            self,
+            func: Callable[[Any], Any],
+            items: Iterable[Any],
+            raise_errors: bool = False
+    ) -> List[Union[Any, Exception]]:
+        """
+        Call func on each item in parallel and return the results in the order
+        the items were given.
+
+        :param func: Function that executes a single query.
+        :param items: Queries or other arguments to pass to func.
+        :param raise_errors: If True, raise the first error once all the
+                             queries have finished. Otherwise a failed query's
+                             exception is returned in place of its result.
+        """
+        items = list(items)
+        if len(items) == 0:
+            return []
+        with ThreadPoolExecutor(
+                max_workers=min(self._max_workers, len(items))
+        ) as executor:
+            results = list(executor.map(
+                lambda item: self._call(func, item), items
+            ))
+        if raise_errors:
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+        return results
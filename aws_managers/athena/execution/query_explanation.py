@@ -0,0 +1,174 @@
+from json import JSONDecodeError, loads
+from math import isnan
+from typing import Any, Dict, List, Optional
+
+from pandas import DataFrame, Series
+
+from aws_managers.athena.execution.query_statistics import QueryStatistics
+from aws_managers.athena.reference.athena_data_types import \
+    comparable_value
+
+EXPLAIN_TYPES = ('DISTRIBUTED', 'IO')
+
+
+class QueryExplanation(object):
+
+    def __init__(
+            self,
+            sql: str,
+            result: DataFrame,
+            explain_type: str,
+            analyze: bool = False,
+            partitions: Optional[DataFrame] = None,
+            statistics: Optional[QueryStatistics] = None
+    ):
+        """
+        Create a new QueryExplanation from the result of an EXPLAIN statement.
+
+        The estimated input size and the constraints on each column are read
+        from EXPLAIN (TYPE IO, FORMAT JSON) plans. They are None for other
+        plans, and for backends that don't produce IO plans e.g. DuckDB.
+
+        :param sql: SQL of the query that was explained.
+        :param result: Result of the EXPLAIN statement, with the plan in its
+                       last column, one or more lines per row.
+        :param explain_type: 'DISTRIBUTED' or 'IO'.
+        :param analyze: Whether the query was run with EXPLAIN ANALYZE.
+        :param partitions: Optional partitions of the table, with a column for
+                           each partition key, to count the partitions that the
+                           query reads.
+        :param statistics: Statistics of the EXPLAIN statement.
+        """
+        self.sql: str = sql
+        self.explain_type: str = explain_type
+        self.analyze: bool = analyze
+        self.plan: str = '\n'.join(
+            str(line) for line in result.iloc[:, -1]
+        ) if len(result.columns) > 0 else ''
+        self.statistics: Optional[QueryStatistics] = statistics
+        self.estimated_rows: Optional[float] = None
+        self.estimated_bytes: Optional[float] = None
+        self.column_constraints: Optional[Dict[str, List[dict]]] = None
+        io_plan = self._io_plan()
+        if io_plan is not None:
+            tables = io_plan.get('inputTableColumnInfos', [])
+            self.estimated_rows = self._sum_estimates(
+                tables, 'outputRowCount'
+            )
+            self.estimated_bytes = self._sum_estimates(
+                tables, 'outputSizeInBytes'
+            )
+            self.column_constraints = {}
+            for table in tables:
+                for constraint in table.get('constraint', table).get(
+                        'columnConstraints', []
+                ):
+                    self.column_constraints.setdefault(
+                        constraint['columnName'], []
+                    ).append(constraint)
+        self.partitions: Optional[DataFrame] = None
+        if partitions is not None and self.column_constraints is not None:
+            self.partitions = partitions.loc[
+                self._partition_mask(partitions)
+            ].reset_index(drop=True)
+
+    def _io_plan(self) -> Optional[dict]:
+        """
+        Return the parsed plan if it is an IO plan in JSON format.
+        """
+        if self.analyze or self.explain_type != 'IO':
+            return None
+        try:
+            io_plan = loads(self.plan)
+        except JSONDecodeError:
+            return None
+        return io_plan if isinstance(io_plan, dict) else None
+
+    @staticmethod
+    def _sum_estimates(tables: List[dict], key: str) -> Optional[float]:
+        """
+        Sum an estimate over the input tables, or return None if it is unknown
+        for any of them. Unknown estimates are NaN.
+        """
+        total = 0.0
+        for table in tables:
+            value = table.get('estimate', {}).get(key)
+            if value is None:
+                return None
+            value = float(value)
+            if isnan(value):
+                return None
+            total += value
+        return total
+
+    @staticmethod
+    def _in_domain(value: Any, constraint: dict) -> bool:
+        """
+        Return whether a value is within any of the ranges of a constraint's
+        domain. Ranges without a value are unbounded on that side.
+        """
+        if value is None:
+            return constraint['domain'].get('nullsAllowed', False)
+        data_type = constraint['type']
+        value = comparable_value(value, data_type)
+        for bounds in constraint['domain'].get('ranges', []):
+            low = bounds.get('low', {})
+            high = bounds.get('high', {})
+            if 'value' in low:
+                low_value = comparable_value(low['value'], data_type)
+                if value < low_value or (
+                        value == low_value and low['bound'] == 'ABOVE'
+                ):
+                    continue
+            if 'value' in high:
+                high_value = comparable_value(high['value'], data_type)
+                if value > high_value or (
+                        value == high_value and high['bound'] == 'BELOW'
+                ):
+                    continue
+            return True
+        return False
+
+    def _partition_mask(self, partitions: DataFrame) -> Series:
+        """
+        Return whether each partition satisfies the plan's constraints on the
+        partition keys.
+        """
+        mask = Series(True, index=partitions.index)
+        for column in partitions.columns:
+            for constraint in self.column_constraints.get(column, []):
+                mask &= partitions[column].map(
+                    lambda value: self._in_domain(value, constraint)
+                )
+        return mask
+
+    @property
+    def partitions_read(self) -> Optional[int]:
+        """
+        Number of partitions that the query reads, if known.
+        """
+        if self.partitions is None:
+            return None
+        return len(self.partitions)
+
+    @property
+    def data_scanned_bytes(self) -> Optional[int]:
+        """
+        Data scanned by an EXPLAIN ANALYZE statement, which runs the query.
+        """
+        if self.statistics is None:
+            return None
+        return self.statistics.data_scanned_bytes
+
+    def __repr__(self):
+
+        return (
+            f'QueryExplanation(explain_type={self.explain_type}, '
+            f'analyze={self.analyze}, '
+            f'estimated_bytes={self.estimated_bytes}, '
+            f'partitions_read={self.partitions_read})'
+        )
+
+    def __str__(self):
+
+        return self.plan
@@ -0,0 +1,78 @@
+from threading import Condition
+
+
+class QueryLimiter(object):
+    """
+    Caps the number of queries that are active at the same time across all the
+    threads of a process, e.g. to stay under the account's active DML query
+    quota.
+
+    https://docs.aws.amazon.com/athena/latest/ug/service-limits.html
+    """
+    def __init__(self, max_active: int = 20):
+        """
+        Create a new QueryLimiter.
+
+        :param max_active: Maximum number of queries to run at the same time.
+        """
+        self._condition: Condition = Condition()
+        self._max_active: int = max_active
+        self._active: int = 0
+
+    @property
+    def max_active(self) -> int:
+        return self._max_active
+
+    @max_active.setter
+    def max_active(self, max_active: int):
+
+        with self._condition:
+            self._max_active = max_active
+            self._condition.notify_all()
+
+    @property
+    def active(self) -> int:
+        """
+        Number of queries that currently hold a slot.
+        """
+        return self._active
+
+    def acquire(self):
+        """
+        Wait for a free slot and take it.
+        """
+        with self._condition:
+            while self._active >= self._max_active:
+                self._condition.wait()
+            self._active += 1
+
+    def try_acquire(self) -> bool:
+        """
+        Take a free slot if there is one, without waiting. Return whether a
+        slot was taken.
+        """
+        with self._condition:
+            if self._active >= self._max_active:
+                return False
+            self._active += 1
+            return True
+
+    def release(self):
+        """
+        Give back a slot taken with acquire.
+        """
+        with self._condition:
+            self._active -= 1
+            self._condition.notify()
+
+    def __enter__(self) -> 'QueryLimiter':
+
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+
+        self.release()
+
+
+QUERY_LIMITER = QueryLimiter()
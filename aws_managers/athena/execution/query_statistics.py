@@ -0,0 +1,231 @@
+import asyncio
+import sys
+from collections import deque
+from datetime import datetime
+from math import ceil
+from pathlib import Path
+from threading import Lock
+from types import FrameType
+from typing import Deque, List, Optional, Tuple
+
+from pandas import DataFrame
+
+from aws_managers.paths.dirs import DIR_PROJECT
+
+DIR_ASYNCIO = Path(asyncio.__file__).parent
+
+# https://aws.amazon.com/athena/pricing/
+ATHENA_COST_PER_TB = 5.0
+ATHENA_MIN_BYTES_BILLED = 10 * 1024 ** 2
+
+
+class QueryStatistics(object):
+
+    def __init__(
+            self,
+            sql: str,
+            database: str,
+            table: Optional[str],
+            row_count: int,
+            wall_time_ms: float,
+            cached: bool = False,
+            coalesced: bool = False,
+            query_metadata: Optional[dict] = None,
+            method: Optional[str] = None,
+            call_site: Optional[str] = None
+    ):
+        """
+        Create a new QueryStatistics.
+
+        :param sql: Rendered SQL of the query.
+        :param database: Name of the database the query was run against.
+        :param table: Name of the table that was queried.
+        :param row_count: Number of rows in the result.
+        :param wall_time_ms: Time taken to get the result, in milliseconds.
+        :param cached: Whether the result came from the result cache.
+        :param coalesced: Whether the result was shared by an identical query
+                          that was already running.
+        :param query_metadata: Optional Athena QueryExecution response, as
+                               attached to results by awswrangler.
+        :param method: Name of the frame method that ran the query.
+        :param call_site: Location of the code that called the frame method.
+        """
+        self.timestamp: datetime = datetime.now()
+        self.sql: str = sql
+        self.database: str = database
+        self.table: Optional[str] = table
+        self.row_count: int = row_count
+        self.wall_time_ms: float = wall_time_ms
+        self.cached: bool = cached
+        self.coalesced: bool = coalesced
+        self.method: Optional[str] = method
+        self.call_site: Optional[str] = call_site
+        query_metadata = query_metadata or {}
+        statistics = query_metadata.get('Statistics', {})
+        self.query_id: Optional[str] = query_metadata.get('QueryExecutionId')
+        self.data_scanned_bytes: Optional[int] = statistics.get(
+            'DataScannedInBytes')
+        self.engine_time_ms: Optional[int] = statistics.get(
+            'EngineExecutionTimeInMillis')
+        self.queue_time_ms: Optional[int] = statistics.get(
+            'QueryQueueTimeInMillis')
+        self.planning_time_ms: Optional[int] = statistics.get(
+            'QueryPlanningTimeInMillis')
+        self.total_time_ms: Optional[int] = statistics.get(
+            'TotalExecutionTimeInMillis')
+
+    @staticmethod
+    def query_metadata(data: DataFrame) -> Optional[dict]:
+        """
+        Return the Athena QueryExecution response that awswrangler attaches to
+        query results, if there is one.
+        """
+        query_metadata = data.__dict__.get('query_metadata')
+        if isinstance(query_metadata, dict):
+            return query_metadata
+        return None
+
+    @property
+    def cost(self) -> Optional[float]:
+        """
+        Estimated cost of the query in USD, based on the data scanned rounded up
+        to the nearest megabyte with a 10 MB minimum.
+        """
+        if self.data_scanned_bytes is None:
+            return None
+        megabytes = ceil(
+            max(self.data_scanned_bytes, ATHENA_MIN_BYTES_BILLED) / 1024 ** 2
+        )
+        return megabytes / 1024 ** 2 * ATHENA_COST_PER_TB
+
+    def to_dict(self) -> dict:
+
+        return dict(
+            timestamp=self.timestamp,
+            query_id=self.query_id,
+            database=self.database,
+            table=self.table,
+            method=self.method,
+            call_site=self.call_site,
+            cached=self.cached,
+            coalesced=self.coalesced,
+            row_count=self.row_count,
+            data_scanned_bytes=self.data_scanned_bytes,
+            cost=self.cost,
+            wall_time_ms=self.wall_time_ms,
+            total_time_ms=self.total_time_ms,
+            engine_time_ms=self.engine_time_ms,
+            queue_time_ms=self.queue_time_ms,
+            planning_time_ms=self.planning_time_ms,
+            sql=self.sql
+        )
+
+    def __repr__(self):
+
+        return (
+            f'QueryStatistics(query_id={self.query_id}, '
+            f'data_scanned_bytes={self.data_scanned_bytes}, '
+            f'wall_time_ms={self.wall_time_ms:.0f}, cached={self.cached}, '
+            f'coalesced={self.coalesced})'
+        )
+
+
+def find_caller_frame() -> Tuple[Optional[str], Optional[FrameType]]:
+    """
+    Return the name of the outermost public aws_managers method on the stack
+    and the frame of the code outside aws_managers that called it.
+
+    Event loop frames are skipped, so queries run from tasks are attributed to
+    the code that started the event loop.
+    """
+    method = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        path = Path(frame.f_code.co_filename)
+        if DIR_ASYNCIO in path.parents:
+            pass
+        elif DIR_PROJECT not in path.parents:
+            return method, frame
+        elif not frame.f_code.co_name.startswith(('_', '<')):
+            method = frame.f_code.co_name
+        frame = frame.f_back
+    return method, None
+
+
+def find_call_site() -> Tuple[Optional[str], Optional[str]]:
+    """
+    Return the name of the outermost public aws_managers method on the stack
+    and the location of the code outside aws_managers that called it.
+    """
+    method, frame = find_caller_frame()
+    if frame is None:
+        return method, None
+    return method, (
+        f'{frame.f_code.co_filename}:{frame.f_lineno} '
+        f'in {frame.f_code.co_name}'
+    )
+
+
+class QueryLedger(object):
+    """
+    Thread-safe record of the statistics of the queries run in a session.
+    """
+    def __init__(self, max_entries: Optional[int] = 100_000):
+        """
+        Create a new QueryLedger.
+
+        :param max_entries: Maximum number of entries to keep. The oldest are
+                            dropped first.
+        """
+        self._lock: Lock = Lock()
+        self._entries: Deque[QueryStatistics] = deque(maxlen=max_entries)
+
+    def record(self, statistics: QueryStatistics):
+        """
+        Add the statistics of a query to the ledger.
+        """
+        with self._lock:
+            self._entries.append(statistics)
+
+    @property
+    def entries(self) -> List[QueryStatistics]:
+
+        with self._lock:
+            return list(self._entries)
+
+    def __len__(self) -> int:
+
+        return len(self._entries)
+
+    def clear(self):
+        """
+        Remove all entries from the ledger.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def to_frame(self) -> DataFrame:
+        """
+        Return the ledger as a DataFrame with a row per query.
+        """
+        return DataFrame([entry.to_dict() for entry in self.entries])
+
+    def cost_by_call_site(self) -> DataFrame:
+        """
+        Return the number of queries, data scanned, cost and time of the queries
+        run from each call site, most expensive first.
+        """
+        data = self.to_frame()
+        if len(data) == 0:
+            return data
+        return data.groupby(['call_site', 'method'], dropna=False).agg(
+            queries=('sql', 'count'),
+            cached=('cached', 'sum'),
+            coalesced=('coalesced', 'sum'),
+            data_scanned_bytes=('data_scanned_bytes', 'sum'),
+            cost=('cost', 'sum'),
+            wall_time_ms=('wall_time_ms', 'sum')
+        ).sort_values(['cost', 'wall_time_ms'], ascending=False)
+
+
+QUERY_LEDGER = QueryLedger()
@@ -0,0 +1,184 @@
+from asyncio import CancelledError, shield, wrap_future
+from concurrent.futures import Future
+from re import compile
+from threading import Lock
+from typing import Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar('T')
+
+# quoted literals and identifiers, runs of whitespace, and everything else
+SQL_TOKEN_PATTERN = compile(
+    r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|\s+|[^'\"\s]+|['\"]"
+)
+
+
+def canonical_sql(sql: str) -> str:
+    """
+    Return the SQL with each run of whitespace outside quoted literals and
+    identifiers collapsed to a single space, and without leading and trailing
+    whitespace or a terminating semicolon, so that queries that only differ in
+    layout are the same.
+
+    :param sql: Raw SQL.
+    """
+    return ''.join(
+        ' ' if token.isspace() else token
+        for token in SQL_TOKEN_PATTERN.findall(sql)
+    ).strip().rstrip(';').rstrip()
+
+
+class _Abandoned(Exception):
+    """
+    Set on a call's future when its caller was cancelled, so that the callers
+    waiting for it run the call again instead of being cancelled too.
+    """
+
+
+class SingleFlight(object):
+    """
+    Coalesces identical calls that are in flight at the same time, across the
+    threads and event loops of a process, so that only the first caller runs
+    the call and the others wait for and share its result or exception.
+    """
+    def __init__(self):
+        """
+        Create a new SingleFlight.
+        """
+        self._lock: Lock = Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._executions: int = 0
+        self._coalesced: int = 0
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        """
+        Return the future of the call in flight for a key and False, or a new
+        future and True if there is none and the caller must run the call.
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._coalesced += 1
+                return future, False
+            future = Future()
+            self._in_flight[key] = future
+            self._executions += 1
+            return future, True
+
+    def _rejoin(self):
+        """
+        Stop counting a caller as coalesced when the call it waited for was
+        abandoned, before it joins again.
+        """
+        with self._lock:
+            self._coalesced -= 1
+
+    def _leave(self, key: Hashable):
+
+        with self._lock:
+            del self._in_flight[key]
+
+    @staticmethod
+    def _fail(future: Future, error: BaseException):
+        """
+        Pass the error of a call on to the callers waiting for it, unless the
+        call was cancelled, in which case they run it again.
+        """
+        if isinstance(error, CancelledError):
+            future.set_exception(_Abandoned())
+        else:
+            future.set_exception(error)
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> Tuple[T, bool]:
+        """
+        Call func, or wait for the result of the call in flight for the same
+        key. Return the result and whether it came from another caller's call.
+
+        :param key: Identity of the call.
+        :param func: Function to call if no call is in flight for the key.
+        """
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                break
+            try:
+                return future.result(), True
+            except _Abandoned:
+                self._rejoin()
+        try:
+            result = func()
+        except BaseException as error:
+            self._fail(future, error)
+            raise
+        finally:
+            self._leave(key)
+        future.set_result(result)
+        return result, False
+
+    async def do_async(
+            self,
+            key: Hashable,
+            func: Callable[[], Awaitable[T]]
+    ) -> Tuple[T, bool]:
+        """
+        Await func, or the result of the call in flight for the same key.
+        Return the result and whether it came from another caller's call.
+
+        Cancelling a caller that waits for another caller's call only stops it
+        waiting, and cancelling the caller running the call makes the callers
+        waiting for it run the call again.
+
+        :param key: Identity of the call.
+        :param func: Coroutine function to await if no call is in flight for
+                     the key.
+        """
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                break
+            try:
+                # shielded so that a cancelled caller doesn't cancel the call
+                return await shield(wrap_future(future)), True
+            except _Abandoned:
+                self._rejoin()
+        try:
+            result = await func()
+        except BaseException as error:
+            self._fail(future, error)
+            raise
+        finally:
+            self._leave(key)
+        future.set_result(result)
+        return result, False
+
+    @property
+    def executions(self) -> int:
+        """
+        Number of calls that were run.
+        """
+        return self._executions
+
+    @property
+    def coalesced(self) -> int:
+        """
+        Number of calls that shared the result of a call in flight instead of
+        being run.
+        """
+        return self._coalesced
+
+    @property
+    def in_flight(self) -> int:
+        """
+        Number of calls currently running.
+        """
+        return len(self._in_flight)
+
+    def reset_counts(self):
+        """
+        Reset the numbers of executions and coalesced calls.
+        """
+        with self._lock:
+            self._executions = 0
+            self._coalesced = 0
+
+
+SINGLE_FLIGHT = SingleFlight()
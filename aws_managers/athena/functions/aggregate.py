@@ -9,6 +9,7 @@ https://prestodb.io/docs/current/functions/aggregate.html#general-aggregate-func
 
 class AvgMixin(object):
 
+    __slots__ = ()
     name: str
 
     def avg(self) -> str:
@@ -26,6 +27,7 @@ class AvgMixin(object):
 
 class CountMixin(object):
 
+    __slots__ = ()
     name: str
 
     def count(self) -> str:
@@ -37,6 +39,7 @@ class CountMixin(object):
 
 class GeometricMeanMixin(object):
 
+    __slots__ = ()
     name: str
 
     def geometric_mean(self) -> str:
@@ -45,6 +48,7 @@ class GeometricMeanMixin(object):
 
 class MaxMixin(object):
 
+    __slots__ = ()
     name: str
 
     def max(self, n: int = 1) -> str:
@@ -60,6 +64,7 @@ class MaxMixin(object):
 
 class MinMixin(object):
 
+    __slots__ = ()
     name: str
 
     def min(self, n: int = 1) -> str:
@@ -75,6 +80,7 @@ class MinMixin(object):
 
 class SumMixin(object):
 
+    __slots__ = ()
     name: str
 
     def sum(self) -> str:
@@ -0,0 +1,145 @@
+"""
+Compile pandas-style aggregation specs e.g.
+
+    {'col_a': ['min', 'max', 'avg'], 'col_b': ['approx_percentile:0.9']}
+
+into aggregate expressions that can all be computed in a single SELECT.
+
+In approximate mode exact functions with an approximate equivalent e.g.
+count_distinct and median are replaced by HyperLogLog and quantile digest
+based functions, which need far less memory on large tables.
+
+Functions are given by name, with any extra arguments after a colon e.g.
+'approx_percentile:0.9' renders as approx_percentile(col_b, 0.9). The column
+'*' can be used with 'count' for count(*).
+"""
+from re import sub
+from typing import Dict, List, NamedTuple, Optional, Union
+
+# pandas names for Presto aggregate functions
+AGGREGATE_FUNCTION_ALIASES = {
+    'mean': 'avg',
+    'std': 'stddev',
+    'var': 'variance'
+}
+# approximate functions to use in place of exact ones in approximate mode
+APPROXIMATE_FUNCTIONS = {
+    'count_distinct': 'approx_distinct',
+    'median': 'approx_percentile:0.5'
+}
+# range of standard errors accepted by approx_distinct
+MIN_STANDARD_ERROR = 0.0040625
+MAX_STANDARD_ERROR = 0.26
+
+
+class AggregateExpression(NamedTuple):
+
+    column: str
+    function: str
+    expression: str
+    alias: str
+    approximate: bool = False
+
+
+def validate_standard_error(max_standard_error: Optional[float]):
+    """
+    Raise a ValueError if a standard error is outside the range accepted by
+    approx_distinct.
+    """
+    if max_standard_error is not None and not (
+            MIN_STANDARD_ERROR <= max_standard_error <= MAX_STANDARD_ERROR
+    ):
+        raise ValueError(
+            f'max_standard_error must be between {MIN_STANDARD_ERROR} and '
+            f'{MAX_STANDARD_ERROR}'
+        )
+
+
+def approximate_function(
+        function: str,
+        max_standard_error: Optional[float] = None
+) -> str:
+    """
+    Return the approximate equivalent of a function, or the function itself if
+    it has none.
+
+    :param function: Name of the function with optional colon-separated
+                     arguments.
+    :param max_standard_error: Optional maximum standard error to pass to
+                               approx_distinct.
+    """
+    function = APPROXIMATE_FUNCTIONS.get(function, function)
+    if function == 'approx_distinct' and max_standard_error is not None:
+        function = f'approx_distinct:{max_standard_error}'
+    return function
+
+
+def is_approximate(function: str) -> bool:
+    """
+    Return whether a function computes an approximate result.
+    """
+    return function.startswith('approx_')
+
+
+def aggregate_expression(column: str, function: str) -> str:
+    """
+    Return the SQL expression for an aggregate function applied to a column.
+
+    :param column: Name of the column, or '*'.
+    :param function: Name of the function with optional colon-separated
+                     arguments e.g. 'max' or 'approx_percentile:0.9'.
+    """
+    name, *args = function.split(':')
+    name = AGGREGATE_FUNCTION_ALIASES.get(name, name)
+    if name == 'count_distinct':
+        return f'count(DISTINCT {column})'
+    return f"{name}({', '.join([column] + args)})"
+
+
+def aggregate_alias(column: str, function: str) -> str:
+    """
+    Return a column alias for an aggregate expression that is safe to use in
+    Athena, which lower-cases aliases.
+
+    :param column: Name of the column, or '*'.
+    :param function: Name of the function with optional colon-separated
+                     arguments.
+    """
+    if column == '*':
+        column = 'all'
+    return sub(r'\W', '_', f'{column}__{function}').lower()
+
+
+def parse_aggregate_spec(
+        spec: Dict[str, Union[str, List[str]]],
+        approximate: bool = False,
+        max_standard_error: Optional[float] = None
+) -> List[AggregateExpression]:
+    """
+    Return an AggregateExpression for each column and function in the spec.
+
+    :param spec: Mapping of column names to a function name or list of function
+                 names.
+    :param approximate: Whether to replace exact functions with their
+                        approximate equivalents.
+    :param max_standard_error: Optional maximum standard error to pass to
+                               approx_distinct in approximate mode.
+    """
+    expressions = []
+    for column, functions in spec.items():
+        if isinstance(functions, str):
+            functions = [functions]
+        for function in functions:
+            sql_function = function
+            if approximate:
+                sql_function = approximate_function(
+                    function, max_standard_error
+                )
+            expressions.append(AggregateExpression(
+                column=column,
+                function=function,
+                expression=aggregate_expression(column, sql_function),
+                alias=aggregate_alias(column, function),
+                approximate=is_approximate(sql_function)
+            ))
+    return expressions
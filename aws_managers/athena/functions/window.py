@@ -10,6 +10,7 @@ https://prestodb.io/docs/current/functions/window.html#value-functions
 
 class LagMixin(object):
 
+    __slots__ = ()
     name: str
 
     def lag(
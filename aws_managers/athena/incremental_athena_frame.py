@@ -0,0 +1,694 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from pandas import DataFrame, Index, Series, concat, to_numeric
+
+from aws_managers.athena.caching.partial_aggregate_store import \
+    PartialAggregateStore
+from aws_managers.athena.queries.athena_query import AthenaQuery
+from aws_managers.athena.queries.athena_query_plan import AthenaQueryPlan
+from aws_managers.athena.queries.column_chunks import chunk_columns
+from aws_managers.athena.reference.athena_data_types import \
+    ATHENA_BOOLEAN_TYPES, ATHENA_DATETIME_TYPES, ATHENA_INTEGER_TYPES, \
+    ATHENA_REAL_TYPES, comparable_value
+
+# how the partial aggregates of each partition are merged client-side
+PARTIAL_MERGES = {
+    'sum': 'sum',
+    'count': 'sum',
+    'min': 'min',
+    'max': 'max'
+}
+# Presto types of the serialised sketches that are merged by a query
+SKETCH_TYPES = {
+    'hll': 'HyperLogLog',
+    'qdigest': 'qdigest(double)'
+}
+
+
+class IncrementalAthenaFrame(object):
+
+    def __init__(
+            self,
+            frame: 'AthenaFrame',
+            store: Optional[PartialAggregateStore] = None,
+            recompute_last: int = 0
+    ):
+        """
+        Create a new IncrementalAthenaFrame.
+
+        Computes aggregates of an append-only partitioned table from partial
+        aggregates of each partition, which are stored locally so that each
+        call only queries the partitions that are new since the last one e.g.
+
+            daily = frame.where(...).incremental()
+            daily.sum_by_group('amount', 'country')
+
+        Sums, counts, minimums, maximums and means are merged client-side.
+        Distinct counts and percentiles are merged from HyperLogLog and
+        quantile digest sketches, so they are always approximate. Athena's
+        serialised sketches can't be merged client-side, so they are merged
+        with queries over the stored sketches. These don't read the table, but
+        each distinct count or percentile call runs at least one more query,
+        which may be billed Athena's minimum of 10 MB scanned.
+
+        Partitions that are rewritten are not detected; use recompute_last for
+        partitions that are still being written, or invalidate the store.
+
+        :param frame: The AthenaFrame to aggregate. Must be over a partitioned
+                      table and have no limit.
+        :param store: Store for the partial aggregates. Defaults to a new
+                      PartialAggregateStore in the default directory.
+        :param recompute_last: Number of the latest partitions, in order of
+                               their partition values, to query again on every
+                               call e.g. 1 for today's partition.
+        """
+        if frame._limit is not None:
+            raise ValueError('Incremental aggregates can not have a limit')
+        if recompute_last < 0:
+            raise ValueError('recompute_last must not be negative')
+        if store is None:
+            store = PartialAggregateStore()
+        self._frame = frame
+        self._store: PartialAggregateStore = store
+        self._recompute_last: int = recompute_last
+
+    @property
+    def frame(self) -> 'AthenaFrame':
+        return self._frame
+
+    @property
+    def store(self) -> PartialAggregateStore:
+        return self._store
+
+    # region partitions
+
+    @staticmethod
+    def _literal(value: Any, data_type: str) -> str:
+        """
+        Render a partition value as a SQL literal of the partition key's type.
+        """
+        data_type = data_type.split('(')[0].lower()
+        if data_type in (
+                ATHENA_INTEGER_TYPES + ATHENA_REAL_TYPES + ATHENA_BOOLEAN_TYPES
+        ):
+            return str(value)
+        if data_type in ATHENA_DATETIME_TYPES:
+            return f"{data_type} '{value}'"
+        return "'" + str(value).replace("'", "''") + "'"
+
+    @property
+    def _partition_types(self) -> Dict[str, str]:
+        """
+        Data types of the partition keys of the table.
+        """
+        column_info = self._frame._table_column_info()
+        data_types = column_info.set_index('column_name')['data_type']
+        return {
+            column: data_types[column]
+            for column in self._frame.partition_columns
+        }
+
+    def _partition_key(
+            self,
+            values: Tuple[Any, ...],
+            partition_types: Dict[str, str]
+    ) -> Tuple[str, ...]:
+        """
+        Return the canonical key of a partition from its partition values.
+        """
+        return tuple(
+            str(comparable_value(value, data_type))
+            for value, data_type in zip(values, partition_types.values())
+        )
+
+    def _partition_predicate(
+            self,
+            partitions: List[Tuple[Any, ...]],
+            partition_types: Dict[str, str]
+    ) -> str:
+        """
+        Return a condition selecting the given partitions.
+        """
+        columns = list(partition_types.keys())
+        if len(columns) == 1:
+            column = columns[0]
+            return f'{column} IN (' + ', '.join(
+                self._literal(values[0], partition_types[column])
+                for values in partitions
+            ) + ')'
+        return ' OR '.join(
+            '(' + ' AND '.join(
+                f'{column} = {self._literal(value, partition_types[column])}'
+                for column, value in zip(columns, values)
+            ) + ')'
+            for values in partitions
+        )
+
+    # endregion
+
+    # region partial aggregates
+
+    def _partial_expression(self, kind: str, column: str) -> str:
+        """
+        Return the SQL of a partial aggregate of a column.
+        """
+        if kind == 'hll':
+            if self._frame._max_standard_error is not None:
+                sketch = (
+                    f'approx_set({column}, '
+                    f'{self._frame._max_standard_error})'
+                )
+            else:
+                sketch = f'approx_set({column})'
+        elif kind == 'qdigest':
+            sketch = f'qdigest_agg(CAST({column} AS double))'
+        else:
+            return f'{kind}({column})'
+        return f'to_base64(CAST({sketch} AS varbinary))'
+
+    @staticmethod
+    def _alias(kind: str, column: str) -> str:
+
+        return f'{kind}__{column}'
+
+    def _signature(
+            self,
+            measures: List[Tuple[str, str]],
+            group_columns: List[str]
+    ) -> dict:
+        """
+        Return the description of an aggregation that its partial aggregates
+        are stored under.
+        """
+        frame = self._frame
+        return dict(
+            database=frame._database,
+            table=frame._table,
+            where=None if frame._where is None else frame._where.canonical,
+            sample=None if frame._sample is None else list(frame._sample),
+            group_columns=group_columns,
+            measures=sorted([list(measure) for measure in measures]),
+            max_standard_error=frame._max_standard_error
+        )
+
+    def _partials(
+            self,
+            measures: List[Tuple[str, str]],
+            group_columns: List[str]
+    ) -> DataFrame:
+        """
+        Return the partial aggregates of every current partition, querying
+        only the partitions that have none stored and storing theirs.
+
+        :param measures: Kinds of partial aggregate and the columns to compute
+                         them for e.g. [('sum', 'col_a'), ('hll', 'col_b')]
+        :param group_columns: Columns to group by within each partition.
+        """
+        frame = self._frame
+        partition_types = self._partition_types
+        if len(partition_types) == 0:
+            raise ValueError(
+                f'Incremental aggregates need a partitioned table but '
+                f'{frame.database}.{frame.table} has no partition columns'
+            )
+        partition_columns = list(partition_types.keys())
+        listing = frame.partitions(refresh=True)
+        current = {
+            self._partition_key(values, partition_types): values
+            for values in listing[partition_columns].itertuples(
+                index=False, name=None
+            )
+        }
+        signature = self._signature(measures, group_columns)
+        stored, partials = self._store.get(signature)
+        columns = partition_columns + group_columns + [
+            self._alias(kind, column) for kind, column in measures
+        ]
+        if partials is None:
+            partials = DataFrame(columns=columns)
+        if self._recompute_last > 0:
+            latest = sorted(current.values(), key=lambda values: tuple(
+                comparable_value(value, data_type)
+                for value, data_type in zip(values, partition_types.values())
+            ))[-self._recompute_last:]
+            recompute = {
+                self._partition_key(values, partition_types)
+                for values in latest
+            }
+            stored = [key for key in stored if key not in recompute]
+        stored = [key for key in stored if key in current]
+        stored_keys = set(stored)
+        missing = [key for key in current.keys() if key not in stored_keys]
+        partials = partials.loc[[
+            key in stored_keys
+            for key in partials[partition_columns].itertuples(
+                index=False, name=None
+            )
+        ]]
+        if len(missing) > 0:
+            new_partials = self._query_partials(
+                partitions=[current[key] for key in missing],
+                partition_types=partition_types,
+                measures=measures,
+                group_columns=group_columns
+            )
+            partials = concat(
+                [data for data in (partials, new_partials) if len(data) > 0]
+                or [partials]
+            ).reset_index(drop=True)
+            self._store.put(
+                signature=signature,
+                partitions=stored + missing,
+                partials=partials
+            )
+        return partials
+
+    def _query_partials(
+            self,
+            partitions: List[Tuple[Any, ...]],
+            partition_types: Dict[str, str],
+            measures: List[Tuple[str, str]],
+            group_columns: List[str]
+    ) -> DataFrame:
+        """
+        Query the partial aggregates of the given partitions, in as many
+        queries as are needed to keep each within the frame's
+        max_query_length, with the partition values made canonical.
+        """
+        frame = self._frame.with_partition_policy('ignore')
+        partition_columns = list(partition_types.keys())
+        columns = partition_columns + group_columns + [
+            self._alias(kind, column) for kind, column in measures
+        ]
+
+        def render(chunk: List[Tuple[Any, ...]]) -> str:
+            return frame._q.partial_aggregates(
+                expressions=[
+                    (self._partial_expression(kind, column),
+                     self._alias(kind, column))
+                    for kind, column in measures
+                ],
+                group_columns=partition_columns + group_columns,
+                partition_predicate=self._partition_predicate(
+                    chunk, partition_types
+                ),
+                database=frame._database,
+                table=frame._table,
+                sample=frame._sample,
+                where=frame._where
+            )
+
+        def shape(data: DataFrame) -> DataFrame:
+            data = data[columns].copy()
+            for column, data_type in partition_types.items():
+                data[column] = [
+                    str(comparable_value(value, data_type))
+                    for value in data[column]
+                ]
+            return data
+
+        chunks = chunk_columns(
+            columns=partitions,
+            render=render,
+            max_length=frame.max_query_length,
+            max_columns=len(partitions)
+        )
+        return frame._run_plan(AthenaQueryPlan(
+            queries=[
+                AthenaQuery(sql=render(chunk), shape=shape)
+                for chunk in chunks
+            ],
+            combine=lambda results: concat(results).reset_index(drop=True)
+        ))
+
+    # endregion
+
+    # region merging
+
+    def _merge(
+            self,
+            partials: DataFrame,
+            measures: List[Tuple[str, str]],
+            group_columns: List[str]
+    ) -> DataFrame:
+        """
+        Merge the partial sums, counts, minimums and maximums of every
+        partition, for each group if there are group columns.
+        """
+        aliases = {
+            self._alias(kind, column): PARTIAL_MERGES[kind]
+            for kind, column in measures
+        }
+        if len(partials) == 0:
+            partials = DataFrame(columns=list(aliases.keys()) + group_columns)
+        # sums and counts are numeric, keeping integers exact, while minimums
+        # and maximums keep the type of the column e.g. varchar or date
+        values = DataFrame({
+            alias: (
+                to_numeric(partials[alias]) if merge == 'sum'
+                else partials[alias]
+            )
+            for alias, merge in aliases.items()
+        }, index=partials.index)
+        if len(group_columns) == 0:
+            return DataFrame([{
+                alias: (
+                    values[alias].sum(min_count=1) if merge == 'sum'
+                    else getattr(values[alias], merge)()
+                )
+                for alias, merge in aliases.items()
+            }])
+        values[group_columns] = partials[group_columns]
+        grouped = values.groupby(group_columns, dropna=False)
+        return DataFrame({
+            alias: (
+                grouped[alias].sum(min_count=1) if merge == 'sum'
+                else getattr(grouped[alias], merge)()
+            )
+            for alias, merge in aliases.items()
+        })
+
+    @staticmethod
+    def _sketch_literal(value: Any) -> str:
+
+        if value is None or value != value:
+            return 'CAST(NULL AS varchar)'
+        return f"'{value}'"
+
+    def _merge_sketches(
+            self,
+            partials: DataFrame,
+            measures: List[Tuple[str, str]],
+            finals: List[Tuple[str, str]]
+    ) -> Series:
+        """
+        Merge the sketches of every partition with queries over their
+        serialised values, and return the final values.
+
+        Each serialised sketch is several KB long, so the measures are split
+        into chunks that are merged separately, and the sketches of each
+        chunk are reduced in chunks of partitions, so that every query is
+        within the frame's max_query_length.
+
+        :param partials: Partial aggregates with a sketch column per measure.
+        :param measures: Kinds of sketch and the columns they were computed
+                         for.
+        :param finals: Expression of the final value of each measure, with {}
+                       in place of its merged sketch, and its alias.
+        """
+        frame = self._frame
+        aliases = [self._alias(kind, column) for kind, column in measures]
+        merged = {
+            alias: f'merge(CAST(from_base64({alias}) AS {SKETCH_TYPES[kind]}))'
+            for alias, (kind, _) in zip(aliases, measures)
+        }
+        reduce_expressions = {
+            alias: (f'to_base64(CAST({merged[alias]} AS varbinary))', alias)
+            for alias in aliases
+        }
+        final_expressions = {
+            alias: (expression.format(merged[alias]), final_alias)
+            for (expression, final_alias), alias in zip(finals, aliases)
+        }
+        literals = DataFrame({
+            alias: [self._sketch_literal(value) for value in partials[alias]]
+            for alias in aliases
+        }) if len(partials) > 0 else DataFrame([{
+            alias: self._sketch_literal(None) for alias in aliases
+        }])
+
+        def render(
+                expressions: Dict[str, Tuple[str, str]],
+                columns: List[str],
+                rows: List[List[str]]
+        ) -> str:
+            return frame._q.merge_sketches(
+                expressions=[expressions[column] for column in columns],
+                columns=columns,
+                rows=rows
+            )
+
+        def merge(columns: List[str]) -> Series:
+            rows = literals[columns].values.tolist()
+            while len(rows) > 1 and len(
+                    render(final_expressions, columns, rows).encode('utf-8')
+            ) > frame.max_query_length:
+                chunks = chunk_columns(
+                    columns=rows,
+                    render=lambda chunk: render(
+                        reduce_expressions, columns, chunk
+                    ),
+                    max_length=frame.max_query_length,
+                    max_columns=len(rows)
+                )
+                if len(chunks) == len(rows):
+                    raise ValueError(
+                        'max_query_length is too short to merge the sketches '
+                        'of more than one partition in a query'
+                    )
+                reduced = frame._run_plan(AthenaQueryPlan(
+                    queries=[
+                        AthenaQuery(
+                            sql=render(reduce_expressions, columns, chunk)
+                        )
+                        for chunk in chunks
+                    ],
+                    combine=lambda results: concat(results)
+                ))
+                rows = [
+                    [self._sketch_literal(value) for value in row]
+                    for row in reduced[columns].itertuples(
+                        index=False, name=None
+                    )
+                ]
+            return frame._run(AthenaQuery(
+                sql=render(final_expressions, columns, rows),
+                shape=lambda data: data.iloc[0]
+            ))
+
+        # chunk the measures so that the longest sketches of any two
+        # partitions can be reduced in one query
+        widest = {
+            alias: max(literals[alias], key=len) for alias in aliases
+        }
+        num_rows = min(len(literals), 2)
+        measure_chunks = chunk_columns(
+            columns=aliases,
+            render=lambda chunk: render(
+                reduce_expressions if num_rows > 1 else final_expressions,
+                chunk,
+                [[widest[alias] for alias in chunk]] * num_rows
+            ),
+            max_length=frame.max_query_length,
+            max_columns=len(aliases)
+        )
+        return concat([merge(chunk) for chunk in measure_chunks])
+
+    # endregion
+
+    # region aggregates
+
+    def _agg(self, agg_name: str, columns: List[str]) -> Series:
+        """
+        Return the merged aggregate of each column over every partition.
+        """
+        kinds = ['sum', 'count'] if agg_name == 'mean' else [agg_name]
+        measures = [(kind, column) for column in columns for kind in kinds]
+        merged = self._merge(self._partials(measures, []), measures, [])
+        return self._finalise(merged, agg_name, columns).iloc[0]
+
+    def _finalise(
+            self,
+            merged: DataFrame,
+            agg_name: str,
+            columns: List[str]
+    ) -> DataFrame:
+        """
+        Turn merged partial aggregates into the aggregate of each column.
+        """
+        if agg_name == 'mean':
+            return DataFrame({
+                column: (
+                    merged[self._alias('sum', column)] /
+                    merged[self._alias('count', column)]
+                )
+                for column in columns
+            }, index=merged.index)
+        return DataFrame({
+            column: merged[self._alias(agg_name, column)]
+            for column in columns
+        }, index=merged.index)
+
+    def max(self) -> Series:
+        """
+        Return the maximum of the values.
+        """
+        return self._agg('max', self._frame.columns.to_list())
+
+    def mean(self) -> Series:
+        """
+        Return the mean of the values.
+        """
+        return self._agg('mean', self._frame.columns.to_list())
+
+    def min(self) -> Series:
+        """
+        Return the minimum of the values.
+        """
+        return self._agg('min', self._frame.columns.to_list())
+
+    def sum(self) -> Series:
+        """
+        Return the sum of the values.
+        """
+        return self._agg('sum', self._frame.columns.to_list())
+
+    def count(self) -> Series:
+        """
+        Return the number of non-null values.
+        """
+        return self._agg('count', self._frame.columns.to_list())
+
+    def _agg_by_group(
+            self,
+            agg_name: str,
+            agg_columns: Union[str, List[str]],
+            group_columns: Union[str, List[str]]
+    ) -> Union[DataFrame, Series]:
+        """
+        Aggregate one or more columns over grouping of one or more other
+        columns.
+
+        Returns a Series if there is only one aggregate column, otherwise a
+        DataFrame.
+        """
+        columns = [agg_columns] if isinstance(agg_columns, str) \
+            else agg_columns
+        groups = [group_columns] if isinstance(group_columns, str) \
+            else group_columns
+        kinds = ['sum', 'count'] if agg_name == 'mean' else [agg_name]
+        measures = [(kind, column) for column in columns for kind in kinds]
+        merged = self._merge(
+            self._partials(measures, groups), measures, groups
+        )
+        return self._finalise(merged, agg_name, columns)[agg_columns]
+
+    def sum_by_group(
+            self,
+            sum_columns: Union[str, List[str]],
+            group_columns: Union[str, List[str]]
+    ) -> Union[DataFrame, Series]:
+        """
+        Sum one or more columns over grouping of one or more other columns.
+
+        :param sum_columns: Columns to sum.
+        :param group_columns: Columns to group by.
+        """
+        return self._agg_by_group('sum', sum_columns, group_columns)
+
+    def min_by_group(
+            self,
+            min_columns: Union[str, List[str]],
+            group_columns: Union[str, List[str]]
+    ) -> Union[DataFrame, Series]:
+        """
+        Take min of one or more columns over grouping of one or more other
+        columns.
+
+        :param min_columns: Columns to take min of.
+        :param group_columns: Columns to group by.
+        """
+        return self._agg_by_group('min', min_columns, group_columns)
+
+    def max_by_group(
+            self,
+            max_columns: Union[str, List[str]],
+            group_columns: Union[str, List[str]]
+    ) -> Union[DataFrame, Series]:
+        """
+        Take max of one or more columns over grouping of one or more other
+        columns.
+
+        :param max_columns: Columns to take max of.
+        :param group_columns: Columns to group by.
+        """
+        return self._agg_by_group('max', max_columns, group_columns)
+
+    def mean_by_group(
+            self,
+            mean_columns: Union[str, List[str]],
+            group_columns: Union[str, List[str]]
+    ) -> Union[DataFrame, Series]:
+        """
+        Take mean of one or more columns over grouping of one or more other
+        columns.
+
+        :param mean_columns: Columns to take mean of.
+        :param group_columns: Columns to group by.
+        """
+        return self._agg_by_group('mean', mean_columns, group_columns)
+
+    # endregion
+
+    # region sketches
+
+    def count_distinct(self) -> Series:
+        """
+        Count the approximate number of distinct elements, by merging the
+        HyperLogLog sketch of each partition with a query over the stored
+        sketches.
+        """
+        columns = self._frame.columns.to_list()
+        measures = [('hll', column) for column in columns]
+        result = self._merge_sketches(
+            partials=self._partials(measures, []),
+            measures=measures,
+            finals=[('cardinality({})', column) for column in columns]
+        )
+        return self._frame._label_approximate(result, True)
+
+    def approx_percentile(
+            self,
+            columns: Union[str, List[str]],
+            percentile: Union[float, List[float]]
+    ) -> Union[DataFrame, Series]:
+        """
+        Returns the approximate percentile of each column, by merging the
+        quantile digest of each partition with a query over the stored
+        sketches.
+
+        If a list of percentiles is given, returns a DataFrame with a row for
+        each column and a column for each percentile.
+
+        :param columns: Columns to find percentile of.
+        :param percentile: Percentile value, or list of values, to find.
+        """
+        if isinstance(columns, str):
+            columns = [columns]
+        percentiles = percentile if isinstance(percentile, list) \
+            else [percentile]
+        measures = [('qdigest', column) for column in columns]
+        result = self._merge_sketches(
+            partials=self._partials(measures, []),
+            measures=measures,
+            finals=[
+                (
+                    'values_at_quantiles({}, ' +
+                    self._frame._q._percentile_arg(percentiles) + ')',
+                    column
+                )
+                for column in columns
+            ]
+        )
+        values = DataFrame(
+            data=[
+                self._frame._unpack_array(result[column]) for column in columns
+            ],
+            index=Index(columns, name='column'),
+            columns=Index(percentiles, name='percentile')
+        )
+        if not isinstance(percentile, list):
+            return DataFrame([values[percentile].to_list()], columns=columns)
+        return values
+
+    # endregion
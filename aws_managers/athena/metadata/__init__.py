@@ -0,0 +1,3 @@
+from aws_managers.athena.metadata.glue_metadata_backend import \
+    GlueMetadataBackend
+from aws_managers.athena.metadata.metadata_backend import MetadataBackend
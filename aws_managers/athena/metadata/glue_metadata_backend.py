@@ -0,0 +1,147 @@
+from typing import List, Optional
+
+from boto3 import client
+from botocore.client import BaseClient
+from pandas import DataFrame
+
+from aws_managers.athena.metadata.metadata_backend import MetadataBackend
+
+# Hive DDL type names that Athena reports differently in information_schema
+GLUE_TYPE_TO_ATHENA_TYPE = {
+    'string': 'varchar',
+    'int': 'integer',
+    'float': 'real',
+    'binary': 'varbinary'
+}
+COLUMN_INFO_COLUMNS = [
+    'table_catalog', 'table_schema', 'table_name', 'column_name',
+    'ordinal_position', 'column_default', 'is_nullable', 'data_type',
+    'comment', 'extra_info'
+]
+
+
+class GlueMetadataBackend(MetadataBackend):
+    """
+    Reads table schemas directly from the Glue Data Catalog instead of running
+    an Athena query on information_schema.
+
+    https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/glue.html
+    """
+    def __init__(
+            self,
+            glue_client: Optional[BaseClient] = None,
+            catalog_id: Optional[str] = None
+    ):
+        """
+        Create a new GlueMetadataBackend.
+
+        :param glue_client: Optional boto3 Glue client e.g. one wrapped in a
+                            botocore Stubber. Defaults to a new client.
+        :param catalog_id: Optional ID of the Data Catalog. Defaults to the AWS
+                           account ID.
+        """
+        if glue_client is None:
+            glue_client = client('glue')
+        self._client: BaseClient = glue_client
+        self._catalog_id: Optional[str] = catalog_id
+
+    @property
+    def _catalog_kwargs(self) -> dict:
+        if self._catalog_id is None:
+            return {}
+        return dict(CatalogId=self._catalog_id)
+
+    @staticmethod
+    def _table_rows(database: str, table: dict) -> List[dict]:
+        """
+        Convert a Glue table definition to column info rows, with partition
+        keys after the regular columns as in information_schema.
+        """
+        columns = [
+            (column, None)
+            for column in table.get('StorageDescriptor', {}).get('Columns', [])
+        ] + [
+            (column, 'partition key')
+            for column in table.get('PartitionKeys', [])
+        ]
+        return [
+            dict(
+                table_catalog='awsdatacatalog',
+                table_schema=database,
+                table_name=table['Name'],
+                column_name=column['Name'],
+                ordinal_position=position,
+                column_default=None,
+                is_nullable='YES',
+                data_type=GLUE_TYPE_TO_ATHENA_TYPE.get(
+                    column['Type'], column['Type']
+                ),
+                comment=column.get('Comment'),
+                extra_info=extra_info
+            )
+            for position, (column, extra_info) in enumerate(columns, start=1)
+        ]
+
+    def column_info(self, database: str, table: str) -> DataFrame:
+        """
+        Return column info for a single table using glue.get_table
+
+        :param database: Name of the database.
+        :param table: Name of the table.
+        """
+        response = self._client.get_table(
+            DatabaseName=database, Name=table, **self._catalog_kwargs
+        )
+        return DataFrame(
+            data=self._table_rows(database, response['Table']),
+            columns=COLUMN_INFO_COLUMNS
+        )
+
+    def column_infos(self, database: str) -> DataFrame:
+        """
+        Return column info for every table in a database using paginated
+        glue.get_tables calls.
+
+        :param database: Name of the database.
+        """
+        rows = []
+        kwargs = dict(DatabaseName=database, **self._catalog_kwargs)
+        response: dict = self._client.get_tables(**kwargs)
+        for table in response['TableList']:
+            rows.extend(self._table_rows(database, table))
+        while 'NextToken' in response.keys():
+            response = self._client.get_tables(
+                NextToken=response['NextToken'], **kwargs
+            )
+            for table in response['TableList']:
+                rows.extend(self._table_rows(database, table))
+        return DataFrame(data=rows, columns=COLUMN_INFO_COLUMNS)
+
+    def partitions(
+            self,
+            database: str,
+            table: str,
+            partition_columns: List[str]
+    ) -> DataFrame:
+        """
+        Return the partitions of a table using paginated glue.get_partitions
+        calls. Values are returned as strings.
+
+        :param database: Name of the database.
+        :param table: Name of the table.
+        :param partition_columns: Names of the table's partition keys, in
+                                  order.
+        """
+        kwargs = dict(
+            DatabaseName=database, TableName=table, **self._catalog_kwargs
+        )
+        response: dict = self._client.get_partitions(**kwargs)
+        rows = [partition['Values'] for partition in response['Partitions']]
+        while 'NextToken' in response.keys():
+            response = self._client.get_partitions(
+                NextToken=response['NextToken'], **kwargs
+            )
+            rows.extend(
+                partition['Values'] for partition in response['Partitions']
+            )
+        return DataFrame(data=rows, columns=partition_columns)
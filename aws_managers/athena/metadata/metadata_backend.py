@@ -0,0 +1,47 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from pandas import DataFrame
+
+
+class MetadataBackend(ABC):
+    """
+    Source of table schemas in the same shape as the information_schema query
+    rendered by AthenaQueryGenerator.column_info
+    """
+    @abstractmethod
+    def column_info(self, database: str, table: str) -> DataFrame:
+        """
+        Return column info for a single table.
+
+        :param database: Name of the database.
+        :param table: Name of the table.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def column_infos(self, database: str) -> DataFrame:
+        """
+        Return column info for every table in a database.
+
+        :param database: Name of the database.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def partitions(
+            self,
+            database: str,
+            table: str,
+            partition_columns: List[str]
+    ) -> DataFrame:
+        """
+        Return the partitions of a table, with a column for each partition key
+        and a row for each partition.
+
+        :param database: Name of the database.
+        :param table: Name of the table.
+        :param partition_columns: Names of the table's partition keys, in
+                                  order.
+        """
+        raise NotImplementedError
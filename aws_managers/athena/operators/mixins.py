@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Set
 
 
 class ComparisonMixin(object):
@@ -10,3 +10,37 @@ class ComparisonMixin(object):
         self.column: str = column
         self.operator: str = operator
         self.value: Any = value
+
+    def simplify(self) -> 'ComparisonMixin':
+        """
+        Return the simplest equivalent predicate. Comparisons are already as
+        simple as they can be.
+        """
+        return self
+
+    def columns(self) -> Set[str]:
+        """
+        Return the names of the columns that the predicate refers to.
+        """
+        return {str(self.column)}
+
+    def _compact(self) -> str:
+
+        return str(self)
+
+    @property
+    def canonical(self) -> str:
+        """
+        Canonical SQL of the predicate, identical for equivalent predicates.
+        """
+        return self._compact()
+
+    def __eq__(self, other) -> bool:
+
+        if not isinstance(other, ComparisonMixin):
+            return NotImplemented
+        return self.canonical == other.canonical
+
+    def __hash__(self) -> int:
+
+        return hash(self.canonical)
@@ -5,3 +5,5 @@ from aws_managers.athena.queries.real_column_query import RealColumnQuery
 from aws_managers.athena.queries.string_column_query import StringColumnQuery
 from aws_managers.athena.queries.timestamp_column_query import \
     TimestampColumnQuery
+from aws_managers.athena.queries.athena_query import AthenaQuery
+from aws_managers.athena.queries.athena_query_plan import AthenaQueryPlan
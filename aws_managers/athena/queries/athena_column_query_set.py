@@ -1,43 +1,88 @@
+from typing import Dict, Iterator, List, Type
+
 from pandas import DataFrame
 
 from aws_managers.athena.reference.athena_data_types import \
     ATHENA_BOOLEAN_TYPES, ATHENA_INTEGER_TYPES, ATHENA_REAL_TYPES, \
     ATHENA_CHARACTER_TYPES, ATHENA_DATETIME_TYPES
 from aws_managers.athena.queries import \
-    BooleanColumnQuery, IntegerColumnQuery, RealColumnQuery, \
+    BooleanColumnQuery, ColumnQuery, IntegerColumnQuery, RealColumnQuery, \
     StringColumnQuery, TimestampColumnQuery
 
+COLUMN_QUERY_TYPES: Dict[str, Type[ColumnQuery]] = {
+    **{data_type: BooleanColumnQuery for data_type in ATHENA_BOOLEAN_TYPES},
+    **{data_type: IntegerColumnQuery for data_type in ATHENA_INTEGER_TYPES},
+    **{data_type: RealColumnQuery for data_type in ATHENA_REAL_TYPES},
+    **{data_type: StringColumnQuery for data_type in ATHENA_CHARACTER_TYPES},
+    **{data_type: TimestampColumnQuery for data_type in ATHENA_DATETIME_TYPES}
+}
+
 
 class AthenaColumnQuerySet(object):
 
+    __slots__ = ('_column_info', '_types', '_queries')
+
     def __init__(self, column_info: DataFrame):
         """
         Create a new set of Athena columns for interactive querying.
 
+        Columns are indexed by name and their column queries are only created
+        when first accessed, as attributes or items, so building a set for a
+        very wide table is cheap. Columns whose names clash with attributes of
+        the set, or start with an underscore, can be accessed as items.
+
         :param column_info: see AthenaQueryGenerator.column_info
         """
         self._column_info: DataFrame = column_info
-        for _, row in column_info.iterrows():
-            name = row['column_name']
-            data_type = row['data_type']
-            try:
-                if data_type in ATHENA_BOOLEAN_TYPES:
-                    setattr(self, name, BooleanColumnQuery(name))
-                elif data_type in ATHENA_INTEGER_TYPES:
-                    setattr(self, name, IntegerColumnQuery(name))
-                elif data_type in ATHENA_REAL_TYPES:
-                    setattr(self, name, RealColumnQuery(name))
-                elif data_type in ATHENA_CHARACTER_TYPES:
-                    setattr(self, name, StringColumnQuery(name))
-                elif data_type in ATHENA_DATETIME_TYPES:
-                    setattr(self, name, TimestampColumnQuery(name))
-                else:
-                    print(
-                        f'Warning - no matching column for '
-                        f'data-type {data_type}'
-                    )
-            except TypeError:
-                print(
-                    f'Warning - could not set dynamic property for '
-                    f'{name}'
-                )
+        self._types: Dict[str, Type[ColumnQuery]] = {}
+        self._queries: Dict[str, ColumnQuery] = {}
+        for name, data_type in zip(
+                column_info['column_name'], column_info['data_type']
+        ):
+            query_type = COLUMN_QUERY_TYPES.get(data_type)
+            if query_type is None:
+                print(f'Warning - no matching column for data-type {data_type}')
+                continue
+            self._types[name] = query_type
+
+    @property
+    def names(self) -> List[str]:
+        """
+        Names of the columns in the set.
+        """
+        return list(self._types.keys())
+
+    def __getitem__(self, name: str) -> ColumnQuery:
+
+        query = self._queries.get(name)
+        if query is None:
+            query = self._types[name](name)
+            self._queries[name] = query
+        return query
+
+    def __getattr__(self, name: str) -> ColumnQuery:
+
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(
+                f'{type(self).__name__} has no column {name!r}'
+            ) from None
+
+    def __dir__(self) -> List[str]:
+
+        return list(super().__dir__()) + self.names
+
+    def __contains__(self, name: str) -> bool:
+
+        return name in self._types
+
+    def __iter__(self) -> Iterator[ColumnQuery]:
+
+        return (self[name] for name in self._types)
+
+    def __len__(self) -> int:
+
+        return len(self._types)
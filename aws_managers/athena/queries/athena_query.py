@@ -0,0 +1,42 @@
+from typing import Any, Callable, Optional
+
+from pandas import DataFrame
+
+from aws_managers.athena.caching.query_descriptor import QueryDescriptor
+
+
+class AthenaQuery(object):
+
+    def __init__(
+            self,
+            sql: str,
+            shape: Optional[Callable[[DataFrame], Any]] = None,
+            descriptor: Optional[QueryDescriptor] = None
+    ):
+        """
+        Create a new AthenaQuery.
+
+        :param sql: Rendered SQL of the query.
+        :param shape: Optional function to turn the raw query result into the
+                      value returned to the caller.
+        :param descriptor: Optional description of the query if it is a basic
+                           selection, so that it can be answered from cached
+                           results that contain it.
+        """
+        self.sql: str = sql
+        self.shape: Optional[Callable[[DataFrame], Any]] = shape
+        self.descriptor: Optional[QueryDescriptor] = descriptor
+
+    def shape_result(self, data: DataFrame) -> Any:
+        """
+        Turn the raw result of the query into the value returned to the caller.
+
+        :param data: Raw result of the query.
+        """
+        if self.shape is None:
+            return data
+        return self.shape(data)
+
+    def __str__(self):
+
+        return self.sql
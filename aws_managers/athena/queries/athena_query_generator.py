@@ -1,6 +1,7 @@
+from pathlib import Path
 from typing import Dict, Optional, List, Union, Tuple
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import ChoiceLoader, Environment, FileSystemLoader, ModuleLoader
 
 from aws_managers.athena.reference.athena_ser_des import AthenaSerDes
 from aws_managers.athena.clauses.conjunctive_operators import \
@@ -10,11 +11,57 @@ from aws_managers.athena.operators.mixins import ComparisonMixin
 from aws_managers.paths.dirs import DIR_ATHENA_TEMPLATES
 
 
+# Shared by all generators. Templates are compiled on first use and cached for
+# the life of the process; jinja2 environments are safe to render from many
+# threads once configured.
+ATHENA_TEMPLATE_ENVIRONMENT = Environment(
+    loader=FileSystemLoader(DIR_ATHENA_TEMPLATES),
+    cache_size=-1,
+    auto_reload=False
+)
+
+
+def compile_templates(directory: Union[str, Path]):
+    """
+    Precompile the Athena templates to Python modules e.g. at build time, so
+    that they can be loaded with use_compiled_templates without parsing.
+
+    :param directory: Directory to write the compiled modules to.
+    """
+    ATHENA_TEMPLATE_ENVIRONMENT.compile_templates(
+        target=str(directory), zip=None, ignore_errors=False
+    )
+
+
+def use_compiled_templates(directory: Union[str, Path]):
+    """
+    Load templates from modules precompiled by compile_templates, falling
+    back to the template files for any that are missing.
+
+    :param directory: Directory containing the compiled modules.
+    """
+    ATHENA_TEMPLATE_ENVIRONMENT.loader = ChoiceLoader([
+        ModuleLoader(str(directory)),
+        FileSystemLoader(DIR_ATHENA_TEMPLATES)
+    ])
+    ATHENA_TEMPLATE_ENVIRONMENT.cache.clear()
+
+
 class AthenaQueryGenerator(object):
 
-    def __init__(self):
+    def __init__(self, env: Optional[Environment] = None):
+        """
+        Create a new AthenaQueryGenerator.
 
-        self.env = Environment(loader=FileSystemLoader(DIR_ATHENA_TEMPLATES))
+        Generators hold no state of their own, so frames share
+        ATHENA_QUERY_GENERATOR rather than creating one each.
+
+        :param env: Optional jinja2 environment to load templates from.
+                    Defaults to the shared ATHENA_TEMPLATE_ENVIRONMENT.
+        """
+        if env is None:
+            env = ATHENA_TEMPLATE_ENVIRONMENT
+        self.env: Environment = env
 
     def create_table(
         self,
@@ -67,6 +114,54 @@ class AthenaQueryGenerator(object):
         t = self.env.get_template('ddl/repair_table.jinja2')
         return t.render(database=database, table=table)
 
+    def create_table_as(
+            self,
+            database: str,
+            table: str,
+            query: str,
+            location: str,
+            format: str = 'PARQUET',
+            compression: str = 'SNAPPY',
+            partition_columns: Optional[List[str]] = None
+    ) -> str:
+        """
+        Create a table from the results of a query (CTAS), writing its data to
+        S3.
+
+        :param database: Name of the database to create the table in.
+        :param table: Name of the table to create.
+        :param query: SELECT query whose results will populate the table.
+        :param location: S3 location to write the table data to. Must be empty.
+        :param format: Storage format of the table data.
+        :param compression: Compression of the table data.
+        :param partition_columns: Optional names of columns to partition the
+                                  data by. Must be the last columns selected.
+        """
+        t = self.env.get_template('ddl/create_table_as.jinja2')
+        return t.render(
+            database=database,
+            table=table,
+            query=query.strip().rstrip(';'),
+            location=location,
+            format=format,
+            compression=compression,
+            partition_columns=partition_columns
+        )
+
+    def drop_table(
+            self,
+            database: str,
+            table: str
+    ) -> str:
+        """
+        Drop a table. The table data in S3 is not deleted.
+
+        :param database: Name of the database.
+        :param table: Name of the table.
+        """
+        t = self.env.get_template('ddl/drop_table.jinja2')
+        return t.render(database=database, table=table)
+
     def column_info(
             self,
             database: str,
@@ -87,6 +182,34 @@ class AthenaQueryGenerator(object):
         t = self.env.get_template('ddl/column_info.jinja2')
         return t.render(database=database, table=table)
 
+    def database_column_info(
+            self,
+            database: str
+    ) -> str:
+        """
+        Get info on the schema of every table in the database.
+
+        Returns the same columns as column_info.
+
+        :param database: Name of the database.
+        """
+        t = self.env.get_template('ddl/database_column_info.jinja2')
+        return t.render(database=database)
+
+    def partitions(
+            self,
+            database: str,
+            table: str
+    ) -> str:
+        """
+        List the partitions of a table, with a column for each partition key.
+
+        :param database: Name of the database.
+        :param table: Name of the table.
+        """
+        t = self.env.get_template('ddl/partitions.jinja2')
+        return t.render(database=database, table=table)
+
     def select(
             self,
             columns: Union[str, ColumnQuery, List[Union[str, ColumnQuery]]],
@@ -119,6 +242,34 @@ class AthenaQueryGenerator(object):
             limit=limit
         )
 
+    def explain(
+            self,
+            query: str,
+            type: str = 'DISTRIBUTED',
+            format: str = 'TEXT',
+            analyze: bool = False
+    ) -> str:
+        """
+        Show the execution plan of a query without running it, or run it and
+        show the plan with the cost of each operation if analyze is True.
+
+        https://docs.aws.amazon.com/athena/latest/ug/athena-explain-statement.html
+
+        :param query: SQL of the query to explain.
+        :param type: 'DISTRIBUTED' for the plan fragments, or 'IO' for the
+                     tables read, their constraints and their estimated size.
+                     Ignored by EXPLAIN ANALYZE.
+        :param format: Format of the plan e.g. 'TEXT' or 'JSON'.
+        :param analyze: Whether to run the query with EXPLAIN ANALYZE.
+        """
+        t = self.env.get_template('dml/explain.jinja2')
+        return t.render(
+            query=query.strip().rstrip(';'),
+            type=type,
+            format=format,
+            analyze=analyze
+        )
+
     def aggregate(
             self,
             agg_name: str,
@@ -154,6 +305,37 @@ class AthenaQueryGenerator(object):
             limit=limit
         )
 
+    def aggregate_expressions(
+            self,
+            expressions: List[Tuple[str, str]],
+            database: str,
+            table: str,
+            sample: Optional[Tuple[str, int]] = None,
+            where: Optional[Union[ComparisonMixin, ConjunctiveOperator]] = None,
+            limit: Optional[int] = None
+    ) -> str:
+        """
+        Compute several aggregate expressions in a single SELECT.
+
+        :param expressions: List of tuples of aggregate expression and alias
+                            e.g. [('max(col_a)', 'col_a__max')]
+        :param database: Name of the database.
+        :param table: Name of the table.
+        :param sample: Optional mapping of 'BERNOULLI' or 'SYSTEM' to an
+                       integer percentage.
+        :param where: Optional conditions to filter on.
+        :param limit: Optional limit for number of rows to return.
+        """
+        t = self.env.get_template('dml/aggregate_expressions.jinja2')
+        return t.render(
+            expressions=expressions,
+            database=database,
+            table=table,
+            sample=sample,
+            where=where,
+            limit=limit
+        )
+
     def aggregate_by_group(
             self,
             agg_name: str,
@@ -195,6 +377,42 @@ class AthenaQueryGenerator(object):
             limit=limit
         )
 
+    def aggregate_expressions_by_group(
+            self,
+            expressions: List[Tuple[str, str]],
+            group_columns: Union[str, List[str]],
+            database: str,
+            table: str,
+            sample: Optional[Tuple[str, int]] = None,
+            where: Optional[Union[ComparisonMixin, ConjunctiveOperator]] = None,
+            limit: Optional[int] = None
+    ) -> str:
+        """
+        Compute several aggregate expressions by group(s) in a single GROUP BY.
+
+        :param expressions: List of tuples of aggregate expression and alias
+                            e.g. [('max(col_a)', 'col_a__max')]
+        :param group_columns: Column or columns to group by.
+        :param database: Name of the database.
+        :param table: Name of the table.
+        :param sample: Optional mapping of 'BERNOULLI' or 'SYSTEM' to an
+                       integer percentage.
+        :param where: Optional conditions to filter on.
+        :param limit: Optional limit for number of rows to return.
+        """
+        if isinstance(group_columns, str):
+            group_columns = [group_columns]
+        t = self.env.get_template('dml/aggregate_expressions_by_group.jinja2')
+        return t.render(
+            expressions=expressions,
+            group_columns=group_columns,
+            database=database,
+            table=table,
+            sample=sample,
+            where=where,
+            limit=limit
+        )
+
     def count_distinct(
             self,
             columns: Union[str, ColumnQuery, List[Union[str, ColumnQuery]]],
@@ -202,7 +420,9 @@ class AthenaQueryGenerator(object):
             table: str,
             sample: Optional[Tuple[str, int]] = None,
             where: Optional[Union[ComparisonMixin, ConjunctiveOperator]] = None,
-            limit: Optional[int] = None
+            limit: Optional[int] = None,
+            approximate: bool = False,
+            max_standard_error: Optional[float] = None
     ) -> str:
         """
         Count the number of distinct values in each column.
@@ -215,6 +435,10 @@ class AthenaQueryGenerator(object):
         sample: Optional[Tuple[str, int]] = None,
         :param where: Optional conditions to filter on.
         :param limit: Optional limit for number of rows to return.
+        :param approximate: Whether to estimate the counts with approx_distinct
+                            instead of counting exactly.
+        :param max_standard_error: Optional maximum standard error of the
+                                   approximate counts.
         """
         if isinstance(columns, str) or isinstance(columns, ColumnQuery):
             columns = [columns]
@@ -225,7 +449,9 @@ class AthenaQueryGenerator(object):
             sample=sample,
             columns=columns,
             where=where,
-            limit=limit
+            limit=limit,
+            approximate=approximate,
+            max_standard_error=max_standard_error
         )
 
     def distinct(
@@ -356,10 +582,20 @@ class AthenaQueryGenerator(object):
             limit=limit
         )
 
+    @staticmethod
+    def _percentile_arg(percentile: Union[float, List[float]]) -> str:
+        """
+        Return the percentage argument of approx_percentile for a single value
+        or an ARRAY of values.
+        """
+        if isinstance(percentile, (list, tuple)):
+            return f"ARRAY[{', '.join(str(p) for p in percentile)}]"
+        return str(percentile)
+
     def approx_percentile(
             self,
             columns: Union[str, ColumnQuery, List[Union[str, ColumnQuery]]],
-            percentile: float,
+            percentile: Union[float, List[float]],
             database: str,
             table: str,
             sample: Optional[Tuple[str, int]] = None,
@@ -372,7 +608,9 @@ class AthenaQueryGenerator(object):
         one and must be constant for all input rows.
 
         :param columns: Name of the column(s) to find percentiles of.
-        :param percentile: Value of the percentile to calculate.
+        :param percentile: Value of the percentile to calculate, or a list of
+                           values to calculate in a single approx_percentile
+                           call per column.
         :param database: Name of the database.
         :param table: Name of the table.
         :param sample: Optional mapping of 'BERNOULLI' or 'SYSTEM' to an
@@ -385,7 +623,7 @@ class AthenaQueryGenerator(object):
         t = self.env.get_template('dml/approx_percentile.jinja2')
         return t.render(
             columns=columns,
-            percentile=percentile,
+            percentile=self._percentile_arg(percentile),
             database=database,
             table=table,
             sample=sample,
@@ -398,7 +636,7 @@ class AthenaQueryGenerator(object):
             percentile_columns: Union[
                 str, ColumnQuery, List[Union[str, ColumnQuery]]
             ],
-            percentile: float,
+            percentile: Union[float, List[float]],
             group_columns: Union[
                 str, ColumnQuery, List[Union[str, ColumnQuery]]
             ],
@@ -414,7 +652,9 @@ class AthenaQueryGenerator(object):
         between zero and one and must be constant for all input rows.
 
         :param percentile_columns: Name of the column(s) to find percentiles of.
-        :param percentile: Value of the percentile to calculate.
+        :param percentile: Value of the percentile to calculate, or a list of
+                           values to calculate in a single approx_percentile
+                           call per column.
         :param group_columns: Column or columns to group by.
         :param database: Name of the database.
         :param table: Name of the table.
@@ -437,10 +677,66 @@ class AthenaQueryGenerator(object):
         return t.render(
             percentile_columns=percentile_columns,
             group_columns=group_columns,
-            percentile=percentile,
+            percentile=self._percentile_arg(percentile),
             database=database,
             table=table,
             sample=sample,
             where=where,
             limit=limit
         )
+
+    def partial_aggregates(
+            self,
+            expressions: List[Tuple[str, str]],
+            group_columns: List[str],
+            partition_predicate: str,
+            database: str,
+            table: str,
+            sample: Optional[Tuple[str, int]] = None,
+            where: Optional[Union[ComparisonMixin, ConjunctiveOperator]] = None
+    ) -> str:
+        """
+        Compute partial aggregates for each group of a set of partitions, to be
+        stored and merged with those of other partitions.
+
+        :param expressions: Partial aggregate expressions and their aliases.
+        :param group_columns: Columns to group by, starting with the partition
+                              columns.
+        :param partition_predicate: Condition selecting the partitions.
+        :param database: Name of the database.
+        :param table: Name of the table.
+        :param sample: Optional mapping of 'BERNOULLI' or 'SYSTEM' to an
+                       integer percentage.
+        :param where: Optional conditions to filter on.
+        """
+        t = self.env.get_template('dml/partial_aggregates.jinja2')
+        return t.render(
+            expressions=expressions,
+            group_columns=group_columns,
+            partition_predicate=partition_predicate,
+            database=database,
+            table=table,
+            sample=sample,
+            where=where
+        )
+
+    def merge_sketches(
+            self,
+            expressions: List[Tuple[str, str]],
+            columns: List[str],
+            rows: List[List[str]]
+    ) -> str:
+        """
+        Merge serialised sketches given as literal values, without reading any
+        table.
+
+        :param expressions: Merge expressions over the columns and their
+                            aliases.
+        :param columns: Names of the columns of the values.
+        :param rows: Rows of SQL literals, one for each column.
+        """
+        t = self.env.get_template('dml/merge_sketches.jinja2')
+        return t.render(expressions=expressions, columns=columns, rows=rows)
+
+
+ATHENA_QUERY_GENERATOR = AthenaQueryGenerator()
@@ -0,0 +1,57 @@
+from typing import Any, Callable, List, Optional
+
+from pandas import DataFrame
+
+from aws_managers.athena.queries.athena_query import AthenaQuery
+
+
+class AthenaQueryPlan(object):
+
+    def __init__(
+            self,
+            queries: List[AthenaQuery],
+            combine: Optional[Callable[[List[Any]], Any]] = None
+    ):
+        """
+        Create a new AthenaQueryPlan.
+
+        A plan is the set of independent queries that a frame method runs,
+        which can be executed in any order or concurrently, and a function to
+        combine their shaped results into the value returned to the caller.
+
+        :param queries: The queries to run.
+        :param combine: Function to combine the shaped results of the queries,
+                        in the order the queries were given. Required for plans
+                        of more than one query.
+        """
+        if combine is None and len(queries) != 1:
+            raise ValueError('combine is required for plans of several queries')
+        self.queries: List[AthenaQuery] = queries
+        self.combine: Optional[Callable[[List[Any]], Any]] = combine
+
+    def shape_results(self, data: List[DataFrame]) -> Any:
+        """
+        Shape the raw result of each query and combine them into the value
+        returned to the caller.
+
+        :param data: Raw results of the queries, in the order of the queries.
+        """
+        results = [
+            query.shape_result(query_data)
+            for query, query_data in zip(self.queries, data)
+        ]
+        if self.combine is None:
+            return results[0]
+        return self.combine(results)
+
+    def __iter__(self):
+
+        return iter(self.queries)
+
+    def __len__(self) -> int:
+
+        return len(self.queries)
+
+    def __getitem__(self, item: int) -> AthenaQuery:
+
+        return self.queries[item]
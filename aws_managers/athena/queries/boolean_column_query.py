@@ -4,4 +4,4 @@ from aws_managers.athena.queries.column_query import ColumnQuery
 class BooleanColumnQuery(
     ColumnQuery
 ):
-    pass
+    __slots__ = ()
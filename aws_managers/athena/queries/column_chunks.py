@@ -0,0 +1,56 @@
+from math import ceil
+from typing import Callable, List
+
+# https://docs.aws.amazon.com/athena/latest/ug/service-limits.html
+MAX_QUERY_LENGTH = 262_144
+# bounds the work and result width of each query on very wide tables
+MAX_COLUMNS_PER_QUERY = 500
+
+
+def chunk_columns(
+        columns: List[str],
+        render: Callable[[List[str]], str],
+        max_length: int = MAX_QUERY_LENGTH,
+        max_columns: int = MAX_COLUMNS_PER_QUERY
+) -> List[List[str]]:
+    """
+    Split columns into the fewest roughly equal chunks, in order, whose
+    rendered queries are at most max_length bytes long and have at most
+    max_columns columns each. A column whose query is too long on its own is
+    returned in a chunk of its own.
+
+    :param columns: Names of the columns to split.
+    :param render: Function that renders the query for a list of columns.
+    :param max_length: Maximum length of each rendered query, in bytes.
+    :param max_columns: Maximum number of columns in each query.
+    """
+    if len(columns) <= 1:
+        return [columns]
+    length = len(render(columns).encode('utf-8'))
+    num_chunks = max(
+        ceil(length / max_length), ceil(len(columns) / max_columns), 1
+    )
+    if num_chunks == 1:
+        return [columns]
+    chunk_size = ceil(len(columns) / num_chunks)
+    chunks = []
+    for start in range(0, len(columns), chunk_size):
+        chunk = columns[start: start + chunk_size]
+        if len(chunk) == 1:
+            # a single column can't be split further, even if its query is
+            # too long, and halving it would leave an empty chunk
+            chunks.append(chunk)
+            continue
+        if len(render(chunk).encode('utf-8')) > max_length:
+            # column names vary in length so some chunks may still be too long
+            chunks.extend(chunk_columns(
+                columns=chunk[: len(chunk) // 2],
+                render=render, max_length=max_length, max_columns=max_columns
+            ))
+            chunks.extend(chunk_columns(
+                columns=chunk[len(chunk) // 2:],
+                render=render, max_length=max_length, max_columns=max_columns
+            ))
+        else:
+            chunks.append(chunk)
+    return chunks
@@ -8,6 +8,8 @@ class ColumnQuery(
     object
 ):
 
+    __slots__ = ('name',)
+
     def __init__(self, name: str):
 
         self.name: str = name
@@ -13,6 +13,8 @@ class IntegerColumnQuery(
     ColumnQuery
 ):
 
+    __slots__ = ()
+
     def __eq__(self, other: int) -> ScalarComparison:
         return ScalarComparison(str(self), '=', other)
 
@@ -12,4 +12,4 @@ class RealColumnQuery(
     ColumnQuery
 ):
 
-    pass
+    __slots__ = ()
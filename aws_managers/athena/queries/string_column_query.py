@@ -6,6 +6,8 @@ class StringColumnQuery(
     ColumnQuery
 ):
 
+    __slots__ = ()
+
     def __eq__(self, other: int) -> StringComparison:
         return StringComparison(self.name, '=', other)
 
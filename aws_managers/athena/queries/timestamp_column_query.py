@@ -9,6 +9,8 @@ class TimestampColumnQuery(
     ColumnQuery
 ):
 
+    __slots__ = ()
+
     @staticmethod
     def value(year: int, month: int, day: int,
               hour: int = 0, minute: int = 0, second: float = 0.0) -> str:
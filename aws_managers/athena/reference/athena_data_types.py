@@ -1,6 +1,10 @@
 """
 https://docs.aws.amazon.com/athena/latest/ug/data-types.html
 """
+from typing import Any
+
+from pandas import Timestamp
+
 ATHENA_BOOLEAN_TYPES = [
     'boolean'
 ]
@@ -30,3 +34,23 @@ ATHENA_NUMERIC_TYPES = (
     ATHENA_INTEGER_TYPES +
     ATHENA_REAL_TYPES
 )
+
+
+def comparable_value(value: Any, data_type: str) -> Any:
+    """
+    Convert a value of an Athena data type e.g. a partition value or an
+    EXPLAIN constraint bound to a Python value that compares the same way,
+    whether it was returned by a query, listed by a metadata backend or parsed
+    from a plan.
+
+    :param value: The value to convert.
+    :param data_type: Athena data type of the value e.g. 'decimal(10,2)'.
+    """
+    data_type = data_type.split('(')[0].lower()
+    if data_type in ATHENA_INTEGER_TYPES + ATHENA_REAL_TYPES:
+        return float(value)
+    if data_type in ATHENA_BOOLEAN_TYPES:
+        return str(value).lower()
+    if data_type in ATHENA_DATETIME_TYPES:
+        return Timestamp(value)
+    return str(value)
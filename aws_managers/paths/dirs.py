@@ -7,3 +7,7 @@ while DIR_PROJECT.name != 'aws_managers':
 
 DIR_TEMPLATES = DIR_PROJECT / 'templates'
 DIR_ATHENA_TEMPLATES = DIR_TEMPLATES / 'athena'
+
+DIR_CACHE = Path.home() / '.cache' / 'aws_managers'
+DIR_ATHENA_QUERY_CACHE = DIR_CACHE / 'athena' / 'queries'
+DIR_ATHENA_PARTIAL_AGGREGATES = DIR_CACHE / 'athena' / 'partial_aggregates'
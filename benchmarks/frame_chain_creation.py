@@ -0,0 +1,75 @@
+"""
+Benchmark the cost of building chains of AthenaFrames and rendering their SQL.
+
+No queries are run: the frames are given their column info up front and the
+SQL is captured rather than executed.
+
+    PYTHONPATH=. python benchmarks/frame_chain_creation.py
+"""
+from timeit import repeat
+
+from pandas import DataFrame
+
+from aws_managers.athena import AthenaFrame
+from aws_managers.athena.execution.execution_backend import ExecutionBackend
+
+N_COLUMNS = 50
+NUMBER = 1_000
+
+COLUMN_INFO = DataFrame({
+    'table_schema': 'database',
+    'table_name': 'table',
+    'column_name': [f'column_{i}' for i in range(N_COLUMNS)],
+    'ordinal_position': range(1, N_COLUMNS + 1),
+    'data_type': ['double', 'varchar'] * (N_COLUMNS // 2),
+    'extra_info': None
+})
+
+
+class NullBackend(ExecutionBackend):
+    """
+    Backend that fails if a query is run, as the benchmark only captures SQL.
+    """
+    def execute(self, sql: str, database: str) -> DataFrame:
+        raise RuntimeError(f'Unexpected query: {sql}')
+
+    def delete_data(self, location: str):
+        raise RuntimeError(f'Unexpected delete: {location}')
+
+
+BACKEND = NullBackend()
+
+
+def create_chain() -> AthenaFrame:
+    """
+    Build a frame and derive a chain of frames from it.
+    """
+    frame = AthenaFrame(
+        database='database', table='table',
+        column_info=COLUMN_INFO, backend=BACKEND
+    )
+    return frame.limit(100).bernoulli_sample(10)[
+        [f'column_{i}' for i in range(0, N_COLUMNS, 2)]
+    ]
+
+
+def create_chain_and_render():
+    """
+    Build a chain of frames and render the SQL of an aggregate.
+    """
+    create_chain()._capture('max')
+
+
+def main():
+
+    for name, func in (
+            ('create chain', create_chain),
+            ('create chain and render', create_chain_and_render)
+    ):
+        best = min(repeat(func, number=NUMBER, repeat=5)) / NUMBER
+        print(f'{name:<25} {best * 1e6:8.1f} us')
+
+
+if __name__ == '__main__':
+
+    main()
@@ -26,6 +26,9 @@ setup(
         'sagemaker',
         'tqdm'
     ],
+    extras_require={
+        'duckdb': ['duckdb']
+    },
     classifiers=[
       'Development Status :: 3 - Alpha',
       'Intended Audience :: Developers',
@@ -0,0 +1,93 @@
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+from pandas import DataFrame
+
+from aws_managers.athena.caching import QueryResultCache
+from aws_managers.athena.caching.schema_registry import \
+    PARTITION_REGISTRY, SCHEMA_REGISTRY
+from aws_managers.athena.execution import DuckDBBackend
+
+DAYS = ['2024-01-01', '2024-01-02', '2024-01-03']
+COUNTRIES = ['uk', 'us', 'fr']
+
+
+def write_partition(root: Path, day: str, offset: int = 0):
+    """
+    Write one day's partition of db.events under a local lake directory.
+
+    :param root: Root directory of the lake.
+    :param day: Value of the dt partition column.
+    :param offset: Number to add to the user ids and amounts so that
+                   partitions differ.
+    """
+    directory = root / 'db' / 'events' / f'dt={day}'
+    directory.mkdir(parents=True, exist_ok=True)
+    DataFrame({
+        'user': [(offset + i) % 50 for i in range(100)],
+        'amount': [(offset + i) * 0.5 for i in range(100)],
+        'country': [COUNTRIES[i % 3] for i in range(100)]
+    }).astype({'user': 'int32'}).to_parquet(directory / 'part.parquet')
+
+
+class CountingBackend(DuckDBBackend):
+    """
+    DuckDBBackend that records the queries it runs, other than schema lookups.
+    """
+    def __init__(self, root: Path):
+
+        super().__init__(root)
+        self.queries: List[str] = []
+
+    def execute(self, sql: str, database: str) -> DataFrame:
+
+        if 'information_schema' not in sql:
+            self.queries.append(sql)
+        return super().execute(sql=sql, database=database)
+
+
+@pytest.fixture(autouse=True)
+def clear_registries():
+    """
+    Stop schemas and partitions of one test's lake leaking into another's.
+    """
+    SCHEMA_REGISTRY.invalidate()
+    PARTITION_REGISTRY.invalidate()
+    yield
+    SCHEMA_REGISTRY.invalidate()
+    PARTITION_REGISTRY.invalidate()
+
+
+@pytest.fixture
+def lake(tmp_path: Path) -> Path:
+    """
+    Local lake with a db.events table partitioned by day.
+    """
+    root = tmp_path / 'lake'
+    for offset, day in enumerate(DAYS):
+        write_partition(root=root, day=day, offset=offset * 100)
+    return root
+
+
+@pytest.fixture
+def add_partition(lake: Path) -> Callable[[str], None]:
+    """
+    Function that appends a day's partition to the lake's db.events table.
+    """
+    def add(day: str):
+        write_partition(root=lake, day=day, offset=1000)
+
+    return add
+
+
+@pytest.fixture
+def backend(lake: Path) -> CountingBackend:
+
+    return CountingBackend(lake)
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> QueryResultCache:
+
+    return QueryResultCache(tmp_path / 'cache')
@@ -0,0 +1,85 @@
+from asyncio import gather, run
+
+import pytest
+from pandas.testing import assert_series_equal
+
+import aws_managers.athena.execution.async_athena_engine as \
+    async_athena_engine
+from aws_managers.athena import AsyncAthenaFrame, AthenaFrame
+from aws_managers.athena.execution import \
+    AsyncAthenaEngine, AthenaBackend, BackendAsyncEngine
+
+
+@pytest.fixture
+def started(monkeypatch) -> dict:
+    """
+    Stub the awswrangler calls of AsyncAthenaEngine and return the arguments
+    of the last query started.
+    """
+    arguments = {}
+
+    def start_query_execution(**kwargs):
+        arguments.update(kwargs)
+        return 'id'
+
+    monkeypatch.setattr(
+        async_athena_engine, 'start_query_execution', start_query_execution
+    )
+    monkeypatch.setattr(
+        async_athena_engine, 'get_query_execution',
+        lambda **kwargs: {'Status': {'State': 'SUCCEEDED'}}
+    )
+    monkeypatch.setattr(
+        async_athena_engine, 'get_query_results', lambda **kwargs: 1
+    )
+    return arguments
+
+
+def test_results_match_frame(backend):
+
+    frame = AthenaFrame('db', 'events', backend=backend)
+    async_frame = AsyncAthenaFrame(frame)
+    assert isinstance(async_frame._engine, BackendAsyncEngine)
+
+    async def main():
+        return await gather(async_frame.max(), async_frame.min())
+
+    maximum, minimum = run(main())
+    assert_series_equal(maximum, frame.max())
+    assert_series_equal(minimum, frame.min())
+
+
+def test_engine_copies_backend_settings(started):
+
+    backend = AthenaBackend(
+        unload=True, s3_output='s3://bucket/out/', encryption='SSE_KMS',
+        kms_key='key', data_source='catalog', workgroup='wg'
+    )
+    engine = AsyncAthenaEngine.from_backend(backend)
+    run(engine.execute('SELECT 1', 'db'))
+    assert started['sql'].startswith('UNLOAD (SELECT 1)')
+    assert started['s3_output'] == 's3://bucket/out/'
+    for key, value in dict(
+            encryption='SSE_KMS', kms_key='key', data_source='catalog',
+            workgroup='wg', database='db'
+    ).items():
+        assert started[key] == value
+
+
+def test_statements_are_not_unloaded(started):
+
+    engine = AsyncAthenaEngine(s3_output='s3://bucket/out/', unload=True)
+    run(engine.execute('EXPLAIN SELECT 1', 'db'))
+    assert started['sql'] == 'EXPLAIN SELECT 1'
+
+
+def test_unsupported_backend_settings_raise():
+
+    with pytest.raises(ValueError, match='categories'):
+        AsyncAthenaEngine.from_backend(AthenaBackend(categories=['a']))
+
+
+def test_unload_needs_output_location():
+
+    with pytest.raises(ValueError):
+        AsyncAthenaEngine(unload=True)
@@ -0,0 +1,98 @@
+import pytest
+from boto3 import client
+from botocore.stub import Stubber
+
+from aws_managers.athena.metadata.glue_metadata_backend import \
+    GlueMetadataBackend
+
+
+def glue_table(name: str) -> dict:
+    """
+    Return a Glue table definition with Hive types and a partition key.
+    """
+    return {
+        'Name': name,
+        'DatabaseName': 'db',
+        'StorageDescriptor': {'Columns': [
+            {'Name': 'id', 'Type': 'int'},
+            {'Name': 'name', 'Type': 'string', 'Comment': 'full name'},
+            {'Name': 'score', 'Type': 'float'},
+            {'Name': 'value', 'Type': 'double'},
+            {'Name': 'payload', 'Type': 'binary'}
+        ]},
+        'PartitionKeys': [{'Name': 'dt', 'Type': 'string'}]
+    }
+
+
+@pytest.fixture
+def glue():
+
+    glue_client = client(
+        'glue', region_name='us-east-1',
+        aws_access_key_id='key', aws_secret_access_key='secret'
+    )
+    with Stubber(glue_client) as stubber:
+        yield glue_client, stubber
+        stubber.assert_no_pending_responses()
+
+
+def test_column_info_maps_hive_types(glue):
+
+    glue_client, stubber = glue
+    stubber.add_response(
+        'get_table', {'Table': glue_table('events')},
+        {'DatabaseName': 'db', 'Name': 'events'}
+    )
+    info = GlueMetadataBackend(glue_client).column_info('db', 'events')
+    assert info['data_type'].tolist() == [
+        'integer', 'varchar', 'real', 'double', 'varbinary', 'varchar'
+    ]
+    assert info['ordinal_position'].tolist() == list(range(1, 7))
+    assert info['extra_info'].notna().tolist() == [False] * 5 + [True]
+    assert info['extra_info'].iloc[-1] == 'partition key'
+    assert info['comment'].iloc[1] == 'full name'
+
+
+def test_column_infos_follows_pages(glue):
+
+    glue_client, stubber = glue
+    stubber.add_response(
+        'get_tables',
+        {'TableList': [glue_table('a')], 'NextToken': 'next'},
+        {'DatabaseName': 'db'}
+    )
+    stubber.add_response(
+        'get_tables',
+        {'TableList': [glue_table('b')]},
+        {'DatabaseName': 'db', 'NextToken': 'next'}
+    )
+    infos = GlueMetadataBackend(glue_client).column_infos('db')
+    assert infos.groupby('table_name').size().to_dict() == {'a': 6, 'b': 6}
+
+
+def test_catalog_id_is_passed(glue):
+
+    glue_client, stubber = glue
+    stubber.add_response(
+        'get_table', {'Table': glue_table('events')},
+        {'DatabaseName': 'db', 'Name': 'events', 'CatalogId': '123'}
+    )
+    GlueMetadataBackend(
+        glue_client, catalog_id='123'
+    ).column_info('db', 'events')
+
+
+def test_partitions(glue):
+
+    glue_client, stubber = glue
+    stubber.add_response(
+        'get_partitions',
+        {'Partitions': [
+            {'Values': ['2024-01-01']}, {'Values': ['2024-01-02']}
+        ]},
+        {'DatabaseName': 'db', 'TableName': 'events'}
+    )
+    partitions = GlueMetadataBackend(glue_client).partitions(
+        'db', 'events', ['dt']
+    )
+    assert partitions['dt'].tolist() == ['2024-01-01', '2024-01-02']
@@ -0,0 +1,90 @@
+from pathlib import Path
+
+import pytest
+from pandas import DataFrame, read_parquet
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+from aws_managers.athena import AthenaFrame
+from aws_managers.athena.caching import PartialAggregateStore
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> PartialAggregateStore:
+
+    return PartialAggregateStore(tmp_path / 'partials')
+
+
+def events(lake: Path) -> DataFrame:
+    """
+    Read every partition of db.events with pandas.
+    """
+    return read_parquet(lake / 'db' / 'events')
+
+
+@pytest.mark.parametrize('method', ['sum', 'mean', 'min', 'max'])
+def test_aggregates_match_full_recompute(backend, store, method: str):
+
+    frame = AthenaFrame('db', 'events', backend=backend)
+    numeric = frame.select_numeric_types()
+    actual = getattr(numeric.incremental(store=store), method)()
+    expected = getattr(numeric, method)()
+    assert_series_equal(
+        actual.astype(float), expected.astype(float), check_names=False
+    )
+
+
+def test_count_matches_pandas(backend, store, lake: Path):
+
+    frame = AthenaFrame('db', 'events', backend=backend)
+    actual = frame[['user', 'amount']].incremental(store=store).count()
+    expected = events(lake)[['user', 'amount']].count()
+    assert actual.to_dict() == expected.to_dict()
+
+
+def test_group_aggregates_match_full_recompute(backend, store):
+
+    frame = AthenaFrame('db', 'events', backend=backend)
+    filtered = frame.where(frame.column_query_set.user > 10)
+    incremental = filtered.incremental(store=store)
+    assert_frame_equal(
+        incremental.mean_by_group(['amount', 'user'], 'country')
+        .sort_index().astype(float),
+        filtered.mean_by_group(['amount', 'user'], 'country')
+        .sort_index().astype(float),
+        check_names=False
+    )
+    assert_series_equal(
+        incremental.sum_by_group('amount', 'country').sort_index(),
+        filtered.sum_by_group('amount', 'country').sort_index(),
+        check_names=False, check_dtype=False
+    )
+
+
+def test_rerun_queries_nothing(backend, store):
+
+    incremental = AthenaFrame(
+        'db', 'events', backend=backend
+    ).select_numeric_types().incremental(store=store)
+    expected = incremental.sum()
+    queries = len(backend.queries)
+    assert_series_equal(incremental.sum(), expected)
+    assert len(backend.queries) == queries
+
+
+def test_new_partition_is_merged(backend, store, add_partition):
+
+    frame = AthenaFrame('db', 'events', backend=backend)
+    numeric = frame.select_numeric_types()
+    incremental = numeric.incremental(store=store)
+    incremental.sum()
+    add_partition('2024-01-04')
+    backend.refresh()
+    queries = len(backend.queries)
+    actual = incremental.sum()
+    # only the new partition is aggregated
+    assert len(backend.queries) == queries + 1
+    assert "'2024-01-04'" in backend.queries[-1]
+    assert "'2024-01-01'" not in backend.queries[-1]
+    assert_series_equal(
+        actual.astype(float), numeric.sum().astype(float), check_names=False
+    )
@@ -0,0 +1,75 @@
+from warnings import catch_warnings, simplefilter
+
+import pytest
+
+from aws_managers.athena import AthenaFrame
+from aws_managers.athena.clauses.conjunctive_operators import And, Or
+
+
+def test_partition_columns_and_partitions(backend):
+
+    frame = AthenaFrame('db', 'events', backend=backend)
+    assert frame.partition_columns == ['dt']
+    assert len(frame.partitions()) == 3
+
+
+def test_warn_points_at_caller(backend):
+
+    frame = AthenaFrame(
+        'db', 'events', backend=backend, partition_policy='warn'
+    )
+    with catch_warnings(record=True) as warnings:
+        simplefilter('always')
+        frame.max()
+    assert len(warnings) == 1
+    assert 'will scan every partition' in str(warnings[0].message)
+    assert warnings[0].filename == __file__
+
+
+def test_raise_without_partition_predicate(backend):
+
+    frame = AthenaFrame(
+        'db', 'events', backend=backend, partition_policy='raise'
+    )
+    with pytest.raises(ValueError, match='scan every partition'):
+        frame.max()
+    assert len(backend.queries) == 0
+
+
+def test_partition_predicate_is_allowed(backend):
+
+    frame = AthenaFrame(
+        'db', 'events', backend=backend, partition_policy='raise'
+    )
+    columns = frame.column_query_set
+    day = columns.dt == columns.dt.value(2024, 1, 1)
+    frame.where(day).select_numeric_types().max()
+    frame.where(And([day, columns.user > 3])).count_distinct()
+    assert len(backend.queries) == 2
+
+
+def test_or_with_other_columns_scans_every_partition(backend):
+
+    frame = AthenaFrame(
+        'db', 'events', backend=backend, partition_policy='raise'
+    )
+    columns = frame.column_query_set
+    with pytest.raises(ValueError):
+        frame.where(Or([
+            columns.dt == columns.dt.value(2024, 1, 1), columns.user > 3
+        ])).max()
+
+
+def test_ignore_does_not_warn(backend):
+
+    frame = AthenaFrame('db', 'events', backend=backend)
+    with catch_warnings(record=True) as warnings:
+        simplefilter('always')
+        frame.max()
+    assert len(warnings) == 0
+
+
+def test_invalid_policy(backend):
+
+    with pytest.raises(ValueError, match='partition_policy'):
+        AthenaFrame('db', 'events', backend=backend, partition_policy='x')
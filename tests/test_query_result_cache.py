@@ -0,0 +1,92 @@
+from os import stat
+from pathlib import Path
+
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+
+from aws_managers.athena import AthenaFrame
+from aws_managers.athena.caching import QueryResultCache
+from aws_managers.athena.execution import DuckDBBackend
+
+
+def test_repeated_query_is_answered_from_cache(backend, cache):
+
+    frame = AthenaFrame('db', 'events', backend=backend, cache=cache)
+    expected = frame.select(['user', 'amount'])
+    actual = frame.select(['user', 'amount'])
+    assert len(backend.queries) == 1
+    assert frame.last_query_stats.cached
+    assert_frame_equal(actual, expected)
+
+
+def test_cache_is_shared_across_instances(backend, tmp_path: Path):
+
+    AthenaFrame(
+        'db', 'events', backend=backend,
+        cache=QueryResultCache(tmp_path / 'cache')
+    ).max()
+    frame = AthenaFrame(
+        'db', 'events', backend=backend,
+        cache=QueryResultCache(tmp_path / 'cache')
+    )
+    frame.max()
+    assert len(backend.queries) == 1
+    assert frame.last_query_stats.cached
+
+
+def test_backends_do_not_share_entries(lake: Path, tmp_path: Path, cache):
+
+    other = tmp_path / 'other'
+    other.mkdir()
+    cache.put(
+        sql='SELECT 1', database='db', data=DataFrame({'x': [1]}),
+        backend=DuckDBBackend(other).cache_key
+    )
+    assert cache.get(
+        sql='SELECT 1', database='db', backend=DuckDBBackend(lake).cache_key
+    ) is None
+    assert cache.get(
+        sql='SELECT 1', database='db', backend=DuckDBBackend(other).cache_key
+    ) is not None
+
+
+def test_hits_do_not_rewrite_index(cache):
+
+    cache.put(sql='SELECT 1', database='db', data=DataFrame({'x': [1]}))
+    modified = stat(cache._index_path).st_mtime_ns
+    for _ in range(3):
+        assert cache.get(sql='SELECT 1', database='db') is not None
+    assert stat(cache._index_path).st_mtime_ns == modified
+
+
+def test_unwritable_results_are_skipped(cache, tmp_path: Path):
+
+    cache.put(
+        sql='SELECT 1', database='db', data=DataFrame({'x': [1, 'a']})
+    )
+    assert cache.get(sql='SELECT 1', database='db') is None
+    assert len(cache) == 0
+    assert [
+        path for path in (tmp_path / 'cache').iterdir()
+        if path.suffix != '.json'
+    ] == []
+
+
+def test_expired_entries_are_not_returned(cache):
+
+    cache.put(
+        sql='SELECT 1', database='db', data=DataFrame({'x': [1]}), ttl=0
+    )
+    assert cache.get(sql='SELECT 1', database='db') is None
+
+
+def test_invalidate_removes_table_entries(cache):
+
+    for table in ('a', 'b'):
+        cache.put(
+            sql=f'SELECT * FROM {table}', database='db', table=table,
+            data=DataFrame({'x': [1]})
+        )
+    cache.invalidate(database='db', table='a')
+    assert cache.get(sql='SELECT * FROM a', database='db') is None
+    assert cache.get(sql='SELECT * FROM b', database='db') is not None
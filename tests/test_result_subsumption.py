@@ -0,0 +1,50 @@
+from shutil import copytree
+
+from pandas.testing import assert_frame_equal
+
+from aws_managers.athena import AthenaFrame
+
+
+def test_projection_and_limit_of_cached_superset(backend, cache):
+
+    frame = AthenaFrame('db', 'events', backend=backend, cache=cache)
+    filtered = frame.where(frame.column_query_set.user > 10)
+    full = filtered.select('*')
+    subset = filtered.limit(5).select(['amount', 'user'])
+    assert len(backend.queries) == 1
+    assert_frame_equal(subset, full[['amount', 'user']].head(5))
+
+
+def test_different_condition_is_queried(backend, cache):
+
+    frame = AthenaFrame('db', 'events', backend=backend, cache=cache)
+    columns = frame.column_query_set
+    frame.where(columns.user > 10).select('*')
+    frame.where(columns.user > 11).select('*')
+    assert len(backend.queries) == 2
+
+
+def test_limited_superset_only_answers_smaller_limits(backend, cache):
+
+    frame = AthenaFrame('db', 'events', backend=backend, cache=cache)
+    frame.limit(10).select(['user', 'amount'])
+    assert len(frame.limit(4).select('user')) == 4
+    assert len(backend.queries) == 1
+    assert len(frame.select('user')) == 300
+    assert len(backend.queries) == 2
+
+
+def test_superset_from_backend_over_same_lake_is_used(backend, cache, lake):
+
+    AthenaFrame('db', 'events', backend=backend, cache=cache).select('*')
+    other = type(backend)(lake)
+    AthenaFrame('db', 'events', backend=other, cache=cache).select('user')
+    assert len(other.queries) == 0
+
+
+def test_superset_from_other_lake_is_not_used(backend, cache, lake, tmp_path):
+
+    AthenaFrame('db', 'events', backend=backend, cache=cache).select('*')
+    other = type(backend)(copytree(lake, tmp_path / 'copy'))
+    AthenaFrame('db', 'events', backend=other, cache=cache).select('user')
+    assert len(other.queries) == 1
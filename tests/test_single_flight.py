@@ -0,0 +1,123 @@
+from asyncio import CancelledError, ensure_future, gather, run, sleep
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from time import sleep as sleep_sync
+
+from pandas.testing import assert_series_equal
+
+from aws_managers.athena import AthenaFrame
+from aws_managers.athena.execution.single_flight import SingleFlight
+
+
+async def answer() -> int:
+
+    await sleep(0.1)
+    return 42
+
+
+def test_concurrent_calls_are_coalesced():
+
+    single_flight = SingleFlight()
+    started = Event()
+    release = Event()
+    calls = []
+
+    def func() -> int:
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 42
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        leader = executor.submit(single_flight.do, 'key', func)
+        started.wait(5)
+        followers = [
+            executor.submit(single_flight.do, 'key', func) for _ in range(2)
+        ]
+        while single_flight.coalesced < 2:
+            sleep_sync(0.01)
+        release.set()
+        assert leader.result() == (42, False)
+        assert [follower.result() for follower in followers] == [
+            (42, True), (42, True)
+        ]
+    assert len(calls) == 1
+    assert single_flight.in_flight == 0
+
+
+def test_errors_are_shared_with_followers():
+
+    single_flight = SingleFlight()
+
+    async def fail():
+        await sleep(0.1)
+        raise ValueError('failed')
+
+    async def main():
+        calls = [
+            ensure_future(single_flight.do_async('key', fail))
+            for _ in range(2)
+        ]
+        return await gather(*calls, return_exceptions=True)
+
+    results = run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert single_flight.executions == 1
+
+
+def test_cancelled_follower_does_not_cancel_call():
+
+    single_flight = SingleFlight()
+
+    async def main():
+        leader = ensure_future(single_flight.do_async('key', answer))
+        await sleep(0.01)
+        cancelled = ensure_future(single_flight.do_async('key', answer))
+        follower = ensure_future(single_flight.do_async('key', answer))
+        await sleep(0.01)
+        cancelled.cancel()
+        return await gather(
+            leader, cancelled, follower, return_exceptions=True
+        )
+
+    leader, cancelled, follower = run(main())
+    assert leader == (42, False)
+    assert isinstance(cancelled, CancelledError)
+    assert follower == (42, True)
+
+
+def test_cancelled_leader_hands_call_to_follower():
+
+    single_flight = SingleFlight()
+
+    async def main():
+        leader = ensure_future(single_flight.do_async('key', answer))
+        await sleep(0.01)
+        follower = ensure_future(single_flight.do_async('key', answer))
+        await sleep(0.01)
+        leader.cancel()
+        return await gather(leader, follower, return_exceptions=True)
+
+    leader, follower = run(main())
+    assert isinstance(leader, CancelledError)
+    assert follower == (42, False)
+    assert single_flight.in_flight == 0
+
+
+def test_identical_frame_queries_run_once(backend):
+
+    execute = backend.execute
+
+    def slow_execute(sql, database):
+        sleep_sync(0.2)
+        return execute(sql=sql, database=database)
+
+    backend.execute = slow_execute
+    frame = AthenaFrame('db', 'events', backend=backend)
+    # resolve the schema before the calls so that they start together
+    frame.columns
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: frame.max(), range(4)))
+    assert len(backend.queries) == 1
+    for result in results[1:]:
+        assert_series_equal(result, results[0])
@@ -0,0 +1,58 @@
+import pytest
+
+from aws_managers.athena import AthenaFrame
+from aws_managers.athena.clauses.conjunctive_operators import And, Or
+from aws_managers.athena.queries import \
+    IntegerColumnQuery, StringColumnQuery
+
+x = IntegerColumnQuery('x')
+y = IntegerColumnQuery('y')
+s = StringColumnQuery('s')
+
+
+@pytest.mark.parametrize('predicate, expected', [
+    (And([x > 3, x > 5]), 'x > 5'),
+    (And([x > 3, x >= 3]), 'x > 3'),
+    (Or([x > 3, x > 5]), 'x > 3'),
+    (And([x < 10, x <= 10, x > 1, x > 2]), '(x < 10 AND x > 2)'),
+    (And([x == 3, x > 1, s == 'a']), "(s = 'a' AND x = 3)"),
+    (Or([x == 3, x > 1]), 'x > 1'),
+    (
+        And([And([s == 'a', x > 1]), And([x > 2, s == 'a'])]),
+        "(s = 'a' AND x > 2)"
+    ),
+    (And([s == 'a', Or([s == 'a', y == 2])]), "s = 'a'"),
+    (Or([s == 'a', And([s == 'a', y == 2])]), "s = 'a'"),
+    (And([x > 3.5, x > 3]), 'x > 3.5'),
+])
+def test_canonical_form(predicate, expected: str):
+
+    assert predicate.canonical == expected
+
+
+def test_equivalent_predicates_are_equal():
+
+    assert And([x > 1, s == 'a']) == And([s == 'a', x > 1, x > 0])
+    assert hash(And([x > 1, s == 'a'])) == hash(And([s == 'a', x > 1]))
+
+
+def test_columns():
+
+    assert And([x > 1, s == 'a']).columns() == {'x', 's'}
+
+
+def test_chained_where_renders_simplified_sql(backend, cache):
+
+    frame = AthenaFrame('db', 'events', backend=backend, cache=cache)
+    columns = frame.column_query_set
+    chained = frame.where(columns.user > 1).where(
+        columns.country == 'uk'
+    ).where(columns.user > 5)
+    direct = frame.where(columns.country == 'uk').where(columns.user > 5)
+    assert (
+        chained._capture('select', '*')[0].sql ==
+        direct._capture('select', '*')[0].sql
+    )
+    # the same SQL shares a cached result
+    assert chained.max().equals(direct.max())
+    assert len(backend.queries) == 1